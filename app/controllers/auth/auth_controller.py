@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, status
 
+from app.core.cache import UserSnapshotCache
 from app.providers.auth_provider import auth_middleware
+from app.providers.rate_limit_provider import rate_limit
 from app.providers.service_provider import get_auth_service
 from app.models.user import UserModel
 from app.schemas.auth_schema import (
@@ -29,6 +31,7 @@ router = APIRouter(
     response_model_by_alias=True,
     status_code=status.HTTP_201_CREATED,
     response_description="Login user",
+    dependencies=[rate_limit("login")],
 )
 async def login(
     user: LoginRequestSchema,
@@ -59,7 +62,7 @@ async def register(
 async def get_user(
     current_user: UserModel = Depends(auth_middleware),
 ):
-    return UserReadSchema.model_validate(current_user)
+    return UserSnapshotCache().read_schema(current_user)
 
 
 @router.delete(
@@ -78,6 +81,7 @@ async def delete_user(
     response_model=LoginResponseSchema,
     status_code=status.HTTP_200_OK,
     summary="Reset a user password.",
+    dependencies=[rate_limit("password_reset")],
 )
 async def reset_user_password(
     user_request: ResetUserPasswordSchema,
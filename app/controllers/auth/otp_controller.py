@@ -1,9 +1,14 @@
-import datetime
-from fastapi import APIRouter, Depends, Path, Response, status
+import asyncio
+from fastapi import APIRouter, BackgroundTasks, Depends, Path, Query, Response, status
 from app.db.repositories.otp_repository import OTPRepository
+from app.models.user import UserModel
+from app.providers.auth_provider import auth_middleware, require_role
+from app.providers.rate_limit_provider import rate_limit
 from app.providers.repository_provider import get_otp_repository
 from app.providers.service_provider import get_otp_service
 from app.schemas.otp_schema import (
+    OTPCampaignRequestSchema,
+    OTPCampaignResponseSchema,
     OTPRequestSchema,
     OTPVerifyResponseSchema,
     OTPVerifySchema,
@@ -11,7 +16,7 @@ from app.schemas.otp_schema import (
 )
 from app.services.auth.otp_service import OTPService
 from app.utils.constants import http_status
-from app.utils.image_utils import generate_countdown_image
+from app.utils.image_utils import generate_countdown_gif, generate_countdown_image
 
 router = APIRouter(
     prefix="/otp",
@@ -25,6 +30,7 @@ router = APIRouter(
     response_model=OTPResponseSchema,
     status_code=status.HTTP_200_OK,
     summary="Request a One-Time Password (OTP) for an email.",
+    dependencies=[rate_limit("otp_request")],
 )
 async def request_otp_endpoint(
     otp_request: OTPRequestSchema,
@@ -42,6 +48,7 @@ async def request_otp_endpoint(
     response_model=OTPVerifyResponseSchema,
     status_code=status.HTTP_200_OK,
     summary="Verify a One-Time Password (OTP).",
+    dependencies=[rate_limit("otp_verify")],
 )
 async def verify_otp_endpoint(
     otp_verify: OTPVerifySchema,
@@ -53,18 +60,68 @@ async def verify_otp_endpoint(
     return await otp_service.verify_otp(otp_verify)
 
 
+@router.post(
+    "/campaigns",
+    response_model=OTPCampaignResponseSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Send an OTP to every user matching a filter.",
+    dependencies=[require_role("admin")],
+)
+async def create_otp_campaign(
+    campaign_request: OTPCampaignRequestSchema,
+    background_tasks: BackgroundTasks,
+    current_user: UserModel = Depends(auth_middleware),
+    otp_service: OTPService = Depends(get_otp_service),
+):
+    """
+    Registers a bulk OTP campaign (e.g. forced re-verification) and runs it in the background.
+    Progress is available at `GET /otp/campaigns/{campaign_id}`.
+    """
+    campaign = await otp_service.create_campaign(
+        campaign_request, created_by=str(current_user.id)
+    )
+    background_tasks.add_task(otp_service.run_campaign, campaign.campaign_id)
+    return campaign
+
+
+@router.get(
+    "/campaigns/{campaign_id}",
+    response_model=OTPCampaignResponseSchema,
+    summary="Get the progress of a bulk OTP campaign.",
+    dependencies=[require_role("admin")],
+)
+async def get_otp_campaign(
+    campaign_id: str = Path(..., description="The ID of the campaign"),
+    otp_service: OTPService = Depends(get_otp_service),
+):
+    return await otp_service.get_campaign(campaign_id)
+
+
+# Une image figée ("00:00") peut être gardée en cache par les clients mail
+_EXPIRED_IMAGE_HEADERS = {"Cache-Control": "public, max-age=86400"}
+# Un compte à rebours en cours dépend de l'heure de la requête
+_LIVE_IMAGE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+}
+
+
 @router.get(
     "/countdown-image/{otp_id}",
     response_class=Response,
     responses={
-        200: {"content": {"image/png": {}}},
+        200: {"content": {"image/png": {}, "image/gif": {}}},
         404: {"description": "OTP not found or expired"},
     },
     summary="Get a dynamic countdown image for an OTP.",
-    description="Returns a PNG image displaying the remaining time for a given OTP. The image is designed to be reloaded frequently by email clients to simulate a dynamic countdown.",
+    description="Returns an image displaying the remaining time for a given OTP. The PNG format is designed to be reloaded frequently by email clients to simulate a dynamic countdown; the GIF format is a single animation covering the remaining lifetime of the OTP.",
 )
 async def get_otp_countdown_image(
     otp_id: str = Path(..., description="The ID of the OTP record"),
+    image_format: str = Query(
+        "png", alias="format", pattern="^(png|gif)$", description="png or gif"
+    ),
     otp_repo: OTPRepository = Depends(
         get_otp_repository
     ),  # Accès direct au dépôt pour éviter une dépendance circulaire avec OTPService
@@ -74,37 +131,17 @@ async def get_otp_countdown_image(
     """
     otp_record = await otp_repo.find_by_id(otp_id)
 
-    if not otp_record:
-        # Si l'OTP n'est pas trouvé, ou si find_by_id retourne None
-        # On peut renvoyer une image "expirée" ou une 404
-        # Pour les emails, une image "expirée" est plus conviviale qu'une erreur 404
-        # Générons une image "expirée" pour ce cas.
-        expired_image_bytes = generate_countdown_image(0)
-        return Response(
-            content=expired_image_bytes,
-            media_type="image/png",
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0",
-            },
-        )
-
-    # Calculer le temps restant
-    time_remaining = int(
-        (otp_record.expires_at - datetime.datetime.utcnow()).total_seconds()
-    )
+    # Si l'OTP n'est pas trouvé, on renvoie une image "expirée" plutôt qu'une 404:
+    # pour les emails, c'est plus convivial qu'une erreur
+    # (le store en mémoire renvoie des dates avec fuseau, MongoDB des dates naïves UTC)
+    time_remaining = otp_record.seconds_remaining() if otp_record else 0
+
+    headers = _LIVE_IMAGE_HEADERS if time_remaining else _EXPIRED_IMAGE_HEADERS
+    if image_format == "gif":
+        # Encodage de toutes les images du GIF: hors de la boucle d'événements
+        image_bytes = await asyncio.to_thread(generate_countdown_gif, time_remaining)
+        return Response(content=image_bytes, media_type="image/gif", headers=headers)
 
     # Générer l'image du compte à rebours
     image_bytes = generate_countdown_image(time_remaining)
-
-    # Retourner l'image avec les en-têtes appropriés pour éviter le cache
-    return Response(
-        content=image_bytes,
-        media_type="image/png",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-        },
-    )
+    return Response(content=image_bytes, media_type="image/png", headers=headers)
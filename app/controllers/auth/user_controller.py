@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Body, Depends, Query, Path, status
-from typing import List
+from fastapi import APIRouter, Body, Depends, Query, Path, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from app.core.cache import UserSnapshotCache
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.providers.auth_provider import auth_middleware, require_permission
 from app.providers.service_provider import get_user_service
 from app.models.user import UserModel
@@ -23,12 +26,44 @@ router = APIRouter(
     dependencies=[require_permission("user:read")],
 )
 async def list_users(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    skip: int = Query(0, ge=0, description="Deprecated: use `cursor`"),
     limit: int = Query(100, ge=1, le=1000),
-    all: bool = Query(default=False),
+    all: bool = Query(default=False, description="Deprecated: use /users/export"),
+    cursor: Optional[str] = Query(
+        default=None, description=f"Value of the {NEXT_CURSOR_HEADER} header"
+    ),
+    sort: str = Query(
+        default="_id", description="_id, email or created_at (- for desc)"
+    ),
     service: UserService = Depends(get_user_service),
 ):
-    return await service.list_users(skip=skip, limit=limit, all=all)
+    page = await service.list_users(
+        skip=skip, limit=limit, all=all, cursor=cursor, sort=sort
+    )
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+
+@router.get(
+    "/export",
+    summary="Export all users as NDJSON or CSV (streamed)",
+    dependencies=[require_permission("user:read")],
+)
+async def export_users(
+    format: str = Query(default="ndjson", description="ndjson or csv"),
+    sort: str = Query(
+        default="_id", description="_id, email or created_at (- for desc)"
+    ),
+    service: UserService = Depends(get_user_service),
+):
+    media_type = service.validate_export(format, sort)
+    return StreamingResponse(
+        service.export_users(format=format, sort=sort),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
 
 
 @router.get(
@@ -39,7 +74,7 @@ async def list_users(
 async def get_user(
     current_user: UserModel = Depends(auth_middleware),
 ):
-    return UserReadSchema.model_validate(current_user)
+    return UserSnapshotCache().read_schema(current_user)
 
 
 @router.get("/{user_id}", response_model=UserReadSchema, summary="Get a user by ID")
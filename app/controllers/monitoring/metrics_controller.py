@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Request
+
+from app.core.cache import AuthorizationCache, UserSnapshotCache
+from app.core.otp_store import ActiveOTPStore
+from app.core.rate_limiter import RateLimiter
+from app.core.security import PasswordHashingPool
+from app.providers.auth_provider import require_role
+from app.providers.providers import get_smtp_pool
+from app.utils.constants import http_status
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Monitoring"],
+    dependencies=[require_role("admin")],
+    responses=http_status.router_responses,
+)
+
+
+@router.get("/", summary="Get in-process runtime metrics")
+async def get_metrics(request: Request):
+    expiry_sweeper = getattr(request.app.state, "expiry_sweeper", None)
+    mail_queue_worker = getattr(request.app.state, "mail_queue_worker", None)
+    return {
+        "password_hashing": PasswordHashingPool().stats(),
+        "authorization_cache": AuthorizationCache().stats(),
+        "user_cache": UserSnapshotCache().stats(),
+        "otp_store": ActiveOTPStore().stats(),
+        "rate_limiter": RateLimiter().stats(),
+        "smtp_pool": get_smtp_pool().stats(),
+        "expiry_sweeper": expiry_sweeper.stats() if expiry_sweeper else None,
+        "mail_queue": await mail_queue_worker.stats() if mail_queue_worker else None,
+    }
@@ -0,0 +1,206 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, FrozenSet, Hashable, Iterable, Optional
+
+from app.models.user import UserModel
+from app.providers.providers import get_settings
+from app.schemas.user_schema import UserReadSchema
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Cache clé/valeur en mémoire, borné (éviction LRU) et à durée de vie limitée (TTL).
+
+    Une durée de vie inférieure ou égale à 0 désactive le cache: toutes les lectures
+    sont des "miss" et rien n'est stocké.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 1024,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._timer = timer
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= self._timer():
+            # Entrée périmée: on la retire pour libérer la place
+            del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Valeur non périmée de `key`, sans compter de hit/miss ni changer l'ordre LRU."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or entry[0] <= self._timer():
+            return default
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (self._timer() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Any:
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AuthorizationCache:
+    """Cache des résolutions de permissions utilisé par `require_permission`.
+
+    - `role_permissions`: ensemble de rôles (frozenset) -> permissions effectives
+      (permissions des rôles et de leurs rôles hérités).
+    - `known_permissions`: code de permission -> existence en base.
+
+    Les deux caches sont vidés à chaque écriture sur les rôles ou les permissions
+    (voir `RoleService` et `PermissionService`), le TTL borne la durée pendant
+    laquelle un autre worker peut servir une donnée périmée.
+    """
+
+    _instance = None
+    _role_permissions: TTLCache = None
+    _known_permissions: TTLCache = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AuthorizationCache, cls).__new__(cls)
+            settings = get_settings()
+            cls._role_permissions = TTLCache(
+                ttl_seconds=settings.permission_cache_ttl_seconds,
+                max_entries=settings.permission_cache_max_entries,
+            )
+            cls._known_permissions = TTLCache(
+                ttl_seconds=settings.permission_cache_ttl_seconds,
+                max_entries=settings.permission_cache_max_entries,
+            )
+        return cls._instance
+
+    @staticmethod
+    def _roles_key(roles: Iterable[str]) -> FrozenSet[str]:
+        return frozenset(roles)
+
+    def get_role_permissions(self, roles: Iterable[str]) -> Optional[FrozenSet[str]]:
+        return self._role_permissions.get(self._roles_key(roles))
+
+    def set_role_permissions(self, roles: Iterable[str], permissions: Iterable[str]):
+        self._role_permissions.set(self._roles_key(roles), frozenset(permissions))
+
+    def get_permission_exists(self, code: str) -> Optional[bool]:
+        return self._known_permissions.get(code)
+
+    def set_permission_exists(self, code: str, exists: bool):
+        self._known_permissions.set(code, exists)
+
+    def invalidate(self) -> None:
+        """Vide toutes les résolutions (à appeler après une écriture sur les rôles/permissions)."""
+        self._role_permissions.clear()
+        self._known_permissions.clear()
+
+    def stats(self) -> dict:
+        return {
+            "role_permissions": self._role_permissions.stats(),
+            "known_permissions": self._known_permissions.stats(),
+        }
+
+
+class UserSnapshotCache:
+    """Cache des utilisateurs authentifiés utilisé par `auth_middleware`.
+
+    Chaque entrée garde le `UserModel` chargé depuis la base et sa validation en
+    `UserReadSchema`, pour que `require_permission`/`require_role` ne revalident pas
+    le même utilisateur. Les services qui modifient un utilisateur doivent appeler
+    `invalidate(user_id)`.
+
+    Le cache garde ses propres copies et ne rend que des copies: un handler peut
+    modifier l'utilisateur reçu sans altérer l'entrée partagée par les requêtes
+    suivantes.
+    """
+
+    _instance = None
+    _users: TTLCache = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(UserSnapshotCache, cls).__new__(cls)
+            settings = get_settings()
+            cls._users = TTLCache(
+                ttl_seconds=settings.user_cache_ttl_seconds,
+                max_entries=settings.user_cache_max_entries,
+            )
+        return cls._instance
+
+    def get(self, user_id: str) -> Optional[UserModel]:
+        snapshot = self._users.get(str(user_id))
+        return snapshot[0].model_copy(deep=True) if snapshot else None
+
+    def set(self, user: UserModel) -> None:
+        self._users.set(
+            str(user.id),
+            (user.model_copy(deep=True), UserReadSchema.model_validate(user)),
+        )
+
+    def read_schema(self, user: UserModel) -> UserReadSchema:
+        """`UserReadSchema` de l'utilisateur, sans revalidation s'il est identique à
+        l'entrée du cache.
+
+        La lecture ne compte ni hit ni miss: l'accès a déjà été compté par
+        `auth_middleware`.
+        """
+        if self._users.enabled:
+            snapshot = self._users.peek(str(user.id))
+            if snapshot and snapshot[0] == user:
+                return snapshot[1].model_copy(deep=True)
+        return UserReadSchema.model_validate(user)
+
+    def invalidate(self, user_id: str) -> None:
+        self._users.pop(str(user_id))
+
+    def clear(self) -> None:
+        self._users.clear()
+
+    def stats(self) -> dict:
+        return self._users.stats()
@@ -1,8 +1,27 @@
-from pydantic import ConfigDict, EmailStr, Field
+from pydantic import ConfigDict, EmailStr, Field, field_validator
 import os
+from typing import Literal, Optional, Tuple
 from pydantic_settings import BaseSettings
 
 
+def parse_rate(value: str) -> Optional[Tuple[int, float]]:
+    """Convertit "5/300" (5 appels par 300 secondes) en (5, 300.0).
+
+    Une valeur vide ou "0" désactive la limite. Lève `ValueError` si la valeur n'est
+    pas au format "appels/secondes" avec des nombres strictement positifs.
+    """
+    if not value or value.strip() == "0":
+        return None
+    count, _, seconds = value.partition("/")
+    try:
+        limit, period = int(count), float(seconds or 1)
+    except ValueError:
+        raise ValueError(f"Invalid rate '{value}', expected 'calls/seconds'") from None
+    if limit <= 0 or not 0 < period < float("inf"):
+        raise ValueError(f"Invalid rate '{value}', calls and seconds must be positive")
+    return limit, period
+
+
 class Settings(BaseSettings):
     """Base class of all app settings and configuration params
 
@@ -27,6 +46,57 @@ class Settings(BaseSettings):
     jwt_algorithm: str = Field(..., alias="JWT_ALGORITHM")
     jwt_secret_key: str = Field(..., alias="JWT_SECRET_KEY")
     access_token_expire_weeks: int = Field(..., alias="ACCESS_TOKEN_EXPIRE_WEEKS")
+    # Mode de vérification des jetons: "database" (recherche du jeton en base à chaque
+    # requête) ou "stateless" (signature + exp, révocations via une liste en mémoire)
+    token_verification_mode: Literal["database", "stateless"] = Field(
+        default="database", alias="TOKEN_VERIFICATION_MODE"
+    )
+    token_revocation_refresh_seconds: int = Field(
+        default=30, alias="TOKEN_REVOCATION_REFRESH_SECONDS"
+    )
+
+    # Paramètres du cache des permissions (0 pour désactiver)
+    permission_cache_ttl_seconds: int = Field(
+        default=60, alias="PERMISSION_CACHE_TTL_SECONDS"
+    )
+    permission_cache_max_entries: int = Field(
+        default=1024, alias="PERMISSION_CACHE_MAX_ENTRIES"
+    )
+    # Paramètres du cache des utilisateurs authentifiés (0 pour désactiver)
+    user_cache_ttl_seconds: int = Field(default=30, alias="USER_CACHE_TTL_SECONDS")
+    user_cache_max_entries: int = Field(default=2048, alias="USER_CACHE_MAX_ENTRIES")
+    # Intervalle (en secondes) de rechargement de l'index des rôles hérités (borné
+    # par la durée de vie du cache des permissions)
+    role_index_refresh_seconds: int = Field(
+        default=60, alias="ROLE_INDEX_REFRESH_SECONDS"
+    )
+
+    # Pool de hachage des mots de passe (bcrypt): "thread" ou "process"
+    password_hash_executor: Literal["thread", "process"] = Field(
+        default="thread", alias="PASSWORD_HASH_EXECUTOR"
+    )
+    password_hash_max_workers: int = Field(default=4, alias="PASSWORD_HASH_MAX_WORKERS")
+    # Nombre maximal de calculs en attente avant de répondre 503 (0 pour illimité)
+    password_hash_max_queue: int = Field(default=256, alias="PASSWORD_HASH_MAX_QUEUE")
+
+    # Pool de connexions MongoDB (un seul client par processus)
+    mongo_max_pool_size: int = Field(default=100, alias="MONGO_MAX_POOL_SIZE")
+    mongo_min_pool_size: int = Field(default=10, alias="MONGO_MIN_POOL_SIZE")
+    mongo_max_idle_time_ms: int = Field(default=300000, alias="MONGO_MAX_IDLE_TIME_MS")
+    mongo_connect_timeout_ms: int = Field(
+        default=5000, alias="MONGO_CONNECT_TIMEOUT_MS"
+    )
+    mongo_server_selection_timeout_ms: int = Field(
+        default=5000, alias="MONGO_SERVER_SELECTION_TIMEOUT_MS"
+    )
+    # Création des index MongoDB déclarés (app/db/mongo_indexes.py) au démarrage
+    mongo_ensure_indexes: bool = Field(default=True, alias="MONGO_ENSURE_INDEXES")
+
+    # Intervalle (en secondes) du nettoyage des jetons et OTP expirés, en complément
+    # des index TTL (0 pour désactiver)
+    expiry_sweep_interval_seconds: int = Field(
+        default=900, alias="EXPIRY_SWEEP_INTERVAL_SECONDS"
+    )
 
     # Paramètre du superadministrateur
     admin_email: str = Field(..., alias="ADMINEMAIL")
@@ -35,6 +105,65 @@ class Settings(BaseSettings):
     # Paramètres OTP
     otp_expiry_minutes: int = Field(..., alias="OTP_EXPIRY_MINUTES")
     otp_length: int = Field(..., alias="OTP_LENGTH")
+    # Génère toutes les images du compte à rebours au démarrage (sinon à la demande)
+    otp_countdown_preload: bool = Field(default=False, alias="OTP_COUNTDOWN_PRELOAD")
+    # Format du compte à rebours dans l'e-mail OTP: "png" (image rechargée par le
+    # client mail) ou "gif" (une seule animation)
+    otp_countdown_format: Literal["png", "gif"] = Field(
+        default="png", alias="OTP_COUNTDOWN_FORMAT"
+    )
+    # OTP actifs gardés en mémoire ("memory") ou lus en base à chaque fois ("none")
+    otp_store_backend: Literal["memory", "none"] = Field(
+        default="memory", alias="OTP_STORE_BACKEND"
+    )
+    otp_store_max_entries: int = Field(default=10000, alias="OTP_STORE_MAX_ENTRIES")
+    # Taille des lots d'un envoi groupé d'OTP (insertion des OTP et mise en file)
+    otp_campaign_chunk_size: int = Field(default=500, alias="OTP_CAMPAIGN_CHUNK_SIZE")
+
+    # Limitation de débit par e-mail et par IP ("appels/secondes", "0" pour désactiver)
+    # backend "memory" (par worker) ou "mongo" (partagé entre les workers)
+    rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
+    rate_limit_backend: Literal["memory", "mongo"] = Field(
+        default="memory", alias="RATE_LIMIT_BACKEND"
+    )
+    rate_limit_otp_request_email: str = Field(
+        default="3/300", alias="RATE_LIMIT_OTP_REQUEST_EMAIL"
+    )
+    rate_limit_otp_request_ip: str = Field(
+        default="30/300", alias="RATE_LIMIT_OTP_REQUEST_IP"
+    )
+    rate_limit_otp_verify_email: str = Field(
+        default="10/300", alias="RATE_LIMIT_OTP_VERIFY_EMAIL"
+    )
+    rate_limit_otp_verify_ip: str = Field(
+        default="100/300", alias="RATE_LIMIT_OTP_VERIFY_IP"
+    )
+    rate_limit_login_email: str = Field(
+        default="10/300", alias="RATE_LIMIT_LOGIN_EMAIL"
+    )
+    rate_limit_login_ip: str = Field(default="100/300", alias="RATE_LIMIT_LOGIN_IP")
+    rate_limit_password_reset_email: str = Field(
+        default="5/300", alias="RATE_LIMIT_PASSWORD_RESET_EMAIL"
+    )
+    rate_limit_password_reset_ip: str = Field(
+        default="50/300", alias="RATE_LIMIT_PASSWORD_RESET_IP"
+    )
+
+    @field_validator(
+        "rate_limit_otp_request_email",
+        "rate_limit_otp_request_ip",
+        "rate_limit_otp_verify_email",
+        "rate_limit_otp_verify_ip",
+        "rate_limit_login_email",
+        "rate_limit_login_ip",
+        "rate_limit_password_reset_email",
+        "rate_limit_password_reset_ip",
+    )
+    @classmethod
+    def _validate_rate(cls, value: str) -> str:
+        # Une limite mal écrite fait échouer le démarrage plutôt que chaque requête
+        parse_rate(value)
+        return value
 
     # Paramètres d'envoi d'e-mail (SMTP)
     smtp_host: str = Field(..., alias="SMTP_HOST")
@@ -44,6 +173,37 @@ class Settings(BaseSettings):
     smtp_sender_email: EmailStr = Field(..., alias="SMTP_SENDER_EMAIL")
     smtp_use_tls: bool = Field(..., alias="SMTP_USE_TLS")
     smtp_use_ssl: bool = False  # Utiliser SSL (pour le port 465)
+    # Pool de connexions SMTP persistantes
+    smtp_pool_max_connections: int = Field(default=4, alias="SMTP_POOL_MAX_CONNECTIONS")
+    smtp_pool_max_messages_per_connection: int = Field(
+        default=100, alias="SMTP_POOL_MAX_MESSAGES_PER_CONNECTION"
+    )
+    smtp_pool_idle_timeout_seconds: int = Field(
+        default=60, alias="SMTP_POOL_IDLE_TIMEOUT_SECONDS"
+    )
+    smtp_pool_noop_after_seconds: int = Field(
+        default=10, alias="SMTP_POOL_NOOP_AFTER_SECONDS"
+    )
+
+    # File d'envoi des e-mails (collection mail_queue) et workers d'envoi
+    mail_queue_enabled: bool = Field(default=True, alias="MAIL_QUEUE_ENABLED")
+    mail_queue_workers: int = Field(default=2, alias="MAIL_QUEUE_WORKERS")
+    mail_queue_batch_size: int = Field(default=20, alias="MAIL_QUEUE_BATCH_SIZE")
+    mail_queue_poll_interval_seconds: float = Field(
+        default=1, alias="MAIL_QUEUE_POLL_INTERVAL_SECONDS"
+    )
+    mail_queue_max_attempts: int = Field(default=5, alias="MAIL_QUEUE_MAX_ATTEMPTS")
+    mail_queue_retry_base_seconds: float = Field(
+        default=5, alias="MAIL_QUEUE_RETRY_BASE_SECONDS"
+    )
+    mail_queue_lease_seconds: float = Field(
+        default=120, alias="MAIL_QUEUE_LEASE_SECONDS"
+    )
+    # Durée de conservation des messages envoyés ou définitivement en échec (ils
+    # contiennent les codes OTP), supprimés ensuite par l'index TTL
+    mail_queue_retention_seconds: float = Field(
+        default=24 * 3600, alias="MAIL_QUEUE_RETENTION_SECONDS"
+    )
 
     # Paramètres Google OAuth
     google_oauth_client_id: str = Field(..., alias="GOOGLE_OAUTH_CLIENT_ID")
@@ -60,6 +220,10 @@ class Settings(BaseSettings):
     templates_dir: str = os.path.join(
         os.path.dirname(os.path.dirname(__file__)), "templates"
     )
+    # Recompile un template d'e-mail modifié sur le disque (développement)
+    email_templates_auto_reload: bool = Field(
+        default=False, alias="EMAIL_TEMPLATES_AUTO_RELOAD"
+    )
 
     # Paramètre de la base de données en fonction de l'environnement
     @property
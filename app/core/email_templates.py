@@ -0,0 +1,110 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from app.providers.providers import get_settings
+
+
+# Variable de template: "{{ nom }}" (un espace de chaque côté)
+_PLACEHOLDER = re.compile(r"\{\{ (\w+) \}\}")
+
+
+class CompiledTemplate:
+    """Template découpé une fois pour toutes en segments littéraux et variables.
+
+    Le rendu est un seul passage sur les segments (pas de `str.replace` par variable);
+    une variable absente du contexte est laissée telle quelle dans le résultat.
+    """
+
+    def __init__(self, source: str, mtime: Optional[float] = None):
+        self.mtime = mtime
+        # Segments alternés: littéral, (nom, texte original), littéral, ...
+        self._segments: List[str | Tuple[str, str]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._segments.append(source[position : match.start()])
+            self._segments.append((match.group(1), match.group(0)))
+            position = match.end()
+        self._segments.append(source[position:])
+
+    @property
+    def variables(self) -> List[str]:
+        return [segment[0] for segment in self._segments if isinstance(segment, tuple)]
+
+    def render(self, context: dict) -> str:
+        return "".join(
+            (
+                segment
+                if isinstance(segment, str)
+                else str(context[segment[0]]) if segment[0] in context else segment[1]
+            )
+            for segment in self._segments
+        )
+
+
+class EmailTemplateRegistry:
+    """Registre des templates d'e-mails de `<templates_dir>/emails`.
+
+    Chaque template est lu et compilé une seule fois (au démarrage via `preload`, ou au
+    premier rendu). Avec `EMAIL_TEMPLATES_AUTO_RELOAD` (développement), la date de
+    modification du fichier est vérifiée à chaque rendu et le template recompilé s'il
+    a changé.
+    """
+
+    _instance = None
+    _templates: Dict[str, CompiledTemplate] = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EmailTemplateRegistry, cls).__new__(cls)
+            settings = get_settings()
+            cls.directory = os.path.join(settings.templates_dir, "emails")
+            cls.auto_reload = settings.email_templates_auto_reload
+            cls._templates = {}
+        return cls._instance
+
+    def _path(self, template_name: str) -> str:
+        return os.path.join(self.directory, template_name)
+
+    def _compile(self, template_name: str) -> CompiledTemplate:
+        template_path = self._path(template_name)
+        try:
+            with open(template_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            mtime = os.path.getmtime(template_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Email template not found: {template_path}")
+        template = CompiledTemplate(source, mtime=mtime)
+        self._templates[template_name] = template
+        return template
+
+    def get(self, template_name: str) -> CompiledTemplate:
+        template = self._templates.get(template_name)
+        if template is None:
+            return self._compile(template_name)
+        if self.auto_reload:
+            try:
+                changed = os.path.getmtime(self._path(template_name)) != template.mtime
+            except FileNotFoundError:
+                changed = True
+            if changed:
+                return self._compile(template_name)
+        return template
+
+    def render(self, template_name: str, context: dict) -> str:
+        return self.get(template_name).render(context)
+
+    def preload(self) -> List[str]:
+        """Compile tous les templates `.html` du dossier; retourne leurs noms."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(
+            name for name in os.listdir(self.directory) if name.endswith(".html")
+        )
+        for name in names:
+            self._compile(name)
+        return names
+
+    def clear(self) -> None:
+        self._templates.clear()
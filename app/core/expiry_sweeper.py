@@ -0,0 +1,73 @@
+import asyncio
+import datetime
+from typing import Dict, Optional
+
+from app.db.repositories.access_token_repository import AccessTokenRepository
+from app.db.repositories.otp_repository import OTPRepository
+from app.db.repositories.revoked_token_repository import RevokedTokenRepository
+
+
+class ExpirySweeper:
+    """Tâche de fond qui supprime périodiquement les jetons, révocations et OTP expirés.
+
+    Les index TTL (voir `app/db/mongo_indexes.py`) font normalement ce travail côté
+    MongoDB; le balayage sert de filet de sécurité quand ils n'ont pas pu être créés
+    ou que la base ne les supporte pas.
+    """
+
+    def __init__(self, db, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.access_token_repos = AccessTokenRepository(db)
+        self.otp_repos = OTPRepository(db)
+        self.revoked_token_repos = RevokedTokenRepository(db)
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.deleted = {"tokens": 0, "otps": 0, "revoked_tokens": 0}
+        self.last_run_at: Optional[datetime.datetime] = None
+        self.last_error: Optional[str] = None
+
+    async def sweep(self) -> Dict[str, int]:
+        deleted = {
+            "tokens": await self.access_token_repos.delete_expired_tokens(),
+            "otps": await self.otp_repos.delete_expired_otps(),
+            "revoked_tokens": await self.revoked_token_repos.delete_expired(),
+        }
+        for name, count in deleted.items():
+            self.deleted[name] += count
+        self.runs += 1
+        self.last_run_at = datetime.datetime.now(datetime.timezone.utc)
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+                self.last_error = None
+            except Exception as e:
+                # Une erreur passagère (base indisponible) ne doit pas arrêter la tâche
+                self.last_error = str(e)
+                print(f"Erreur lors du nettoyage des documents expirés: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "interval_seconds": self.interval_seconds,
+            "running": self._task is not None,
+            "runs": self.runs,
+            "deleted": dict(self.deleted),
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,138 @@
+import asyncio
+import datetime
+from typing import List, Optional
+
+from app.core.config import Settings
+from app.db.repositories.mail_queue_repository import MailQueueRepository
+from app.models.mail import MailMessageModel
+
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    # MongoDB renvoie des dates naïves (UTC)
+    return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+
+
+class MailQueueWorker:
+    """Workers de fond qui vident la file `mail_queue`.
+
+    Chaque worker réserve un lot de messages (au plus `mail_queue_batch_size`), les
+    envoie sur une même connexion SMTP du pool puis les marque envoyés. Un message en
+    échec est replanifié avec un backoff exponentiel
+    (`mail_queue_retry_base_seconds * 2 ** tentatives`) jusqu'à
+    `mail_queue_max_attempts` tentatives, puis marqué "failed". Les messages envoyés
+    ou en échec définitif sont supprimés après `mail_queue_retention_seconds`.
+    """
+
+    def __init__(self, db, email_service, settings: Settings):
+        self.mail_queue_repos = MailQueueRepository(db)
+        self.email_service = email_service
+        self.workers = settings.mail_queue_workers
+        self.batch_size = max(1, settings.mail_queue_batch_size)
+        self.poll_interval_seconds = settings.mail_queue_poll_interval_seconds
+        self.max_attempts = max(1, settings.mail_queue_max_attempts)
+        self.retry_base_seconds = settings.mail_queue_retry_base_seconds
+        self.lease_seconds = settings.mail_queue_lease_seconds
+        self.retention_seconds = settings.mail_queue_retention_seconds
+        self._tasks: List[asyncio.Task] = []
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.total_latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+    async def process_batch(self) -> int:
+        """Réserve et envoie un lot; retourne le nombre de messages traités."""
+        messages = await self.mail_queue_repos.claim_batch(
+            limit=self.batch_size, lease_seconds=self.lease_seconds
+        )
+        if not messages:
+            return 0
+        errors = await self.email_service.send_batch(messages)
+        sent_ids = []
+        for message, error in zip(messages, errors):
+            if error is None:
+                sent_ids.append(message.id)
+                self._record_sent(message)
+            else:
+                await self._record_failure(message, error)
+        await self.mail_queue_repos.mark_sent(sent_ids, self._expires_at())
+        return len(messages)
+
+    def _expires_at(self) -> datetime.datetime:
+        return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            seconds=self.retention_seconds
+        )
+
+    def _record_sent(self, message: MailMessageModel) -> None:
+        latency = (
+            datetime.datetime.now(datetime.timezone.utc) - _as_utc(message.created_at)
+        ).total_seconds()
+        self.sent += 1
+        self.total_latency_seconds += latency
+        self.max_latency_seconds = max(self.max_latency_seconds, latency)
+
+    async def _record_failure(self, message: MailMessageModel, error: Exception):
+        self.last_error = str(error)
+        retry_at = None
+        if message.attempts + 1 < self.max_attempts:
+            retry_at = datetime.datetime.now(
+                datetime.timezone.utc
+            ) + datetime.timedelta(
+                seconds=self.retry_base_seconds * 2**message.attempts
+            )
+            self.retried += 1
+        else:
+            self.failed += 1
+        await self.mail_queue_repos.mark_failed(
+            message, str(error), retry_at=retry_at, expires_at=self._expires_at()
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                # Base ou SMTP indisponible: on réessaie au prochain tour
+                self.last_error = str(e)
+                print(f"Erreur lors de l'envoi des e-mails en file: {e}")
+                processed = 0
+            if not processed:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._run()) for _ in range(max(0, self.workers))
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def stats(self) -> dict:
+        oldest_pending = await self.mail_queue_repos.oldest_pending()
+        return {
+            "workers": len(self._tasks),
+            "depth": await self.mail_queue_repos.count_by_status(),
+            "oldest_pending_age_seconds": (
+                (
+                    datetime.datetime.now(datetime.timezone.utc)
+                    - _as_utc(oldest_pending.created_at)
+                ).total_seconds()
+                if oldest_pending
+                else 0.0
+            ),
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "avg_latency_ms": (
+                round(self.total_latency_seconds / self.sent * 1000, 3)
+                if self.sent
+                else 0.0
+            ),
+            "max_latency_ms": round(self.max_latency_seconds * 1000, 3),
+            "last_error": self.last_error,
+        }
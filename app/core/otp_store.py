@@ -0,0 +1,196 @@
+import datetime
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.models.otp import OTPModel
+from app.providers.providers import get_settings
+
+
+class OTPStoreBackend(ABC):
+    """Stockage clé/valeur avec une date d'expiration par entrée.
+
+    Les valeurs sont des types simples (str, dict sérialisable) pour qu'un backend
+    partagé (type Redis: `GET`, `SET ... EXAT`, `DEL`) puisse remplacer le backend en
+    mémoire sans changer `ActiveOTPStore`.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryOTPStoreBackend(OTPStoreBackend):
+    """Backend en mémoire du processus, borné à `max_entries` entrées."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._purge_expired()
+        while len(self._entries) > self.max_entries:
+            # Les plus anciens OTP sont relus depuis la base si besoin
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        for key in [key for key, (exp, _) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ActiveOTPStore:
+    """OTP actifs (non utilisés, non expirés) gardés en mémoire par `OTPRepository`.
+
+    Le dépôt écrit toujours en base (audit, autres workers) puis dans ce store; les
+    lectures par id, par e-mail + code et du dernier OTP d'un e-mail le consultent
+    avant MongoDB. Un miss (autre worker, redémarrage, éviction) retombe sur la base:
+    le store n'est jamais la seule source de vérité. Un OTP est retiré dès qu'il est
+    marqué utilisé et chaque entrée expire avec l'OTP.
+
+    `OTP_STORE_BACKEND`: "memory" (par défaut) ou "none" pour désactiver le store.
+    """
+
+    _instance = None
+    _backend: Optional[OTPStoreBackend] = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ActiveOTPStore, cls).__new__(cls)
+            settings = get_settings()
+            if settings.otp_store_backend == "memory":
+                cls._backend = MemoryOTPStoreBackend(
+                    max_entries=settings.otp_store_max_entries
+                )
+            cls._instance.hits = 0
+            cls._instance.misses = 0
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        return self._backend is not None
+
+    @staticmethod
+    def _id_key(otp_id: str) -> str:
+        return f"otp:id:{otp_id}"
+
+    @staticmethod
+    def _code_key(email: str, code: str) -> str:
+        return f"otp:code:{email}:{code}"
+
+    @staticmethod
+    def _latest_key(email: str) -> str:
+        return f"otp:latest:{email}"
+
+    @staticmethod
+    def _expiry_timestamp(otp: OTPModel) -> float:
+        expires_at = otp.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+        return expires_at.timestamp()
+
+    def put(self, otp: OTPModel) -> None:
+        """Ajoute un OTP qui vient d'être enregistré en base (avec son id)."""
+        if not self.enabled or otp.is_used:
+            return
+        expires_at = self._expiry_timestamp(otp)
+        otp_id = str(otp.id)
+        self._backend.set(
+            self._id_key(otp_id), otp.model_dump(mode="json", by_alias=True), expires_at
+        )
+        self._backend.set(self._code_key(otp.email, otp.code), otp_id, expires_at)
+        self._backend.set(self._latest_key(otp.email), otp_id, expires_at)
+
+    def get_by_id(self, otp_id: str) -> Optional[OTPModel]:
+        if not self.enabled:
+            return None
+        doc = self._backend.get(self._id_key(str(otp_id)))
+        if doc is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # Nouvelle instance à chaque lecture: les appelants peuvent la modifier
+        return OTPModel.model_validate(doc)
+
+    def get_by_email_and_code(self, email: str, code: str) -> Optional[OTPModel]:
+        if not self.enabled:
+            return None
+        otp_id = self._backend.get(self._code_key(email, code))
+        if otp_id is None:
+            self.misses += 1
+            return None
+        return self.get_by_id(otp_id)
+
+    def get_latest_by_email(self, email: str) -> Optional[OTPModel]:
+        if not self.enabled:
+            return None
+        otp_id = self._backend.get(self._latest_key(email))
+        if otp_id is None:
+            self.misses += 1
+            return None
+        return self.get_by_id(otp_id)
+
+    def discard(self, otp_id: str) -> None:
+        """Retire un OTP (utilisé): les lectures suivantes passent par la base."""
+        if not self.enabled:
+            return
+        doc = self._backend.get(self._id_key(str(otp_id)))
+        self._backend.delete(self._id_key(str(otp_id)))
+        if doc is not None:
+            self._backend.delete(self._code_key(doc["email"], doc["code"]))
+            if self._backend.get(self._latest_key(doc["email"])) == str(otp_id):
+                self._backend.delete(self._latest_key(doc["email"]))
+
+    def clear(self) -> None:
+        if self.enabled:
+            self._backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self._backend).__name__ if self.enabled else None,
+            "size": len(self._backend) if self.enabled else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,78 @@
+import base64
+import binascii
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId, json_util
+from bson.errors import InvalidId
+
+
+# En-tête de réponse portant le curseur de la page suivante
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def parse_sort(sort: str) -> Tuple[str, int]:
+    """Convertit "created_at" / "-created_at" en (clé, sens MongoDB)."""
+    if sort.startswith("-"):
+        return sort[1:], -1
+    return sort, 1
+
+
+def keyset_position(sort: str, model: Any) -> Tuple[Any, ObjectId]:
+    """Position (valeur de tri, _id) d'un modèle (champ `id` aliasé en `_id`) dans
+    l'ordre `sort`."""
+    key, _ = parse_sort(sort)
+    last_id = ObjectId(model.id)
+    return (last_id if key == "_id" else getattr(model, key)), last_id
+
+
+def encode_cursor(sort: str, position: Tuple[Any, Any]) -> str:
+    """Curseur opaque désignant la position `position` pour le tri `sort`.
+
+    Il contient le tri, la valeur de tri et l'`_id` du dernier document (départage
+    des valeurs égales), sérialisés en JSON étendu (ObjectId, dates) puis en base64.
+    """
+    value, last_id = position
+    payload = {"s": sort, "v": value, "id": last_id}
+    return base64.urlsafe_b64encode(json_util.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, Any]:
+    """Retourne (valeur de tri, _id) d'un curseur émis pour le même tri `sort`.
+
+    Lève `ValueError` si le curseur est illisible ou a été émis pour un autre tri.
+    """
+    try:
+        payload = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value, last_id = payload["v"], payload["id"]
+        cursor_sort = payload["s"]
+    except (binascii.Error, ValueError, InvalidId, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort != sort:
+        raise ValueError("Cursor was issued for another sort order")
+    return value, last_id
+
+
+def keyset_query(sort: str, after: Optional[Tuple[Any, Any]]) -> Dict[str, Any]:
+    """Filtre des documents situés après `after` = (valeur de tri, _id) dans l'ordre
+    `sort` (ordre total: clé de tri puis `_id`)."""
+    if after is None:
+        return {}
+    key, direction = parse_sort(sort)
+    value, last_id = after
+    operator = "$gt" if direction == 1 else "$lt"
+    if key == "_id":
+        return {"_id": {operator: last_id}}
+    return {
+        "$or": [
+            {key: {operator: value}},
+            {key: value, "_id": {operator: last_id}},
+        ]
+    }
+
+
+def keyset_sort(sort: str) -> Dict[str, int]:
+    """Tri MongoDB correspondant: la clé demandée puis `_id` dans le même sens."""
+    key, direction = parse_sort(sort)
+    if key == "_id":
+        return {"_id": direction}
+    return {key: direction, "_id": direction}
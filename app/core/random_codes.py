@@ -0,0 +1,59 @@
+import secrets
+import string
+from typing import Collection, List
+
+
+PASSWORD_CHARACTERS = string.ascii_letters + string.digits + string.punctuation
+
+# Un tirage de 8 octets (64 bits) par code: assez pour des codes de 19 chiffres
+_DRAW_BYTES = 8
+_MAX_BATCH_LENGTH = 19
+
+
+def generate_numeric_code(length: int, exclude: Collection[str] = ()) -> str:
+    """Code numérique de `length` chiffres tiré avec `secrets` (un seul tirage par code).
+
+    Un code présent dans `exclude` (ex: les OTP encore actifs du même e-mail) est
+    retiré au sort.
+    """
+    while True:
+        code = f"{secrets.randbelow(10**length):0{length}d}"
+        if code not in exclude:
+            return code
+
+
+def generate_numeric_codes(count: int, length: int) -> List[str]:
+    """`count` codes numériques de `length` chiffres, pour l'émission en masse.
+
+    Les octets aléatoires de tout le lot sont lus en un seul appel au générateur du
+    système; les tirages au-delà du dernier multiple de 10**length sont rejetés pour
+    que chaque code reste uniforme.
+    """
+    if length > _MAX_BATCH_LENGTH:
+        return [generate_numeric_code(length) for _ in range(count)]
+    modulus = 10**length
+    limit = (1 << (8 * _DRAW_BYTES)) - (1 << (8 * _DRAW_BYTES)) % modulus
+    codes: List[str] = []
+    while len(codes) < count:
+        random_bytes = secrets.token_bytes(_DRAW_BYTES * (count - len(codes)))
+        for offset in range(0, len(random_bytes), _DRAW_BYTES):
+            value = int.from_bytes(random_bytes[offset : offset + _DRAW_BYTES], "big")
+            if value < limit:
+                codes.append(f"{value % modulus:0{length}d}")
+    return codes
+
+
+def generate_password(length: int = 12) -> str:
+    """Mot de passe aléatoire (lettres, chiffres et ponctuation) tiré avec `secrets`.
+
+    Un octet aléatoire par caractère, lus par blocs; les octets au-delà du dernier
+    multiple du nombre de caractères sont rejetés (pas de biais de modulo).
+    """
+    alphabet_size = len(PASSWORD_CHARACTERS)
+    limit = 256 - 256 % alphabet_size
+    characters: List[str] = []
+    while len(characters) < length:
+        for byte in secrets.token_bytes(2 * (length - len(characters))):
+            if byte < limit:
+                characters.append(PASSWORD_CHARACTERS[byte % alphabet_size])
+    return "".join(characters[:length])
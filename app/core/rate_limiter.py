@@ -0,0 +1,138 @@
+import math
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import parse_rate
+from app.providers.providers import get_settings
+
+
+# Règles limitées et identités comptées séparément pour chacune
+RATE_LIMIT_RULES = ("otp_request", "otp_verify", "login", "password_reset")
+RATE_LIMIT_SCOPES = ("email", "ip")
+
+# Nombre maximal de compteurs en mémoire: au-delà, les moins récemment utilisés sont
+# oubliés (les clés e-mail sont choisies par le client, leur nombre n'est pas borné)
+_MAX_TRACKED_KEYS = 100_000
+
+
+class TokenBucket:
+    """Seau à jetons: `limit` appels d'affilée, puis un appel par `period / limit` s."""
+
+    __slots__ = ("tokens", "updated_at")
+
+    def __init__(self, limit: int, now: float):
+        self.tokens = float(limit)
+        self.updated_at = now
+
+    def refill(self, limit: int, period: float, now: float) -> None:
+        self.tokens = min(limit, self.tokens + (now - self.updated_at) * limit / period)
+        self.updated_at = now
+
+    def consume(self, limit: int, period: float, now: float) -> float:
+        """Consomme un jeton; retourne 0 si l'appel est autorisé, sinon le délai d'attente."""
+        self.refill(limit, period, now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) * period / limit
+
+
+class RateLimiter:
+    """Limitation de débit des routes sensibles (envoi/vérification d'OTP, login,
+    réinitialisation du mot de passe), par e-mail et par adresse IP.
+
+    - backend "memory": seau à jetons par clé, propre à chaque worker, au plus
+      `_MAX_TRACKED_KEYS` clés (éviction LRU),
+    - backend "mongo": compteur par fenêtre fixe dans la collection `rate_limits`,
+      partagé par tous les workers (un aller-retour `find_one_and_update` par clé).
+
+    Les limites sont lues dans `Settings` (`RATE_LIMIT_<REGLE>_<EMAIL|IP>`, au format
+    "appels/secondes"). La limite par IP est vérifiée en premier: un appel qu'elle
+    refuse n'est pas décompté de la limite par e-mail. Un appel refusé lève une 429
+    avec l'en-tête `Retry-After`.
+    """
+
+    _instance = None
+    _buckets: "OrderedDict[str, TokenBucket]" = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RateLimiter, cls).__new__(cls)
+            settings = get_settings()
+            cls.enabled = settings.rate_limit_enabled
+            cls.backend = settings.rate_limit_backend
+            cls.limits = {
+                (rule, scope): parse_rate(
+                    getattr(settings, f"rate_limit_{rule}_{scope}")
+                )
+                for rule in RATE_LIMIT_RULES
+                for scope in RATE_LIMIT_SCOPES
+            }
+            cls._instance.reset()
+        return cls._instance
+
+    def reset(self) -> None:
+        self._buckets = OrderedDict()
+        self.allowed: Dict[str, int] = defaultdict(int)
+        self.limited: Dict[str, int] = defaultdict(int)
+
+    def _hit_memory(self, key: str, limit: int, period: float) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_TRACKED_KEYS:
+                # Oublie le seau utilisé le moins récemment (O(1))
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = TokenBucket(limit, now)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.consume(limit, period, now)
+
+    async def _hit_mongo(self, key: str, limit: int, period: float, repos) -> float:
+        count, window_remaining = await repos.hit(key, period)
+        return 0.0 if count <= limit else window_remaining
+
+    async def check(
+        self,
+        rule: str,
+        email: Optional[str] = None,
+        ip: Optional[str] = None,
+        rate_limit_repos=None,
+    ) -> None:
+        """Compte un appel à `rule` et lève une 429 si une limite est dépassée."""
+        if not self.enabled:
+            return
+        retry_after = 0.0
+        for scope, identity in (("ip", ip), ("email", email)):
+            limit = self.limits.get((rule, scope))
+            if not limit or not identity:
+                continue
+            key = f"{rule}:{scope}:{identity.lower()}"
+            if self.backend == "mongo" and rate_limit_repos is not None:
+                retry_after = await self._hit_mongo(key, *limit, rate_limit_repos)
+            else:
+                retry_after = self._hit_memory(key, *limit)
+            if retry_after:
+                break
+
+        if retry_after:
+            self.limited[rule] += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        self.allowed[rule] += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend,
+            "tracked_keys": len(self._buckets),
+            "allowed": dict(self.allowed),
+            "limited": dict(self.limited),
+        }
@@ -0,0 +1,174 @@
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from app.models.role import RoleModel
+from app.providers.providers import get_settings
+
+
+class RoleGraphIndex:
+    """Index en mémoire de la fermeture transitive du graphe d'héritage des rôles.
+
+    Pour chaque rôle connu on garde:
+    - `ancestors`: le rôle lui-même et tous les rôles qu'il hérite (directement ou non),
+    - `permissions`: ses permissions effectives (les siennes et celles des rôles hérités).
+
+    L'index est chargé une seule fois (une requête) puis maintenu de façon incrémentale
+    par `RoleService` à chaque écriture; seuls les rôles qui héritent du rôle modifié sont
+    recalculés. Il est rechargé périodiquement (au plus tous les
+    `PERMISSION_CACHE_TTL_SECONDS`) pour prendre en compte les écritures des autres
+    workers, et systématiquement avant la validation d'une écriture.
+    """
+
+    _instance = None
+    _refresh_seconds: float = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(RoleGraphIndex, cls).__new__(cls)
+            settings = get_settings()
+            # L'index ne doit pas être plus ancien que les permissions en cache: sinon
+            # les deux délais s'additionnent avant qu'un changement de rôle s'applique
+            cls._refresh_seconds = settings.role_index_refresh_seconds
+            if settings.permission_cache_ttl_seconds > 0:
+                cls._refresh_seconds = min(
+                    cls._refresh_seconds, settings.permission_cache_ttl_seconds
+                )
+            cls._instance.reset()
+        return cls._instance
+
+    def reset(self) -> None:
+        """Oublie l'index, il sera rechargé à la prochaine lecture."""
+        self._roles: Dict[str, Tuple[FrozenSet[str], Tuple[str, ...]]] = {}
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+        self._permissions: Dict[str, FrozenSet[str]] = {}
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None and (
+            time.monotonic() - self._loaded_at < self._refresh_seconds
+        )
+
+    async def ensure_loaded(self, role_repos) -> "RoleGraphIndex":
+        """Charge (ou recharge si périmé) l'index depuis le dépôt des rôles."""
+        if not self.is_loaded:
+            await self._load(role_repos)
+        return self
+
+    async def reload(self, role_repos) -> "RoleGraphIndex":
+        """Recharge l'index depuis la base, quel que soit son âge.
+
+        Utilisé avant une écriture (existence des rôles hérités, détection des cycles)
+        pour tenir compte des écritures des autres workers.
+        """
+        await self._load(role_repos)
+        return self
+
+    @staticmethod
+    def _entry(role: RoleModel) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+        return frozenset(role.permissions), tuple(role.inherited_roles)
+
+    async def _load(self, role_repos) -> None:
+        # Les rôles sont indexés au fil du curseur, sans liste intermédiaire
+        self._index(
+            {role.name: self._entry(role) async for role in role_repos.iter_roles()}
+        )
+
+    def rebuild(self, roles: Iterable[RoleModel]) -> None:
+        self._index({role.name: self._entry(role) for role in roles})
+
+    def _index(self, roles: Dict[str, Tuple[FrozenSet[str], Tuple[str, ...]]]):
+        self._roles = roles
+        self._ancestors = {}
+        self._permissions = {}
+        self._recompute(set(self._roles))
+        self._loaded_at = time.monotonic()
+
+    def upsert_role(self, role: RoleModel, previous_name: Optional[str] = None):
+        """Met à jour l'index après la création ou la modification d'un rôle."""
+        if not self._loaded_at:
+            return
+        affected = self._dependents(role.name)
+        if previous_name and previous_name != role.name:
+            affected |= self._dependents(previous_name)
+            self._drop(previous_name)
+        self._roles[role.name] = self._entry(role)
+        affected.add(role.name)
+        self._recompute(affected)
+
+    def remove_role(self, role_name: str) -> None:
+        """Met à jour l'index après la suppression d'un rôle."""
+        if not self._loaded_at:
+            return
+        affected = self._dependents(role_name)
+        self._drop(role_name)
+        affected.discard(role_name)
+        self._recompute(affected)
+
+    def has_role(self, role_name: str) -> bool:
+        return role_name in self._roles
+
+    def ancestors(self, role_name: str) -> FrozenSet[str]:
+        """Le rôle et tous les rôles dont il hérite."""
+        return self._ancestors.get(role_name, frozenset((role_name,)))
+
+    def effective_permissions(self, role_name: str) -> FrozenSet[str]:
+        return self._permissions.get(role_name, frozenset())
+
+    def roles_closure(self, role_names: Iterable[str]) -> Set[str]:
+        roles = set()
+        for role_name in role_names:
+            roles |= self.ancestors(role_name)
+        return roles
+
+    def permissions_closure(self, role_names: Iterable[str]) -> Set[str]:
+        permissions = set()
+        for role_name in role_names:
+            permissions |= self.effective_permissions(role_name)
+        return permissions
+
+    def is_reachable(self, start_role_name: str, target_role_name: str) -> bool:
+        """Indique si `target_role_name` est atteignable depuis `start_role_name`."""
+        return target_role_name in self.ancestors(start_role_name)
+
+    def _dependents(self, role_name: str) -> Set[str]:
+        """Rôles dont la fermeture contient `role_name` (à recalculer s'il change)."""
+        return {
+            name
+            for name, ancestors in self._ancestors.items()
+            if role_name in ancestors
+        }
+
+    def _drop(self, role_name: str) -> None:
+        self._roles.pop(role_name, None)
+        self._ancestors.pop(role_name, None)
+        self._permissions.pop(role_name, None)
+
+    def _recompute(self, role_names: Set[str]) -> None:
+        stale = {name for name in role_names if name in self._roles}
+        for name in role_names:
+            self._ancestors.pop(name, None)
+            self._permissions.pop(name, None)
+
+        for name in stale:
+            own_permissions, inherited = self._roles[name]
+            ancestors = {name}
+            permissions = set(own_permissions)
+            to_visit = list(inherited)
+            while to_visit:
+                current = to_visit.pop()
+                if current in ancestors:
+                    continue
+                if current not in stale and current in self._ancestors:
+                    # Fermeture déjà à jour: on la réutilise telle quelle
+                    ancestors |= self._ancestors[current]
+                    permissions |= self._permissions[current]
+                    continue
+                ancestors.add(current)
+                if current in self._roles:
+                    current_permissions, current_inherited = self._roles[current]
+                    permissions |= current_permissions
+                    to_visit.extend(current_inherited)
+            self._ancestors[name] = frozenset(ancestors)
+            self._permissions[name] = frozenset(permissions)
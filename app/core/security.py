@@ -1,7 +1,14 @@
-import random
-import string
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
+from app.core.random_codes import generate_password
+from app.providers.providers import get_settings
+
 
 class SecurityUtils:
     _instance = None
@@ -10,8 +17,9 @@ class SecurityUtils:
     # Singleton
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(SecurityUtils, cls).__new__(cls)
+            # Contexte créé avant l'instance: les workers du pool peuvent l'appeler en parallèle
             cls._pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+            cls._instance = super(SecurityUtils, cls).__new__(cls)
         return cls._instance
 
     @staticmethod
@@ -29,9 +37,124 @@ class SecurityUtils:
             SecurityUtils()
         return SecurityUtils._pwd_context.verify(plain, hashed)
 
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash le mot de passe dans le pool dédié, sans bloquer la boucle d'événements."""
+        return await PasswordHashingPool().run(SecurityUtils.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(plain: str, hashed: str) -> bool:
+        """Vérifie le mot de passe dans le pool dédié, sans bloquer la boucle d'événements."""
+        return await PasswordHashingPool().run(
+            SecurityUtils.verify_password, plain, hashed
+        )
+
     def generate_random_password(length: int = 12) -> str:
         """
-        Génère un mot de passe aléatoire.
+        Génère un mot de passe aléatoire (tiré avec `secrets`).
         """
-        characters = string.ascii_letters + string.digits + string.punctuation
-        return "".join(random.choice(characters) for _ in range(length))
+        return generate_password(length)
+
+
+def _timed_call(func: Callable, *args) -> tuple[Any, float]:
+    # Exécuté dans le worker: on date le début effectif pour mesurer l'attente en file
+    started_at = time.monotonic()
+    return func(*args), started_at
+
+
+class PasswordHashingPool:
+    """Pool borné de workers (threads ou processus) pour les calculs bcrypt.
+
+    Au plus `password_hash_max_workers` calculs s'exécutent en parallèle; les suivants
+    attendent dans la file de l'executor. Au-delà de `password_hash_max_queue` appels
+    en attente, les nouveaux appels sont refusés (503) plutôt que d'allonger la file
+    indéfiniment pendant un pic de connexions.
+    """
+
+    _instance = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PasswordHashingPool, cls).__new__(cls)
+            settings = get_settings()
+            cls._instance._executor_kind = settings.password_hash_executor
+            cls._instance._max_workers = max(1, settings.password_hash_max_workers)
+            cls._instance._max_queue = settings.password_hash_max_queue
+            cls._instance._executor = None
+            cls._instance.reset_stats()
+        return cls._instance
+
+    def reset_stats(self) -> None:
+        self._in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_in_flight = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="password-hashing",
+                )
+        return self._executor
+
+    @property
+    def queued(self) -> int:
+        return max(0, self._in_flight - self._max_workers)
+
+    async def run(self, func: Callable, *args) -> Any:
+        if self._max_queue > 0 and self.queued >= self._max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many authentication requests, please retry later",
+                headers={"Retry-After": "1"},
+            )
+
+        self.submitted += 1
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        submitted_at = time.monotonic()
+        try:
+            result, started_at = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+
+        wait_seconds = max(0.0, started_at - submitted_at)
+        self.completed += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self._executor_kind,
+            "max_workers": self._max_workers,
+            "max_queue": self._max_queue,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (
+                round(self.total_wait_seconds / self.completed * 1000, 3)
+                if self.completed
+                else 0.0
+            ),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
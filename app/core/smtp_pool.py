@@ -0,0 +1,187 @@
+import queue
+import smtplib
+import ssl
+import threading
+import time
+from typing import List, Optional, Tuple
+
+
+class PooledSMTPConnection:
+    """Connexion SMTP authentifiée gardée ouverte entre deux envois."""
+
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.created_at = time.monotonic()
+        self.last_used_at = self.created_at
+        self.messages_sent = 0
+
+    def close(self) -> None:
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            # Connexion déjà fermée côté serveur: rien d'autre à libérer
+            self.server.close()
+
+
+class SMTPConnectionPool:
+    """Pool de connexions SMTP persistantes, partagé par les threads d'envoi.
+
+    - au plus `max_connections` connexions ouvertes (les envois suivants attendent),
+    - une connexion inactive depuis plus de `idle_timeout_seconds` est fermée,
+    - une connexion inactive depuis plus de `noop_after_seconds` est vérifiée par NOOP,
+    - une connexion est renouvelée après `max_messages_per_connection` envois,
+    - un envoi qui échoue sur une connexion coupée est retenté une fois sur une
+      nouvelle connexion.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool = False,
+        use_ssl: bool = False,
+        max_connections: int = 4,
+        max_messages_per_connection: int = 100,
+        idle_timeout_seconds: float = 60,
+        noop_after_seconds: float = 10,
+        acquire_timeout_seconds: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.max_connections = max(1, max_connections)
+        self.max_messages_per_connection = max(1, max_messages_per_connection)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.noop_after_seconds = noop_after_seconds
+        self.acquire_timeout_seconds = acquire_timeout_seconds
+        self._idle: "queue.LifoQueue[PooledSMTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._stats_lock = threading.Lock()
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.reconnects = 0
+        self.messages_sent = 0
+
+    def _ssl_context(self) -> ssl.SSLContext:
+        context = ssl.create_default_context()
+        # Tests sans vérification du certificat(juste en mode dev/test)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    def _connect(self) -> PooledSMTPConnection:
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, context=self._ssl_context())
+        else:
+            server = smtplib.SMTP(self.host, self.port)
+        try:
+            if self.use_tls and not self.use_ssl:
+                server.starttls(context=self._ssl_context())
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        with self._stats_lock:
+            self.connections_opened += 1
+        return PooledSMTPConnection(server)
+
+    def _is_alive(self, connection: PooledSMTPConnection) -> bool:
+        idle_seconds = time.monotonic() - connection.last_used_at
+        if idle_seconds > self.idle_timeout_seconds:
+            return False
+        if idle_seconds > self.noop_after_seconds:
+            try:
+                return connection.server.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                return False
+        return True
+
+    def _acquire(self) -> PooledSMTPConnection:
+        if not self._slots.acquire(timeout=self.acquire_timeout_seconds):
+            raise smtplib.SMTPException("No SMTP connection available in the pool")
+        try:
+            while True:
+                try:
+                    connection = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+                if self._is_alive(connection):
+                    with self._stats_lock:
+                        self.connections_reused += 1
+                    return connection
+                connection.close()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, connection: PooledSMTPConnection, broken: bool = False):
+        try:
+            if broken or connection.messages_sent >= self.max_messages_per_connection:
+                connection.close()
+            else:
+                connection.last_used_at = time.monotonic()
+                self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def send(self, sender: str, recipient: str, message: str) -> None:
+        """Envoie un message (appel bloquant, à exécuter hors de la boucle d'événements)."""
+        for attempt in range(2):
+            connection = self._acquire()
+            try:
+                connection.server.sendmail(sender, recipient, message)
+            except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                # Connexion coupée par le serveur: on la jette et on retente une fois
+                self._release(connection, broken=True)
+                if attempt:
+                    raise e
+                with self._stats_lock:
+                    self.reconnects += 1
+                continue
+            except Exception:
+                self._release(connection, broken=True)
+                raise
+            connection.messages_sent += 1
+            with self._stats_lock:
+                self.messages_sent += 1
+            self._release(connection)
+            return
+
+    def send_many(
+        self, sender: str, messages: List[Tuple[str, str]]
+    ) -> List[Optional[Exception]]:
+        """Envoie un lot de messages `(destinataire, message)` depuis le même thread:
+        la connexion libérée après un envoi est reprise pour le suivant (pile LIFO).
+
+        Retourne, pour chaque message, l'erreur rencontrée ou None s'il a été envoyé.
+        """
+        errors: List[Optional[Exception]] = []
+        for recipient, message in messages:
+            try:
+                self.send(sender, recipient, message)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "idle_connections": self._idle.qsize(),
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reconnects": self.reconnects,
+            "messages_sent": self.messages_sent,
+        }
@@ -0,0 +1,82 @@
+import datetime
+import time
+from typing import Dict, Iterable, Optional
+
+from app.models.access_token import RevokedTokenModel
+from app.providers.providers import get_settings
+
+
+# Recouvrement entre deux synchronisations, pour ne pas manquer une révocation
+# insérée avec un léger décalage d'horloge entre workers
+_SYNC_OVERLAP = datetime.timedelta(seconds=5)
+
+
+class TokenRevocationList:
+    """Liste de révocation en mémoire utilisée par la vérification "stateless" des JWT.
+
+    En mode stateless, la signature et l'expiration (`exp`) du JWT font foi et on ne
+    consulte plus la collection `tokens`: seul l'identifiant unique du jeton (`jti`)
+    est comparé à cette liste. Elle est alimentée localement lors des révocations
+    (logout, revoke) et resynchronisée depuis la collection `revoked_tokens` au plus
+    toutes les `token_revocation_refresh_seconds` secondes, ce qui borne le délai de
+    prise en compte d'une révocation faite par un autre worker.
+    """
+
+    _instance = None
+    _refresh_seconds: float = None
+
+    # Singleton
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TokenRevocationList, cls).__new__(cls)
+            cls._refresh_seconds = get_settings().token_revocation_refresh_seconds
+            cls._instance.reset()
+        return cls._instance
+
+    def reset(self) -> None:
+        # jti -> timestamp d'expiration du jeton révoqué
+        self._revoked: Dict[str, float] = {}
+        self._last_refresh: Optional[float] = None
+        self._synced_until: Optional[datetime.datetime] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return (
+            self._last_refresh is None
+            or time.monotonic() - self._last_refresh >= self._refresh_seconds
+        )
+
+    async def refresh_if_stale(self, revoked_token_repos) -> "TokenRevocationList":
+        """Récupère les révocations enregistrées depuis la dernière synchronisation."""
+        if self.is_stale:
+            self._last_refresh = time.monotonic()
+            revoked_tokens = await revoked_token_repos.list_revoked_since(
+                since=self._synced_until - _SYNC_OVERLAP if self._synced_until else None
+            )
+            self.add(revoked_tokens)
+            if revoked_tokens:
+                self._synced_until = revoked_tokens[-1].revoked_at
+            self._purge_expired()
+        return self
+
+    def add(self, revoked_tokens: Iterable[RevokedTokenModel]) -> None:
+        for revoked_token in revoked_tokens:
+            expires_at = revoked_token.expires_at
+            if expires_at.tzinfo is None:
+                expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+            self._revoked[revoked_token.jti] = expires_at.timestamp()
+
+    def is_revoked(self, jti: str) -> bool:
+        return jti in self._revoked
+
+    def _purge_expired(self) -> None:
+        # Un jeton expiré est de toute façon rejeté à la vérification de `exp`
+        now = time.time()
+        self._revoked = {
+            jti: expires_at
+            for jti, expires_at in self._revoked.items()
+            if expires_at > now
+        }
+
+    def __len__(self) -> int:
+        return len(self._revoked)
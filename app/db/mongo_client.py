@@ -1,14 +1,23 @@
 # db/mongo_client.py
+import asyncio
+
 from motor.motor_asyncio import AsyncIOMotorClient
 
 
 class MongoClient:
-    def __init__(self, uri: str, db_name: str):
-        self.client = AsyncIOMotorClient(uri)
+    def __init__(self, uri: str, db_name: str, **client_options):
+        # client_options: options du pool transmises à Motor (maxPoolSize, minPoolSize...)
+        self.client = AsyncIOMotorClient(uri, **client_options)
         self.db = self.client[db_name]
 
     def get_db(self):
         return self.db
 
+    async def warm_up(self, connections: int = 1) -> None:
+        """Ouvre `connections` connexions du pool en envoyant des pings concurrents."""
+        await asyncio.gather(
+            *(self.client.admin.command("ping") for _ in range(max(1, connections)))
+        )
+
     def close(self):
         return self.client.close()
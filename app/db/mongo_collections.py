@@ -6,4 +6,8 @@ class DBCollections:
     ROLES = "roles"
     PERMISSIONS = "permissions"
     TOKENS = "tokens"
+    REVOKED_TOKENS = "revoked_tokens"
     OTPS = "otps"
+    MAIL_QUEUE = "mail_queue"
+    RATE_LIMITS = "rate_limits"
+    OTP_CAMPAIGNS = "otp_campaigns"
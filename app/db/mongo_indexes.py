@@ -0,0 +1,124 @@
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.db.mongo_collections import DBCollections
+
+
+# Index TTL: MongoDB supprime le document dès que la date `expires_at` est dépassée
+# (le moniteur TTL passe environ toutes les 60 secondes)
+_EXPIRES_AT_TTL = IndexModel(
+    [("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0
+)
+
+# Index déclarés pour chaque collection, appliqués au démarrage et par les seeders.
+# Chaque index porte un nom explicite pour pouvoir comparer l'attendu à l'existant.
+MONGO_INDEXES: Dict[str, List[IndexModel]] = {
+    DBCollections.USERS: [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("phone_number", ASCENDING)], name="phone_number", sparse=True),
+        # Pagination par clé de GET /users/?sort=created_at (départage sur _id)
+        IndexModel(
+            [("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id"
+        ),
+    ],
+    DBCollections.ROLES: [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+    ],
+    DBCollections.PERMISSIONS: [
+        IndexModel([("code", ASCENDING)], name="code_unique", unique=True),
+    ],
+    DBCollections.TOKENS: [
+        IndexModel([("token", ASCENDING)], name="token_unique", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id"),
+        _EXPIRES_AT_TTL,
+    ],
+    DBCollections.REVOKED_TOKENS: [
+        IndexModel([("revoked_at", ASCENDING)], name="revoked_at"),
+        _EXPIRES_AT_TTL,
+    ],
+    DBCollections.OTPS: [
+        # Vérification d'un code: {"email", "code", "is_used"} (le préfixe sert aussi
+        # aux recherches par email)
+        IndexModel(
+            [("email", ASCENDING), ("code", ASCENDING), ("is_used", ASCENDING)],
+            name="email_code_is_used",
+        ),
+        # Dernier OTP non utilisé d'un email
+        IndexModel(
+            [("email", ASCENDING), ("is_used", ASCENDING), ("created_at", DESCENDING)],
+            name="email_is_used_created_at",
+        ),
+        IndexModel([("code", ASCENDING)], name="code"),
+        _EXPIRES_AT_TTL,
+    ],
+    DBCollections.MAIL_QUEUE: [
+        # Réservation des messages à envoyer par les workers
+        IndexModel(
+            [("status", ASCENDING), ("next_attempt_at", ASCENDING)],
+            name="status_next_attempt_at",
+        ),
+        # Messages réservés par un worker (lecture du lot après sa réservation)
+        IndexModel([("lease_token", ASCENDING)], name="lease_token"),
+        # Messages envoyés ou définitivement en échec, supprimés après
+        # MAIL_QUEUE_RETENTION_SECONDS (`expires_at` n'est renseigné qu'à ce moment)
+        _EXPIRES_AT_TTL,
+    ],
+    DBCollections.RATE_LIMITS: [
+        # Compteurs de fenêtre supprimés à la fin de leur fenêtre
+        _EXPIRES_AT_TTL,
+    ],
+}
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """Crée les index déclarés (opération idempotente).
+
+    Retourne, par collection, les noms des index créés ou déjà présents; une collection
+    dont les index ne peuvent pas être créés (ex: doublons sur un index unique) est
+    signalée sous la clé "errors" sans interrompre les autres.
+    """
+    report: Dict[str, List[str]] = {"errors": []}
+    for collection_name, indexes in MONGO_INDEXES.items():
+        try:
+            report[collection_name] = await db.get_collection(
+                collection_name
+            ).create_indexes(indexes)
+        except OperationFailure as e:
+            report["errors"].append(f"{collection_name}: {e}")
+    return report
+
+
+async def verify_indexes(db) -> Dict[str, Dict[str, List[str]]]:
+    """Compare les index existants au registre.
+
+    - `missing`: index déclarés mais absents de la base,
+    - `unexpected`: index présents en base mais non déclarés,
+    - `unused`: index déclarés qui n'ont servi à aucune requête depuis le démarrage
+      du serveur MongoDB (d'après `$indexStats`).
+    """
+    report = {"missing": {}, "unexpected": {}, "unused": {}}
+    for collection_name, indexes in MONGO_INDEXES.items():
+        collection = db.get_collection(collection_name)
+        expected = {index.document["name"] for index in indexes}
+        existing = set(await collection.index_information()) - {"_id_"}
+
+        if expected - existing:
+            report["missing"][collection_name] = sorted(expected - existing)
+        if existing - expected:
+            report["unexpected"][collection_name] = sorted(existing - expected)
+
+        try:
+            stats = await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+        except OperationFailure:
+            # $indexStats n'est pas disponible (droits insuffisants, version)
+            continue
+        unused = sorted(
+            stat["name"]
+            for stat in stats
+            if stat["name"] in expected and stat["accesses"]["ops"] == 0
+        )
+        if unused:
+            report["unused"][collection_name] = unused
+    return report
@@ -1,3 +1,4 @@
+import datetime
 from typing import List
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -47,6 +48,11 @@ class AccessTokenRepository:
         )
         return inserted_id
 
+    async def create_and_get(self, access_token: AccessTokenModel) -> AccessTokenModel:
+        """Insère le jeton et le retourne avec son identifiant, sans relecture en base."""
+        inserted_id = await self.create(access_token)
+        return access_token.model_copy(update={"id": inserted_id})
+
     async def update(self, access_token_id: str, update_data: dict) -> bool:
         modified_count = await self._db_ops.update_one(
             {"_id": ObjectId(access_token_id)}, {"$set": update_data}
@@ -67,6 +73,12 @@ class AccessTokenRepository:
         deleted_count = await self._db_ops.delete_many({"user_id": user_id})
         return deleted_count > 0
 
+    async def delete_expired_tokens(self) -> int:
+        """Supprime les jetons expirés et retourne le nombre de documents supprimés."""
+        return await self._db_ops.delete_many(
+            {"expires_at": {"$lt": datetime.datetime.now(datetime.timezone.utc)}}
+        )
+
     async def delete_all(self) -> bool:
         deleted_count = await self._db_ops.delete_many({})
         return deleted_count > 0
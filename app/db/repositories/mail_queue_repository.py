@@ -0,0 +1,141 @@
+import datetime
+import uuid
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.mongo_collections import DBCollections
+from app.models.mail import MailMessageModel, MailStatusEnum
+from app.utils.db_utils.mongo_utils import MongoCollectionOperations
+
+
+class MailQueueRepository:
+    """
+    Dépôt de la file d'envoi des e-mails (collection `mail_queue`).
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db_ops = MongoCollectionOperations(db, DBCollections.MAIL_QUEUE)
+
+    async def enqueue(self, message: MailMessageModel) -> str:
+        return await self._db_ops.insert_one(
+            message.model_dump(by_alias=True, exclude=["id"])
+        )
+
+    async def enqueue_many(self, messages: List[MailMessageModel]) -> List[str]:
+        if not messages:
+            return []
+        return await self._db_ops.insert_many(
+            [message.model_dump(by_alias=True, exclude=["id"]) for message in messages]
+        )
+
+    async def find_by_id(self, id: str) -> Optional[MailMessageModel]:
+        doc = await self._db_ops.find_one({"_id": ObjectId(id)})
+        return MailMessageModel(**doc) if doc else None
+
+    async def claim_batch(
+        self, limit: int, lease_seconds: float
+    ) -> List[MailMessageModel]:
+        """Réserve jusqu'à `limit` messages prêts à être envoyés, en trois allers-retours
+        quelle que soit la taille du lot.
+
+        Les candidats sont lus (projection sur `_id`), puis passés en "sending" par un
+        seul `update_many` qui les marque d'un jeton de réservation propre à cet appel
+        et re-vérifie qu'ils sont toujours disponibles: un message ne peut donc être
+        réservé que par un seul worker (même entre plusieurs processus). Le lot est
+        enfin relu par son jeton.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        query = {
+            "$or": [
+                {
+                    "status": MailStatusEnum.PENDING.value,
+                    "next_attempt_at": {"$lte": now},
+                },
+                {"status": MailStatusEnum.SENDING.value, "locked_until": {"$lt": now}},
+            ]
+        }
+        candidates = await self._db_ops.find_many(
+            query, projection={"_id": 1}, limit=limit
+        )
+        if not candidates:
+            return []
+        lease_token = uuid.uuid4().hex
+        claimed = await self._db_ops.update_many(
+            {"_id": {"$in": [doc["_id"] for doc in candidates]}, **query},
+            {
+                "$set": {
+                    "status": MailStatusEnum.SENDING.value,
+                    "locked_until": now + datetime.timedelta(seconds=lease_seconds),
+                    "lease_token": lease_token,
+                }
+            },
+        )
+        if not claimed:
+            return []
+        docs = await self._db_ops.find_many({"lease_token": lease_token})
+        return [MailMessageModel(**doc) for doc in docs]
+
+    async def mark_sent(
+        self, message_ids: List[str], expires_at: datetime.datetime
+    ) -> int:
+        """Marque envoyés les messages d'un lot (un seul `update_many`); ils seront
+        supprimés à `expires_at`."""
+        if not message_ids:
+            return 0
+        return await self._db_ops.update_many(
+            {"_id": {"$in": [ObjectId(message_id) for message_id in message_ids]}},
+            {
+                "$set": {
+                    "status": MailStatusEnum.SENT.value,
+                    "sent_at": datetime.datetime.now(datetime.timezone.utc),
+                    "locked_until": None,
+                    "lease_token": None,
+                    "expires_at": expires_at,
+                }
+            },
+        )
+
+    async def mark_failed(
+        self,
+        message: MailMessageModel,
+        error: str,
+        retry_at: Optional[datetime.datetime] = None,
+        expires_at: Optional[datetime.datetime] = None,
+    ) -> bool:
+        """Enregistre un échec: le message est replanifié à `retry_at`, ou définitivement
+        en échec si `retry_at` est None (il sera alors supprimé à `expires_at`)."""
+        modified_count = await self._db_ops.update_one(
+            {"_id": ObjectId(message.id)},
+            {
+                "$set": {
+                    "status": (
+                        MailStatusEnum.PENDING.value
+                        if retry_at
+                        else MailStatusEnum.FAILED.value
+                    ),
+                    "attempts": message.attempts + 1,
+                    "last_error": error,
+                    "next_attempt_at": retry_at or message.next_attempt_at,
+                    "locked_until": None,
+                    "lease_token": None,
+                    "expires_at": None if retry_at else expires_at,
+                }
+            },
+        )
+        return modified_count > 0
+
+    async def count_by_status(self) -> Dict[str, int]:
+        return {
+            status.value: await self._db_ops.count({"status": status.value})
+            for status in MailStatusEnum
+        }
+
+    async def oldest_pending(self) -> Optional[MailMessageModel]:
+        docs = await self._db_ops.find_many(
+            {"status": MailStatusEnum.PENDING.value},
+            sort={"created_at": 1},
+            limit=1,
+        )
+        return MailMessageModel(**docs[0]) if docs else None
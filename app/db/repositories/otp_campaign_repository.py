@@ -0,0 +1,32 @@
+from typing import Optional
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.mongo_collections import DBCollections
+from app.models.otp import OTPCampaignModel
+from app.utils.db_utils.mongo_utils import MongoCollectionOperations
+
+
+class OTPCampaignRepository:
+    """
+    Dépôt des envois groupés d'OTP (collection `otp_campaigns`).
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db_ops = MongoCollectionOperations(db, DBCollections.OTP_CAMPAIGNS)
+
+    async def create_and_get(self, campaign: OTPCampaignModel) -> OTPCampaignModel:
+        campaign_id = await self._db_ops.insert_one(
+            campaign.model_dump(by_alias=True, exclude=["id"])
+        )
+        return campaign.model_copy(update={"id": str(campaign_id)})
+
+    async def find_by_id(self, id: str) -> Optional[OTPCampaignModel]:
+        doc = await self._db_ops.find_one({"_id": ObjectId(id)})
+        return OTPCampaignModel.model_validate(doc) if doc else None
+
+    async def update(self, id: str, update_data: dict) -> bool:
+        modified_count = await self._db_ops.update_one(
+            {"_id": ObjectId(id)}, {"$set": update_data}
+        )
+        return modified_count > 0
@@ -1,20 +1,26 @@
 import datetime
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 from bson import ObjectId
+from app.core.otp_store import ActiveOTPStore
 from app.db.mongo_collections import DBCollections
 
-from app.models.otp import OTPModel
+from app.models.otp import OTPModel, OTPTypeEnum
 from app.utils.db_utils.mongo_utils import MongoCollectionOperations
 
 
 class OTPRepository:
     """
     Dépôt pour la gestion des données OTP dans MongoDB.
+
+    Les OTP actifs sont aussi gardés dans `ActiveOTPStore` (écriture en base puis dans
+    le store): les lectures par id, par e-mail + code et du dernier OTP d'un e-mail ne
+    vont en base qu'en cas d'absence du store.
     """
 
-    def __init__(self, db: AsyncIOMotorDatabase):
+    def __init__(self, db: AsyncIOMotorDatabase, store: ActiveOTPStore | None = None):
         self._db_ops = MongoCollectionOperations(db, DBCollections.OTPS)
+        self.store = store or ActiveOTPStore()
 
     async def list_otps(self) -> List[OTPModel]:
         """Liste de tous le codes OTP en base de données
@@ -27,7 +33,7 @@ class OTPRepository:
 
     async def create(self, otp: OTPModel) -> str:
         """Crée un nouveau document OTP dans la base de données.
-        Retourne l'ID de l'OTP inséré.
+        Retourne l'ID de l'OTP inséré (et le renseigne sur `otp`).
 
         Args:
             otp (OTPModel): _description_
@@ -35,9 +41,53 @@ class OTPRepository:
         Returns:
             str: _description_
         """
-        return await self._db_ops.insert_one(
+        otp_id = await self._db_ops.insert_one(
             otp.model_dump(by_alias=True, exclude=["id"])
         )
+        otp.id = str(otp_id)
+        self.store.put(otp)
+        return otp_id
+
+    async def create_many(self, otps: List[OTPModel]) -> List[str]:
+        """Crée plusieurs OTP en un seul `insert_many` et renseigne leurs IDs.
+
+        Args:
+            otps (List[OTPModel]): _description_
+
+        Returns:
+            List[str]: _description_
+        """
+        if not otps:
+            return []
+        otp_ids = await self._db_ops.insert_many(
+            [otp.model_dump(by_alias=True, exclude=["id"]) for otp in otps]
+        )
+        for otp, otp_id in zip(otps, otp_ids):
+            otp.id = str(otp_id)
+            self.store.put(otp)
+        return otp_ids
+
+    async def find_active_codes(self, emails: List[str]) -> Dict[str, Set[str]]:
+        """Codes des OTP non utilisés et non expirés de chaque e-mail (une requête).
+
+        Args:
+            emails (List[str]): _description_
+
+        Returns:
+            Dict[str, Set[str]]: _description_
+        """
+        docs = await self._db_ops.find_many(
+            {
+                "email": {"$in": emails},
+                "is_used": False,
+                "expires_at": {"$gt": datetime.datetime.now(datetime.timezone.utc)},
+            },
+            projection={"email": 1, "code": 1},
+        )
+        active_codes: Dict[str, Set[str]] = {}
+        for doc in docs:
+            active_codes.setdefault(doc["email"], set()).add(doc["code"])
+        return active_codes
 
     async def find_by_email_and_code(self, email: str, code: str) -> Optional[OTPModel]:
         """Trouve un OTP par e-mail et code.
@@ -49,6 +99,9 @@ class OTPRepository:
         Returns:
             Optional[OTPModel]: _description_
         """
+        otp = self.store.get_by_email_and_code(email, code)
+        if otp:
+            return otp
         doc = await self._db_ops.find_one(
             {"email": email, "code": code, "is_used": False}
         )
@@ -63,6 +116,9 @@ class OTPRepository:
         Returns:
             Optional[OTPModel]: _description_
         """
+        otp = self.store.get_by_id(id)
+        if otp:
+            return otp
         doc = await self._db_ops.find_one({"_id": ObjectId(id)})
         return OTPModel.model_validate(doc) if doc else None
 
@@ -75,6 +131,9 @@ class OTPRepository:
         Returns:
             Optional[OTPModel]: _description_
         """
+        otp = self.store.get_latest_by_email(email)
+        if otp:
+            return otp
         docs = await self._db_ops.find_many(
             query={"email": email, "is_used": False},
             sort={"created_at": -1},
@@ -108,9 +167,43 @@ class OTPRepository:
         docs = await self._db_ops.find_many({"code": code})
         return [OTPModel(**doc) for doc in docs]
 
+    async def consume(
+        self, email: str, code: str, otp_type: OTPTypeEnum
+    ) -> Optional[OTPModel]:
+        """Marque comme utilisé, en une seule opération atomique, l'OTP non utilisé et
+        non expiré correspondant à l'e-mail, au code et au type.
+
+        Retourne l'OTP (déjà marqué utilisé) ou None si aucun ne correspond: deux
+        vérifications concurrentes du même code ne peuvent pas réussir toutes les deux.
+
+        Args:
+            email (str): _description_
+            code (str): _description_
+            otp_type (OTPTypeEnum): _description_
+
+        Returns:
+            Optional[OTPModel]: _description_
+        """
+        doc = await self._db_ops.find_one_and_update(
+            {
+                "email": email,
+                "code": code,
+                "type": otp_type,
+                "is_used": False,
+                "expires_at": {"$gt": datetime.datetime.now(datetime.timezone.utc)},
+            },
+            {"$set": {"is_used": True}},
+        )
+        if not doc:
+            return None
+        otp = OTPModel.model_validate(doc)
+        self.store.discard(otp.id)
+        return otp
+
     async def mark_as_used(self, otp_id: str) -> int:
         """Marque un OTP comme utilisé par son ID.
-        Retourne le nombre de documents modifiés.
+        Retourne le nombre de documents modifiés (0 si l'OTP était déjà utilisé,
+        par exemple par un autre worker).
 
         Args:
             otp_id (str): _description_
@@ -118,8 +211,9 @@ class OTPRepository:
         Returns:
             int: _description_
         """
+        self.store.discard(otp_id)
         return await self._db_ops.update_one(
-            {"_id": ObjectId(otp_id)}, {"$set": {"is_used": True}}
+            {"_id": ObjectId(otp_id), "is_used": False}, {"$set": {"is_used": True}}
         )
 
     async def delete_expired_otps(self) -> int:
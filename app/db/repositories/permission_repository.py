@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Set
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -27,6 +27,16 @@ class PermissionRepository:
         docs = await self._db_ops.find_many({})
         return [PermissionModel(**doc) for doc in docs]
 
+    async def find_existing_codes(self, codes: List[str]) -> Set[str]:
+        """Codes parmi `codes` qui existent en base: une requête `$in` projetée sur
+        le seul champ `code`, sans construire de modèles."""
+        return {
+            doc["code"]
+            async for doc in self._db_ops.iter_many(
+                {"code": {"$in": codes}}, projection={"code": 1, "_id": 0}
+            )
+        }
+
     async def create(self, permission: PermissionModel) -> str:
         inserted_id = await self._db_ops.insert_one(
             permission.model_dump(by_alias=True, exclude=["id"])
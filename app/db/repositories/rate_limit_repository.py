@@ -0,0 +1,35 @@
+import datetime
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.mongo_collections import DBCollections
+from app.utils.db_utils.mongo_utils import MongoCollectionOperations
+
+
+class RateLimitRepository:
+    """Compteurs de limitation de débit partagés entre les workers (fenêtres fixes)."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db_ops = MongoCollectionOperations(db, DBCollections.RATE_LIMITS)
+
+    async def hit(self, key: str, period_seconds: float) -> tuple[int, float]:
+        """Incrémente le compteur de la fenêtre courante de `key` en un aller-retour.
+
+        Retourne le nombre d'appels dans la fenêtre et le nombre de secondes avant la
+        fin de celle-ci.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        window_start = now - now % period_seconds
+        window_end = window_start + period_seconds
+        doc = await self._db_ops.find_one_and_update(
+            {"_id": f"{key}:{int(window_start)}"},
+            {
+                "$inc": {"count": 1},
+                "$setOnInsert": {
+                    "expires_at": datetime.datetime.fromtimestamp(
+                        window_end, datetime.timezone.utc
+                    )
+                },
+            },
+            upsert=True,
+        )
+        return doc["count"], window_end - now
@@ -0,0 +1,42 @@
+import datetime
+from typing import List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.db.mongo_collections import DBCollections
+from app.models.access_token import RevokedTokenModel
+from app.utils.db_utils.mongo_utils import MongoCollectionOperations
+
+
+class RevokedTokenRepository:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self._db_ops = MongoCollectionOperations(db, DBCollections.REVOKED_TOKENS)
+
+    async def create_many(self, revoked_tokens: List[RevokedTokenModel]) -> List[str]:
+        if not revoked_tokens:
+            return []
+        return await self._db_ops.insert_many(
+            [
+                revoked_token.model_dump(by_alias=True, exclude=["id"])
+                for revoked_token in revoked_tokens
+            ]
+        )
+
+    async def list_revoked_since(
+        self, since: datetime.datetime | None = None
+    ) -> List[RevokedTokenModel]:
+        """Révocations enregistrées depuis `since` et pas encore expirées."""
+        query = {"expires_at": {"$gt": datetime.datetime.now(datetime.timezone.utc)}}
+        if since is not None:
+            query["revoked_at"] = {"$gte": since}
+        docs = await self._db_ops.find_many(query, sort={"revoked_at": 1})
+        return [RevokedTokenModel(**doc) for doc in docs]
+
+    async def delete_expired(self) -> int:
+        """Supprime les révocations de jetons déjà expirés (ils sont rejetés par `exp`)."""
+        return await self._db_ops.delete_many(
+            {"expires_at": {"$lt": datetime.datetime.now(datetime.timezone.utc)}}
+        )
+
+    async def delete_all(self) -> bool:
+        deleted_count = await self._db_ops.delete_many({})
+        return deleted_count > 0
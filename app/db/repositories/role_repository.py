@@ -1,4 +1,4 @@
-from typing import List
+from typing import AsyncIterator, List, Optional, Set
 from bson import ObjectId
 from fastapi import HTTPException
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -28,6 +28,23 @@ class RoleRepository:
         docs = await self._db_ops.find_many({})
         return [RoleModel(**doc) for doc in docs]
 
+    async def iter_roles(
+        self, batch_size: Optional[int] = None
+    ) -> AsyncIterator[RoleModel]:
+        """Parcourt les rôles au fil du curseur, sans construire la liste complète."""
+        async for doc in self._db_ops.iter_many({}, batch_size=batch_size):
+            yield RoleModel(**doc)
+
+    async def find_existing_names(self, names: List[str]) -> Set[str]:
+        """Noms parmi `names` qui existent en base: une requête `$in` projetée sur
+        le seul champ `name`, sans construire de modèles."""
+        return {
+            doc["name"]
+            async for doc in self._db_ops.iter_many(
+                {"name": {"$in": names}}, projection={"name": 1, "_id": 0}
+            )
+        }
+
     async def create(self, role: RoleModel) -> str:
         inserted_id = await self._db_ops.insert_one(
             role.model_dump(by_alias=True, exclude=["id"])
@@ -1,10 +1,17 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from typing import Optional, List
+from typing import Any, AsyncIterator, Optional, List, Tuple
 from bson import ObjectId
+from app.core.pagination import keyset_position, keyset_query, keyset_sort
 from app.db.mongo_collections import DBCollections
 from app.models.user import UserModel
 from app.utils.db_utils.mongo_utils import MongoCollectionOperations
 
+# Clés de tri acceptées par `list_users` (chacune couverte par un index)
+USER_SORT_KEYS = ("_id", "email", "created_at")
+
+# Taille des lots lus par `list_users(all=True)`
+_ALL_USERS_BATCH_SIZE = 1000
+
 
 class UserRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -23,6 +30,11 @@ class UserRepository:
             return UserModel(**doc)
         return None
 
+    async def find_id_by_email(self, email: str) -> Optional[str]:
+        """Identifiant de l'utilisateur ayant cet e-mail (seul `_id` est lu)."""
+        doc = await self._db_ops.find_one({"email": email}, projection={"_id": 1})
+        return str(doc["_id"]) if doc else None
+
     async def find_by_phone_number(self, phone_number: str) -> Optional[UserModel]:
         doc = await self._db_ops.find_one({"phone_number": phone_number})
         if doc:
@@ -30,20 +42,72 @@ class UserRepository:
         return None
 
     async def list_users(
-        self, skip: int = 0, limit: Optional[int] = 100, all: bool = False
+        self,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        all: bool = False,
+        sort: str = "_id",
+        after: Optional[Tuple[Any, Any]] = None,
     ) -> List[UserModel]:
-        query = {}
+        """Page d'utilisateurs dans l'ordre `sort` ("-clé" pour l'ordre décroissant).
+
+        Avec `after` = (valeur de tri, _id) du dernier utilisateur de la page
+        précédente, la page est lue par clé (index sur la clé de tri) au lieu de faire
+        parcourir puis ignorer `skip` documents à MongoDB. `skip` reste accepté pour
+        les anciens clients.
+        """
+        if all:
+            return await self._list_all_users(sort)
 
-        effective_skip = max(0, skip)
+        effective_skip = max(0, skip) if after is None else 0
         effective_limit = max(1, limit) if limit is not None else 100
 
-        if all:
-            docs = await self._db_ops.find_many(query=query, skip=0, limit=None)
-        else:
-            docs = await self._db_ops.find_many(
-                query=query, skip=effective_skip, limit=effective_limit
+        docs = await self._db_ops.find_many(
+            query=keyset_query(sort, after),
+            sort=keyset_sort(sort),
+            skip=effective_skip or None,
+            limit=effective_limit,
+        )
+        return [UserModel.model_validate(doc) for doc in docs]
+
+    async def _list_all_users(self, sort: str) -> List[UserModel]:
+        # Lots bornés lus par clé plutôt qu'un seul curseur sur toute la collection
+        users: List[UserModel] = []
+        after = None
+        while True:
+            batch = await self.list_users(
+                limit=_ALL_USERS_BATCH_SIZE, sort=sort, after=after
             )
+            users.extend(batch)
+            if len(batch) < _ALL_USERS_BATCH_SIZE:
+                return users
+            after = keyset_position(sort, batch[-1])
+
+    async def iter_users(
+        self,
+        projection: Optional[dict] = None,
+        sort: str = "_id",
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[dict]:
+        """Documents bruts des utilisateurs (projetés) dans l'ordre `sort`, lus au fil
+        du curseur par lots de `batch_size`: la collection n'est jamais chargée entière
+        en mémoire."""
+        async for doc in self._db_ops.iter_many(
+            projection=projection, sort=keyset_sort(sort), batch_size=batch_size
+        ):
+            yield doc
 
+    async def count(self, query: Optional[dict] = None) -> int:
+        return await self._db_ops.count(query or {})
+
+    async def find_batch(
+        self, query: dict, after_id: Optional[str] = None, limit: int = 500
+    ) -> List[UserModel]:
+        """Lot suivant d'utilisateurs correspondant à `query`, triés par `_id`, après
+        `after_id` (parcours par clé plutôt que par `skip`)."""
+        if after_id:
+            query = {**query, "_id": {"$gt": ObjectId(after_id)}}
+        docs = await self._db_ops.find_many(query=query, sort={"_id": 1}, limit=limit)
         return [UserModel.model_validate(doc) for doc in docs]
 
     async def create(self, user: UserModel) -> str:
@@ -51,12 +115,28 @@ class UserRepository:
         inserted_id = await self._db_ops.insert_one(user_dict)
         return str(inserted_id)
 
+    async def create_and_get(self, user: UserModel) -> UserModel:
+        """Insère l'utilisateur et le retourne avec son identifiant, sans relecture en base."""
+        inserted_id = await self.create(user)
+        return user.model_copy(update={"id": inserted_id})
+
     async def update(self, user_id: str, update_data: dict) -> bool:
         modified_count = await self._db_ops.update_one(
             {"_id": ObjectId(user_id)}, {"$set": update_data}
         )
         return modified_count > 0
 
+    async def update_and_get(
+        self, user_id: str, update_data: dict
+    ) -> Optional[UserModel]:
+        """Met à jour l'utilisateur et le retourne dans son nouvel état (un seul aller-retour)."""
+        doc = await self._db_ops.find_one_and_update(
+            {"_id": ObjectId(user_id)}, {"$set": update_data}
+        )
+        if doc:
+            return UserModel(**doc)
+        return None
+
     async def delete(self, user_id: str) -> bool:
         deleted_count = await self._db_ops.delete_one({"_id": ObjectId(user_id)})
         return deleted_count > 0
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
@@ -10,14 +13,67 @@ from app.controllers.auth import (
     role_controller,
     user_controller,
 )
+from app.controllers.monitoring import metrics_controller
 from app.core.config import Settings
-from app.providers.providers import get_settings
+from app.core.email_templates import EmailTemplateRegistry
+from app.core.expiry_sweeper import ExpirySweeper
+from app.core.mail_queue import MailQueueWorker
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import PasswordHashingPool
+from app.db.mongo_indexes import ensure_indexes, verify_indexes
+from app.db.repositories.mail_queue_repository import MailQueueRepository
+from app.providers.providers import get_mongo_client, get_settings, get_smtp_pool
+from app.services.email_service import EmailService
+from app.utils.image_utils import preload_countdown_images
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    EmailTemplateRegistry().preload()
+    if settings.otp_countdown_preload:
+        await asyncio.to_thread(
+            preload_countdown_images, settings.otp_expiry_minutes * 60
+        )
+    # Client unique partagé par toutes les requêtes, pool ouvert avant la première requête
+    mongo_client = get_mongo_client()
+    await mongo_client.warm_up(connections=settings.mongo_min_pool_size)
+    db = mongo_client.get_db()
+    if settings.mongo_ensure_indexes:
+        index_report = await ensure_indexes(db)
+        for error in index_report["errors"]:
+            print(f"Impossible de créer les index de {error}")
+        verification = await verify_indexes(db)
+        if verification["missing"]:
+            print(f"Index MongoDB manquants: {verification['missing']}")
+
+    app.state.expiry_sweeper = ExpirySweeper(
+        db, interval_seconds=settings.expiry_sweep_interval_seconds
+    )
+    app.state.expiry_sweeper.start()
+
+    app.state.mail_queue_worker = None
+    if settings.mail_queue_enabled:
+        email_service = EmailService(
+            settings=settings, mail_queue_repos=MailQueueRepository(db)
+        )
+        app.state.mail_queue_worker = MailQueueWorker(db, email_service, settings)
+        app.state.mail_queue_worker.start()
+    yield
+    if app.state.mail_queue_worker:
+        await app.state.mail_queue_worker.stop()
+    await app.state.expiry_sweeper.stop()
+    PasswordHashingPool().shutdown()
+    get_smtp_pool().close_all()
+    mongo_client.close()
+    get_mongo_client.cache_clear()
 
 
 # Application Fastapi
 app = FastAPI(
     title="SkillMap",
     description="Backend de SkillMap: application de de suivi et de gestion des compétences",
+    lifespan=lifespan,
 )
 
 # Origins autorisés
@@ -30,6 +86,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_headers="*",
     allow_methods="*",
+    expose_headers=[NEXT_CURSOR_HEADER, "Retry-After"],
 )
 
 # Ajout des controllers/routers
@@ -39,6 +96,7 @@ app.include_router(user_controller.router)
 app.include_router(otp_controller.router)
 app.include_router(role_controller.router)
 app.include_router(permission_controller.router)
+app.include_router(metrics_controller.router)
 
 
 # Endpoint racine
@@ -1,5 +1,5 @@
 import datetime
-from typing import Annotated
+from typing import Annotated, Optional
 
 from bson import ObjectId
 from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
@@ -11,6 +11,7 @@ PyObjectId = Annotated[str, BeforeValidator(str)]
 class AccessTokenModel(BaseModel):
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
     token: str = Field(...)
+    jti: Optional[str] = Field(default=None)
     user_id: PyObjectId
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.now)
     expires_at: datetime.datetime = Field(...)
@@ -26,6 +27,7 @@ class AccessTokenModel(BaseModel):
             "example": {
                 "id": "685f420bf748b6ad4f8317b5",
                 "token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
+                "jti": "2f1c6f0a9b6e4a53a3c1d2e4f5a6b7c8",
                 "user_id": "665e083d1322a68c63f3b8e5",
                 "created_at": "2025-06-28T00:00:00Z",
                 "expires_at": "2025-06-28T00:00:00Z",
@@ -33,3 +35,23 @@ class AccessTokenModel(BaseModel):
             }
         },
     )
+
+
+class RevokedTokenModel(BaseModel):
+    """Entrée de la liste de révocation utilisée en mode de vérification "stateless"."""
+
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    jti: str = Field(...)
+    user_id: PyObjectId
+    expires_at: datetime.datetime = Field(...)
+    revoked_at: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={ObjectId: str},
+        validate_by_name=True,
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+    )
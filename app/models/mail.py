@@ -0,0 +1,53 @@
+import datetime
+from enum import Enum
+from typing import Annotated, Optional
+
+from bson import ObjectId
+from pydantic import BaseModel, BeforeValidator, ConfigDict, EmailStr, Field
+
+
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
+
+def _utc_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class MailStatusEnum(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class MailMessageModel(BaseModel):
+    """
+    E-mail en attente d'envoi dans la file `mail_queue`, envoyé par `MailQueueWorker`.
+    """
+
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    recipient_email: EmailStr = Field(...)
+    subject: str = Field(...)
+    body: str = Field(...)
+    is_html: bool = Field(default=False)
+    status: MailStatusEnum = Field(default=MailStatusEnum.PENDING)
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None)
+    created_at: datetime.datetime = Field(default_factory=_utc_now)
+    next_attempt_at: datetime.datetime = Field(default_factory=_utc_now)
+    # Fin du "bail" d'un worker sur le message: passé ce délai, un message resté en
+    # "sending" (worker arrêté en cours d'envoi) peut être repris par un autre worker
+    locked_until: Optional[datetime.datetime] = Field(default=None)
+    # Jeton de la réservation en cours: identifie les messages réservés par un worker
+    lease_token: Optional[str] = Field(default=None)
+    sent_at: Optional[datetime.datetime] = Field(default=None)
+    # Date de suppression (index TTL) d'un message envoyé ou définitivement en échec
+    expires_at: Optional[datetime.datetime] = Field(default=None)
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_encoders={ObjectId: str},
+        validate_by_name=True,
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+    )
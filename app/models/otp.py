@@ -1,5 +1,6 @@
 import datetime
 from enum import Enum
+from typing import Optional
 from typing_extensions import Annotated
 from pydantic import BaseModel, BeforeValidator, ConfigDict, EmailStr, Field
 
@@ -36,6 +37,10 @@ class OTPModel(BaseModel):
         description="Le type du code OTP généré.",
         default=OTPTypeEnum.VERIFY_USER,
     )
+    campaign_id: Optional[str] = Field(
+        default=None,
+        description="L'envoi groupé qui a émis l'OTP (None pour une demande individuelle).",
+    )
 
     model_config = ConfigDict(
         populate_by_name=True,
@@ -49,6 +54,50 @@ class OTPModel(BaseModel):
             self.expires_at = self.expires_at.replace(tzinfo=datetime.timezone.utc)
         return datetime.datetime.now(datetime.timezone.utc) > self.expires_at
 
+    def seconds_remaining(self) -> int:
+        """Secondes restantes avant expiration (0 si l'OTP a expiré)."""
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=datetime.timezone.utc)
+        remaining = expires_at - datetime.datetime.now(datetime.timezone.utc)
+        return max(0, int(remaining.total_seconds()))
+
     def is_valid(self) -> bool:
         """Vérifie si l'OTP est valide (non expiré et non utilisé)."""
         return not self.is_expired() and not self.is_used
+
+
+class OTPCampaignStatusEnum(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class OTPCampaignModel(BaseModel):
+    """
+    Envoi groupé d'OTP à tous les utilisateurs correspondant à un filtre, avec son
+    avancement (collection `otp_campaigns`).
+    """
+
+    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    type: OTPTypeEnum = Field(default=OTPTypeEnum.VERIFY_USER)
+    query: dict = Field(
+        default_factory=dict, description="Requête MongoDB sur les utilisateurs."
+    )
+    status: OTPCampaignStatusEnum = Field(default=OTPCampaignStatusEnum.PENDING)
+    total: int = Field(default=0, description="Nombre d'utilisateurs ciblés.")
+    processed: int = Field(default=0, description="Nombre d'OTP émis et mis en file.")
+    error: Optional[str] = Field(default=None)
+    created_by: Optional[str] = Field(default=None)
+    created_at: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    started_at: Optional[datetime.datetime] = Field(default=None)
+    finished_at: Optional[datetime.datetime] = Field(default=None)
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_encoders={PyObjectId: str},
+        arbitrary_types_allowed=True,
+    )
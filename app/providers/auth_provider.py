@@ -2,16 +2,21 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 
+from app.core.cache import UserSnapshotCache
+from app.core.config import Settings
 from app.core.jwt import JWTUtils
+from app.core.token_revocation import TokenRevocationList
+from app.providers.providers import get_settings
 from app.providers.repository_provider import (
     get_access_token_repository,
+    get_revoked_token_repository,
     get_user_repository,
 )
 from app.providers.service_provider import get_permission_service, get_role_service
 from app.db.repositories.access_token_repository import AccessTokenRepository
+from app.db.repositories.revoked_token_repository import RevokedTokenRepository
 from app.db.repositories.user_repository import UserRepository
 from app.models.user import UserModel
-from app.schemas.user_schema import UserReadSchema
 from app.services.auth.permission_service import PermissionService
 from app.services.auth.role_service import RoleService
 
@@ -22,6 +27,8 @@ oauth_2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 async def verify_token(
     token: str = Depends(oauth_2_scheme),
     access_token_repos: AccessTokenRepository = Depends(get_access_token_repository),
+    revoked_token_repos: RevokedTokenRepository = Depends(get_revoked_token_repository),
+    settings: Settings = Depends(get_settings),
 ) -> str:
     try:
         payload = JWTUtils.decode_access_token(token=token)
@@ -30,6 +37,16 @@ async def verify_token(
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
+        jti = payload.get("jti")
+        if settings.token_verification_mode == "stateless" and jti:
+            # Signature et exp déjà vérifiées par decode: seule la révocation reste à contrôler
+            revocation_list = await TokenRevocationList().refresh_if_stale(
+                revoked_token_repos
+            )
+            if revocation_list.is_revoked(jti):
+                raise HTTPException(status_code=401, detail="Expired")
+            return user_id
+        # Mode "database" (ou jeton émis avant l'ajout du jti): le jeton doit exister en base
         access_token = await access_token_repos.find_by_token_and_user_id(
             user_id=user_id, token=token
         )
@@ -45,10 +62,14 @@ async def auth_middleware(
     user_repos: UserRepository = Depends(get_user_repository),
 ) -> UserModel:
     try:
-        # print(user_id)
+        user_cache = UserSnapshotCache()
+        user = user_cache.get(user_id)
+        if user:
+            return user
         user = await user_repos.find_by_id(user_id=user_id)
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
+        user_cache.set(user)
         return user
     except HTTPException as e:
         raise e
@@ -68,7 +89,7 @@ def require_permission(permission_code: str):
         ):
             try:
                 await ps.ensure_permission(
-                    user=UserReadSchema.model_validate(user),
+                    user=UserSnapshotCache().read_schema(user),
                     permission_code=permission_code,
                 )
             except HTTPException as e:
@@ -98,7 +119,7 @@ def require_role(role_name: str):
         ):
             try:
                 await rs.ensure_role(
-                    user=UserReadSchema.model_validate(user), role_name=role_name
+                    user=UserSnapshotCache().read_schema(user), role_name=role_name
                 )
             except HTTPException as e:
                 raise e
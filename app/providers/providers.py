@@ -1,8 +1,8 @@
 from functools import lru_cache
 from dotenv import load_dotenv
-from fastapi import Depends
 
 from app.core.config import Settings
+from app.core.smtp_pool import SMTPConnectionPool
 from app.db.mongo_client import MongoClient
 
 
@@ -12,7 +12,39 @@ def get_settings():
 
 
 @lru_cache()
-def get_db(settings: Settings = Depends(get_settings)):
+def get_mongo_client() -> MongoClient:
+    """Client MongoDB unique du processus (créé au démarrage, fermé à l'arrêt par le lifespan)."""
+    # database_uri/database_name lisent les variables DATABASE_URI_<ENV> via os.getenv
     load_dotenv()
-    mongo = MongoClient(settings.database_uri, settings.database_name)
-    return mongo.get_db()
+    settings = get_settings()
+    return MongoClient(
+        settings.database_uri,
+        settings.database_name,
+        maxPoolSize=settings.mongo_max_pool_size,
+        minPoolSize=settings.mongo_min_pool_size,
+        maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+        connectTimeoutMS=settings.mongo_connect_timeout_ms,
+        serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+    )
+
+
+def get_db():
+    return get_mongo_client().get_db()
+
+
+@lru_cache()
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Pool de connexions SMTP unique du processus (vidé à l'arrêt par le lifespan)."""
+    settings = get_settings()
+    return SMTPConnectionPool(
+        host=settings.smtp_host,
+        port=settings.smtp_port,
+        username=settings.smtp_username,
+        password=settings.smtp_password,
+        use_tls=settings.smtp_use_tls,
+        use_ssl=settings.smtp_use_ssl,
+        max_connections=settings.smtp_pool_max_connections,
+        max_messages_per_connection=settings.smtp_pool_max_messages_per_connection,
+        idle_timeout_seconds=settings.smtp_pool_idle_timeout_seconds,
+        noop_after_seconds=settings.smtp_pool_noop_after_seconds,
+    )
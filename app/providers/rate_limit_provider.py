@@ -0,0 +1,34 @@
+import json
+
+from fastapi import Depends, Request
+
+from app.core.rate_limiter import RateLimiter
+from app.db.repositories.rate_limit_repository import RateLimitRepository
+from app.providers.repository_provider import get_rate_limit_repository
+
+
+async def _request_email(request: Request) -> str | None:
+    # Corps JSON déjà lu par FastAPI: `request.json()` réutilise le cache de la requête
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    email = body.get("email") if isinstance(body, dict) else None
+    return email if isinstance(email, str) else None
+
+
+def rate_limit(rule: str):
+    """Dépendance qui applique la règle `rule` de `RateLimiter` par e-mail et par IP."""
+
+    async def dependency(
+        request: Request,
+        rate_limit_repos: RateLimitRepository = Depends(get_rate_limit_repository),
+    ):
+        await RateLimiter().check(
+            rule,
+            email=await _request_email(request),
+            ip=request.client.host if request.client else None,
+            rate_limit_repos=rate_limit_repos,
+        )
+
+    return Depends(dependency)
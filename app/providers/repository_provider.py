@@ -1,10 +1,14 @@
 from fastapi import Depends
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.db.repositories.otp_campaign_repository import OTPCampaignRepository
 from app.db.repositories.otp_repository import OTPRepository
 from app.providers.providers import get_db
 from app.db.repositories.access_token_repository import AccessTokenRepository
+from app.db.repositories.mail_queue_repository import MailQueueRepository
 from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.rate_limit_repository import RateLimitRepository
+from app.db.repositories.revoked_token_repository import RevokedTokenRepository
 from app.db.repositories.role_repository import RoleRepository
 from app.db.repositories.user_repository import UserRepository
 
@@ -25,5 +29,21 @@ def get_access_token_repository(db: AsyncIOMotorDatabase = Depends(get_db)):
     return AccessTokenRepository(db=db)
 
 
+def get_revoked_token_repository(db: AsyncIOMotorDatabase = Depends(get_db)):
+    return RevokedTokenRepository(db=db)
+
+
 def get_otp_repository(db: AsyncIOMotorDatabase = Depends(get_db)):
     return OTPRepository(db=db)
+
+
+def get_otp_campaign_repository(db: AsyncIOMotorDatabase = Depends(get_db)):
+    return OTPCampaignRepository(db=db)
+
+
+def get_mail_queue_repository(db: AsyncIOMotorDatabase = Depends(get_db)):
+    return MailQueueRepository(db=db)
+
+
+def get_rate_limit_repository(db: AsyncIOMotorDatabase = Depends(get_db)):
+    return RateLimitRepository(db=db)
@@ -1,15 +1,21 @@
 from fastapi import Depends
 from app.core.config import Settings
 from app.db.repositories.access_token_repository import AccessTokenRepository
+from app.db.repositories.mail_queue_repository import MailQueueRepository
+from app.db.repositories.otp_campaign_repository import OTPCampaignRepository
 from app.db.repositories.otp_repository import OTPRepository
 from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.revoked_token_repository import RevokedTokenRepository
 from app.db.repositories.role_repository import RoleRepository
 from app.db.repositories.user_repository import UserRepository
 from app.providers.providers import get_settings
 from app.providers.repository_provider import (
     get_access_token_repository,
+    get_mail_queue_repository,
+    get_otp_campaign_repository,
     get_otp_repository,
     get_permission_repository,
+    get_revoked_token_repository,
     get_role_repository,
     get_user_repository,
 )
@@ -24,16 +30,18 @@ from app.services.email_service import EmailService
 
 def get_email_service(
     settings: Settings = Depends(get_settings),
+    mail_queue_repos: MailQueueRepository = Depends(get_mail_queue_repository),
 ) -> EmailService:
     """Provides email service
 
     Args:
         settings (Settings, optional): _description_. Defaults to Depends(get_settings).
+        mail_queue_repos (MailQueueRepository, optional): _description_. Defaults to Depends(get_mail_queue_repository).
 
     Returns:
         EmailService: _description_
     """
-    return EmailService(settings=settings)
+    return EmailService(settings=settings, mail_queue_repos=mail_queue_repos)
 
 
 def get_google_auth_service(
@@ -52,6 +60,9 @@ def get_auth_service(
     user_repos: UserRepository = Depends(get_user_repository),
     access_token_repos: AccessTokenRepository = Depends(get_access_token_repository),
     otp_repos: OTPRepository = Depends(get_otp_repository),
+    revoked_token_repos: RevokedTokenRepository = Depends(get_revoked_token_repository),
+    role_repos: RoleRepository = Depends(get_role_repository),
+    permission_repos: PermissionRepository = Depends(get_permission_repository),
 ) -> AuthService:
     """Provides auth service
 
@@ -59,6 +70,9 @@ def get_auth_service(
         user_repos (UserRepository, optional): _description_. Defaults to Depends(get_user_repository).
         access_token_repos (AccessTokenRepository, optional): _description_. Defaults to Depends(get_access_token_repository).
         otp_repos (OTPRepository, optional): _description_. Defaults to Depends(get_otp_repository).
+        revoked_token_repos (RevokedTokenRepository, optional): _description_. Defaults to Depends(get_revoked_token_repository).
+        role_repos (RoleRepository, optional): _description_. Defaults to Depends(get_role_repository).
+        permission_repos (PermissionRepository, optional): _description_. Defaults to Depends(get_permission_repository).
 
     Returns:
         AuthService: _description_
@@ -67,6 +81,9 @@ def get_auth_service(
         user_repos=user_repos,
         access_token_repos=access_token_repos,
         otp_repos=otp_repos,
+        revoked_token_repos=revoked_token_repos,
+        role_repos=role_repos,
+        permission_repos=permission_repos,
     )
 
 
@@ -127,6 +144,7 @@ def get_otp_service(
     otp_repos: OTPRepository = Depends(get_otp_repository),
     email_service: EmailService = Depends(get_email_service),
     settings: Settings = Depends(get_settings),
+    campaign_repos: OTPCampaignRepository = Depends(get_otp_campaign_repository),
 ) -> UserService:
     """Provides OTP service
 
@@ -134,6 +152,7 @@ def get_otp_service(
         user_repos (UserRepository, optional): _description_. Defaults to Depends(get_user_repository).
         otp_repos (OTPRepository, optional): _description_. Defaults to Depends(get_otp_repository).
         settings (Settings, optional): _description_. Defaults to Depends(get_settings).
+        campaign_repos (OTPCampaignRepository, optional): _description_. Defaults to Depends(get_otp_campaign_repository).
 
     Returns:
         UserService: _description_
@@ -143,4 +162,5 @@ def get_otp_service(
         user_repos=user_repos,
         settings=settings,
         email_service=email_service,
+        campaign_repos=campaign_repos,
     )
@@ -1,8 +1,8 @@
 import datetime
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 
-from app.models.otp import OTPTypeEnum
+from app.models.otp import OTPCampaignStatusEnum, OTPTypeEnum
 from app.schemas.user_schema import UserReadSchema
 
 
@@ -117,3 +117,63 @@ class OTPVerifyResponseSchema(BaseModel):
     user: Optional[UserReadSchema] = Field(
         default=None, description="L'utilisateur vérifié."
     )
+
+
+class OTPCampaignRequestSchema(BaseModel):
+    """
+    Schéma de création d'un envoi groupé d'OTP: les critères renseignés sont combinés
+    (ET), un critère absent n'est pas filtré.
+    """
+
+    emails: Optional[List[EmailStr]] = Field(
+        default=None, description="Limiter l'envoi à ces adresses e-mail."
+    )
+    roles: Optional[List[str]] = Field(
+        default=None, description="Utilisateurs ayant au moins un de ces rôles."
+    )
+    is_verified: Optional[bool] = Field(default=None)
+    is_active: Optional[bool] = Field(default=None)
+    type: OTPTypeEnum = Field(
+        description="Le type des codes OTP générés.",
+        default=OTPTypeEnum.VERIFY_USER,
+    )
+    model_config = ConfigDict(
+        validate_by_name=True,
+        populate_by_name=True,
+        json_schema_extra={
+            "example": {
+                "roles": ["user"],
+                "is_verified": False,
+                "type": "verify_user",
+            }
+        },
+    )
+
+    def to_user_query(self) -> dict:
+        query = {}
+        if self.emails is not None:
+            query["email"] = {"$in": self.emails}
+        if self.roles is not None:
+            query["roles"] = {"$in": self.roles}
+        if self.is_verified is not None:
+            query["is_verified"] = self.is_verified
+        if self.is_active is not None:
+            query["is_active"] = self.is_active
+        return query
+
+
+class OTPCampaignResponseSchema(BaseModel):
+    """
+    Avancement d'un envoi groupé d'OTP.
+    """
+
+    campaign_id: str = Field(..., description="L'ID de l'envoi groupé.")
+    type: OTPTypeEnum
+    status: OTPCampaignStatusEnum
+    total: int = Field(..., description="Nombre d'utilisateurs ciblés.")
+    processed: int = Field(..., description="Nombre d'OTP émis et mis en file.")
+    progress: float = Field(..., description="Avancement en pourcentage.")
+    error: Optional[str] = Field(default=None)
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = Field(default=None)
+    finished_at: Optional[datetime.datetime] = Field(default=None)
@@ -133,3 +133,10 @@ class UserReadSchema(BaseModel):
             }
         },
     )
+
+
+class UserPageSchema(BaseModel):
+    """Page d'utilisateurs et curseur opaque de la page suivante (None en fin de liste)."""
+
+    items: List[UserReadSchema]
+    next_cursor: Optional[str] = None
@@ -1,14 +1,21 @@
 import asyncio
 import datetime
+import uuid
 
 from bson import ObjectId
 from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
+from app.core.cache import UserSnapshotCache
 from app.core.jwt import JWTUtils
 from app.core.security import SecurityUtils
+from app.core.token_revocation import TokenRevocationList
 from app.db.repositories.access_token_repository import AccessTokenRepository
 from app.db.repositories.otp_repository import OTPRepository
+from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.revoked_token_repository import RevokedTokenRepository
+from app.db.repositories.role_repository import RoleRepository
 from app.db.repositories.user_repository import UserRepository
-from app.models.access_token import AccessTokenModel
+from app.models.access_token import AccessTokenModel, RevokedTokenModel
 from app.models.otp import OTPModel, OTPTypeEnum
 from app.schemas.auth_schema import (
     ChangeUserPasswordSchema,
@@ -24,6 +31,8 @@ from app.schemas.otp_schema import (
     OTPVerifySchema,
 )
 from app.schemas.user_schema import UserReadSchema, UserUpdateSchema
+from app.services.auth.otp_service import otp_rejection
+from app.services.auth.reference_validator import ReferenceValidator
 
 
 class AuthService:
@@ -32,34 +41,53 @@ class AuthService:
         access_token_repos: AccessTokenRepository,
         user_repos: UserRepository,
         otp_repos: OTPRepository,
+        revoked_token_repos: RevokedTokenRepository,
+        role_repos: RoleRepository | None = None,
+        permission_repos: PermissionRepository | None = None,
+        user_cache: UserSnapshotCache | None = None,
     ):
         self.access_token_repos = access_token_repos
         self.user_repos = user_repos
         self.otp_repos = otp_repos
+        self.revoked_token_repos = revoked_token_repos
+        self.user_cache = user_cache or UserSnapshotCache()
+        # Vérification des rôles/permissions référencés par update_user
+        self.reference_validator = ReferenceValidator(role_repos, permission_repos)
         # Définir la dépendance de l'entête Authorization
 
-    async def generate_access_token(
+    def _build_access_token(
         self, user_id: str, expires_in_minutes: int | None = None
-    ) -> str:
+    ) -> AccessTokenModel:
         expire = None
         if expires_in_minutes:
             expire = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
                 minutes=expires_in_minutes
             )
+        jti = uuid.uuid4().hex
         payload = {
             "sub": user_id,
             "exp": expire if expire else None,
             "iat": datetime.datetime.now(datetime.timezone.utc),
+            "jti": jti,
         }
         token, expires_at = JWTUtils.create_access_token(
             data=payload, expires_delta=expire if expire else None
         )
         token_doc = AccessTokenModel(
             token=token,
+            jti=jti,
             user_id=ObjectId(user_id),
             expires_at=expires_at,
             revoked=False,
         )
+        return token_doc
+
+    async def generate_access_token(
+        self, user_id: str, expires_in_minutes: int | None = None
+    ) -> str:
+        token_doc = self._build_access_token(
+            user_id=user_id, expires_in_minutes=expires_in_minutes
+        )
         return await self.access_token_repos.create(access_token=token_doc)
 
     async def revoke_access_token(self, token: str) -> bool:
@@ -75,7 +103,25 @@ class AuthService:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Token already revoked"
             )
-        return await self.access_token_repos.revoke(id=token_doc.id)
+        revoked = await self.access_token_repos.revoke(id=token_doc.id)
+        await self._record_revocations([token_doc])
+        return revoked
+
+    async def _record_revocations(self, tokens: list[AccessTokenModel]) -> None:
+        """Enregistre les jetons révoqués pour la vérification stateless
+        (liste locale immédiatement, les autres workers à leur prochaine synchronisation).
+        """
+        revoked_tokens = [
+            RevokedTokenModel(
+                jti=token.jti, user_id=token.user_id, expires_at=token.expires_at
+            )
+            for token in tokens
+            if token.jti
+        ]
+        if not revoked_tokens:
+            return
+        await self.revoked_token_repos.create_many(revoked_tokens)
+        TokenRevocationList().add(revoked_tokens)
 
     async def generate_and_get_access_token(
         self, user_id: str, expires_in_minutes: int | None = None
@@ -83,22 +129,21 @@ class AuthService:
         """
         Génère un jeton d'accès pour l'utilisateur spécifié.
         """
-        token_id = await self.generate_access_token(
+        token_doc = self._build_access_token(
             user_id=user_id, expires_in_minutes=expires_in_minutes
         )
-        return await self.access_token_repos.find_by_id(id=token_id)
+        return await self.access_token_repos.create_and_get(access_token=token_doc)
 
     async def login(self, user: LoginRequestSchema) -> LoginResponseSchema:
         db_user = await self.user_repos.find_by_email(email=user.email)
         if not db_user:
             raise HTTPException(status_code=404, detail="Wrong credentials")
-        is_auth = SecurityUtils.verify_password(
+        is_auth = await SecurityUtils.verify_password_async(
             hashed=db_user.password, plain=user.password
         )
         if not is_auth:
             raise HTTPException(status_code=401, detail="Wrong credentials")
-        token_id = await self.generate_access_token(user_id=db_user.id)
-        access_token = await self.access_token_repos.find_by_id(id=token_id)
+        access_token = await self.generate_and_get_access_token(user_id=db_user.id)
         return_user = UserReadSchema.model_validate(db_user)
         return LoginResponseSchema(access_token=access_token, user=return_user)
 
@@ -108,21 +153,27 @@ class AuthService:
                 raise HTTPException(
                     status_code=400, detail="Password not match password confirmation"
                 )
+        if await self.user_repos.find_id_by_email(user.email):
+            raise HTTPException(status_code=400, detail="Email already registered")
         # Hash the password before saving
-        hashed_password = SecurityUtils.hash_password(user.password)
+        hashed_password = await SecurityUtils.hash_password_async(user.password)
         user_doc = UserModel.model_validate(user)
         user_doc.password = hashed_password
-        inserted_id = await self.user_repos.create(user_doc)
-        db_user = await self.user_repos.find_by_id(user_id=inserted_id)
-        token_id = await self.generate_access_token(user_id=db_user.id)
-        access_token = await self.access_token_repos.find_by_id(id=token_id)
+        try:
+            db_user = await self.user_repos.create_and_get(user_doc)
+        except DuplicateKeyError:
+            # Inscription concurrente avec le même e-mail (index unique email_unique)
+            raise HTTPException(status_code=400, detail="Email already registered")
+        access_token = await self.generate_and_get_access_token(user_id=db_user.id)
         return_user = UserReadSchema.model_validate(db_user)
         return LoginResponseSchema(access_token=access_token, user=return_user)
 
     async def logout(self, user_id: str) -> LoginResponseSchema:
+        tokens = await self.access_token_repos.find_by_user_id(user_id=user_id)
         result = await self.access_token_repos.delete_by_user_id(user_id=user_id)
         if not result:
             raise HTTPException(status_code=404, detail="User not found")
+        await self._record_revocations(tokens)
         return result
 
     async def verify_otp(
@@ -133,34 +184,26 @@ class AuthService:
         """
         Vérifie un OTP fourni par l'utilisateur.
         """
-        # Vérifier si l'utilisateur existe
-        user = await self.user_repos.find_by_email(email=otp_verify.email)
+        # Recherche de l'utilisateur et consommation atomique de l'OTP en parallèle
+        user, otp_record = await asyncio.gather(
+            self.user_repos.find_by_email(email=otp_verify.email),
+            self.otp_repos.consume(
+                email=otp_verify.email, code=otp_verify.code, otp_type=otp_type
+            ),
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User with this email not found.",
             )
-
-        otp_record = await self.otp_repos.find_by_email_and_code(
-            email=otp_verify.email, code=otp_verify.code
-        )
-
-        if (not otp_record) or (otp_record.type != otp_type):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid OTP or OTP already used/expired.",
-            )
-
-        if otp_record.is_used:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="OTP has already been used.",
-            )
+        if not otp_record:
+            raise await otp_rejection(self.otp_repos, otp_verify, otp_type)
 
         # Mettre à jour l'utilisateur pour le marquer comme vérifié
         success = await self.user_repos.update(
             user.id, {"is_verified": True, "is_active": True}
         )
+        self.user_cache.invalidate(user.id)
         if success:
             user.is_active = True
             user.is_verified = True
@@ -188,6 +231,17 @@ class AuthService:
         """
         Vérifie un OTP fourni par l'utilisateur et mets à jour son mot de passe.
         """
+        change_password = bool(
+            user_request.new_password and user_request.new_password_confirmation
+        )
+        # Vérifié avant de consommer l'OTP pour qu'une erreur de saisie ne le brûle pas
+        if change_password and (
+            user_request.new_password_confirmation != user_request.new_password
+        ):
+            raise HTTPException(
+                status_code=400, detail="Password not match password confirmation"
+            )
+
         otp_verify = OTPVerifySchema(code=user_request.code, email=user_request.email)
         verify_reponse, otp_record = await self.verify_otp(
             otp_verify=otp_verify, otp_type=OTPTypeEnum.RESET_PASSWORD
@@ -203,30 +257,26 @@ class AuthService:
                 detail="OTP has already been used.",
             )
 
-        if user_request.new_password and user_request.new_password_confirmation:
-            if user_request.new_password_confirmation != user_request.new_password:
-                raise HTTPException(
-                    status_code=400, detail="Password not match password confirmation"
-                )
+        return_user = verify_reponse.user
+        if change_password:
             update_data = {}
-            update_data["password"] = SecurityUtils.hash_password(
+            update_data["password"] = await SecurityUtils.hash_password_async(
                 user_request.new_password
             )
-            success = await self.user_repos.update(verify_reponse.user.id, update_data)
-            if not success:
+            updated = await self.user_repos.update_and_get(
+                verify_reponse.user.id, update_data
+            )
+            if not updated:
                 raise HTTPException(status_code=500, detail="Update failed")
-
-        # Marquer l'OTP comme utilisé après vérification réussie et mis à jours
-        await self.otp_repos.mark_as_used(str(otp_record.id))
-        otp_record.is_used = True
+            self.user_cache.invalidate(verify_reponse.user.id)
+            return_user = UserReadSchema.model_validate(updated)
 
         if logout:
             await self.logout(user_id=verify_reponse.user.id)
 
-        updated = await self.user_repos.find_by_id(verify_reponse.user.id)
-        token_id = await self.generate_access_token(user_id=verify_reponse.user.id)
-        access_token = await self.access_token_repos.find_by_id(id=token_id)
-        return_user = UserReadSchema.model_validate(updated)
+        access_token = await self.generate_and_get_access_token(
+            user_id=verify_reponse.user.id
+        )
         return LoginResponseSchema(access_token=access_token, user=return_user)
 
     async def update_user(
@@ -241,41 +291,25 @@ class AuthService:
 
         update_data = user_update.model_dump(exclude_unset=True)
         if "email" in update_data:
-            existing = await self.user_repos.find_by_email(update_data["email"])
-            if existing and str(existing.id) != user_id:
+            existing_id = await self.user_repos.find_id_by_email(update_data["email"])
+            if existing_id and existing_id != str(user_id):
                 raise HTTPException(status_code=400, detail="Email already registered")
 
-        if user_update.roles:
-            db_role_names = {r.name for r in await self.role_repos.list_roles()}
-            for role_name in user_update.roles:
-                if role_name not in db_role_names:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Role '{role_name}' not found. Please create it first.",
-                    )
-        if user_update.permissions:
-            db_permission_codes = {
-                p.code for p in await self.permission_repos.list_permissions()
-            }
-            for permission_code in user_update.permissions:
-                if permission_code not in db_permission_codes:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Permission '{permission_code}' not found. Please create it first.",
-                    )
+        await self.reference_validator.ensure_references_exist(
+            roles=user_update.roles, permissions=user_update.permissions
+        )
 
         if "password" in update_data:
-            update_data["password"] = SecurityUtils.hash_password(
+            update_data["password"] = await SecurityUtils.hash_password_async(
                 update_data.pop("password")
             )
             if logout:
                 await self.logout(user_id=user_id)
 
-        success = await self.user_repos.update(user_id, update_data)
-        if not success:
+        updated = await self.user_repos.update_and_get(user_id, update_data)
+        if not updated:
             raise HTTPException(status_code=500, detail="Update failed")
-
-        updated = await self.user_repos.find_by_id(user_id)
+        self.user_cache.invalidate(user_id)
         return UserReadSchema.model_validate(updated)
 
     async def change_password(
@@ -290,7 +324,7 @@ class AuthService:
 
         update_data = user_update.model_dump(exclude_unset=True)
 
-        is_auth = SecurityUtils.verify_password(
+        is_auth = await SecurityUtils.verify_password_async(
             hashed=user.password, plain=user_update.old_password
         )
         if not is_auth:
@@ -302,20 +336,19 @@ class AuthService:
                     status_code=400, detail="Password not match password confirmation"
                 )
 
-        update_data["password"] = SecurityUtils.hash_password(
+        update_data["password"] = await SecurityUtils.hash_password_async(
             update_data.pop("new_password")
         )
 
-        success = await self.user_repos.update(user_id, update_data)
-        if not success:
+        updated = await self.user_repos.update_and_get(user_id, update_data)
+        if not updated:
             raise HTTPException(status_code=500, detail="Update failed")
+        self.user_cache.invalidate(user_id)
 
         if logout:
             await self.logout(user_id=user_id)
 
-        updated = await self.user_repos.find_by_id(user_id)
-        token_id = await self.generate_access_token(user_id=user_id)
-        access_token = await self.access_token_repos.find_by_id(id=token_id)
+        access_token = await self.generate_and_get_access_token(user_id=user_id)
         return_user = UserReadSchema.model_validate(updated)
         return LoginResponseSchema(access_token=access_token, user=return_user)
 
@@ -324,9 +357,3 @@ class AuthService:
         Génère un mot de passe aléatoire.
         """
         return SecurityUtils.generate_random_password(length=length)
-
-    """async def clean_expired_tokens(self):
-        await self.access_token_repos.delete_expired_tokens()"""
-
-    """async def clean_expired_tokens():
-        await mongo_db["access_tokens"].delete_many({"expires_at": {"$lt": datetime.utcnow()}})"""
@@ -1,12 +1,24 @@
-import os
-import random
+import asyncio
 import datetime
+from typing import Collection
 from fastapi import HTTPException, status
+from app.core.cache import UserSnapshotCache
 from app.core.config import Settings
+from app.core.email_templates import EmailTemplateRegistry
+from app.core.random_codes import generate_numeric_code, generate_numeric_codes
+from app.db.repositories.otp_campaign_repository import OTPCampaignRepository
 from app.db.repositories.otp_repository import OTPRepository
 from app.db.repositories.user_repository import UserRepository
-from app.models.otp import OTPModel, OTPTypeEnum
+from app.models.mail import MailMessageModel
+from app.models.otp import (
+    OTPCampaignModel,
+    OTPCampaignStatusEnum,
+    OTPModel,
+    OTPTypeEnum,
+)
 from app.schemas.otp_schema import (
+    OTPCampaignRequestSchema,
+    OTPCampaignResponseSchema,
     OTPRequestSchema,
     OTPVerifyResponseSchema,
     OTPVerifySchema,
@@ -16,6 +28,33 @@ from app.schemas.user_schema import UserReadSchema
 from app.services.email_service import EmailService
 
 
+OTP_EMAIL_TEMPLATE = "otp_verification.html"
+OTP_EMAIL_SUBJECT = "Votre Code de Vérification OTP pour SkillMap"
+
+
+async def otp_rejection(
+    otp_repos: OTPRepository, otp_verify: OTPVerifySchema, otp_type: OTPTypeEnum
+) -> HTTPException:
+    """Erreur à renvoyer pour un OTP qui n'a pas pu être consommé."""
+    otp_record = await otp_repos.find_by_email_and_code(
+        email=otp_verify.email, code=otp_verify.code
+    )
+    if (not otp_record) or (otp_record.type != otp_type):
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid OTP or OTP already used/expired.",
+        )
+    if otp_record.is_expired():
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="OTP has expired."
+        )
+    # Consommé entre-temps par une autre requête ou un autre worker
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="OTP has already been used.",
+    )
+
+
 class OTPService:
     def __init__(
         self,
@@ -23,14 +62,18 @@ class OTPService:
         user_repos: UserRepository,
         email_service: EmailService,
         settings: Settings,
+        user_cache: UserSnapshotCache | None = None,
+        campaign_repos: OTPCampaignRepository | None = None,
     ):
         self.otp_repos = otp_repos
         self.user_repos = user_repos
         self.email_service = email_service
+        self.campaign_repos = campaign_repos
+        self.user_cache = user_cache or UserSnapshotCache()
         self.settings = settings
         self.otp_expiry_minutes = self.settings.otp_expiry_minutes
         self.otp_length = self.settings.otp_length
-        self.templates_dir = self.settings.templates_dir
+        self.campaign_chunk_size = max(1, self.settings.otp_campaign_chunk_size)
 
     def _load_email_template(self, template_name: str, context: dict) -> str:
         """Charge un modèle d'e-mail HTML et y injecte des variables.
@@ -45,20 +88,38 @@ class OTPService:
         Returns:
             str: _description_
         """
-        template_path = os.path.join(self.templates_dir, "emails", template_name)
-        if not os.path.exists(template_path):
-            raise FileNotFoundError(f"Email template not found: {template_path}")
+        # Template compilé une seule fois puis mis en cache par le registre
+        return EmailTemplateRegistry().render(template_name, context)
+
+    def _generate_otp_code(self, active_codes: Collection[str] = ()) -> str:
+        # Différent des OTP encore actifs du même e-mail
+        return generate_numeric_code(self.otp_length, exclude=active_codes)
 
-        with open(template_path, "r", encoding="utf-8") as f:
-            template_content = f.read()
+    def _expires_at(self) -> datetime.datetime:
+        return datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
+            minutes=self.otp_expiry_minutes
+        )
 
-        # Simple remplacement de variables pour cet exemple.
-        # Pour des templates plus complexes, Jinja2 ou d'autres moteurs seraient mieux.
-        rendered_html = template_content
-        for key, value in context.items():
-            rendered_html = rendered_html.replace(f"{{{{ {key} }}}}", str(value))
+    def _otp_email_context(self, user_first_name: str, otp: OTPModel) -> dict:
+        """Contexte du template HTML de l'e-mail OTP."""
+        # Formater le temps d'expiration de manière conviviale
+        expiry_time_str = f"{self.otp_expiry_minutes} minutes"
+        if self.otp_expiry_minutes == 1:
+            expiry_time_str = "1 minute"
+        elif self.otp_expiry_minutes < 1:
+            expiry_seconds = int(self.otp_expiry_minutes * 60)
+            expiry_time_str = f"{expiry_seconds} secondes"
 
-        return rendered_html
+        return {
+            "user_first_name": user_first_name,
+            "otp_code": otp.code,
+            "expiry_time_str": expiry_time_str,
+            "current_year": datetime.datetime.now().year,
+            "countdown_image_url": (
+                f"{self.settings.base_url}/otp/countdown-image/{otp.id}"
+                f"?format={self.settings.otp_countdown_format}"
+            ),
+        }
 
     async def request_otp(self, otp_request: OTPRequestSchema) -> OTPResponseSchema:
         """Génère et "envoie" un OTP à l'adresse e-mail spécifiée.
@@ -73,7 +134,10 @@ class OTPService:
         Returns:
             OTPResponseSchema: _description_
         """
-        user = await self.user_repos.find_by_email(email=otp_request.email)
+        user, active_codes = await asyncio.gather(
+            self.user_repos.find_by_email(email=otp_request.email),
+            self.otp_repos.find_active_codes([otp_request.email]),
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -81,10 +145,8 @@ class OTPService:
             )
 
         # Générer un code OTP aléatoire
-        otp_code = "".join([str(random.randint(0, 9)) for _ in range(self.otp_length)])
-        expires_at = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
-            minutes=self.otp_expiry_minutes
-        )
+        otp_code = self._generate_otp_code(active_codes.get(otp_request.email, ()))
+        expires_at = self._expires_at()
 
         # Créer le modèle OTP
         otp_model = OTPModel(
@@ -94,39 +156,17 @@ class OTPService:
             type=otp_request.type,
         )
 
-        # Enregistrer l'OTP en base de données
+        # Enregistrer l'OTP en base de données (l'id est renseigné sur le modèle)
         otp_id = await self.otp_repos.create(otp_model)
-        db_otp = await self.otp_repos.find_by_email_and_code(
-            email=otp_request.email, code=otp_code
-        )
-
-        mail_subject = "Votre Code de Vérification OTP pour SkillMap"
-
-        # Formater le temps d'expiration de manière conviviale
-        expiry_time_str = f"{self.otp_expiry_minutes} minutes"
-        if self.otp_expiry_minutes == 1:
-            expiry_time_str = "1 minute"
-        elif self.otp_expiry_minutes < 1:
-            expiry_seconds = int(self.otp_expiry_minutes * 60)
-            expiry_time_str = f"{expiry_seconds} secondes"
-
-        base_url = self.settings.base_url
-        countdown_image_url = f"{base_url}/otp/countdown-image/{otp_id}"
 
-        # Contexte pour le template HTML
-        template_context = {
-            "user_first_name": user.first_name,
-            "otp_code": otp_code,
-            "expiry_time_str": expiry_time_str,
-            "current_year": datetime.datetime.now().year,
-            "countdown_image_url": countdown_image_url,
-        }
-
-        html_body = self._load_email_template("otp_verification.html", template_context)
+        html_body = self._load_email_template(
+            OTP_EMAIL_TEMPLATE, self._otp_email_context(user.first_name, otp_model)
+        )
 
-        await self.email_service.send_email(
+        # Mis en file: la réponse n'attend pas le serveur SMTP
+        await self.email_service.enqueue_email(
             recipient_email=otp_request.email,
-            subject=mail_subject,
+            subject=OTP_EMAIL_SUBJECT,
             body=html_body,
             is_html=True,
         )
@@ -136,8 +176,8 @@ class OTPService:
 
         return OTPResponseSchema(
             detail=f"OTP sent successfully to {otp_request.email}. It will expire in {self.otp_expiry_minutes} minutes.",
-            **db_otp.model_dump(by_alias=True, exclude_none=True),
-            otp_id=str(db_otp.id),
+            **otp_model.model_dump(by_alias=True, exclude_none=True),
+            otp_id=str(otp_id),
         )
 
     async def verify_otp(
@@ -161,52 +201,32 @@ class OTPService:
         Returns:
             OTPVerifyResponseSchema: _description_
         """
-        # Vérifier si l'utilisateur existe
-        user = await self.user_repos.find_by_email(email=otp_verify.email)
+        # Recherche de l'utilisateur et consommation atomique de l'OTP en parallèle
+        user, otp_record = await asyncio.gather(
+            self.user_repos.find_by_email(email=otp_verify.email),
+            self.otp_repos.consume(
+                email=otp_verify.email, code=otp_verify.code, otp_type=otp_type
+            ),
+        )
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User with this email not found.",
             )
-
-        otp_record = await self.otp_repos.find_by_email_and_code(
-            email=otp_verify.email, code=otp_verify.code
-        )
-
-        if (not otp_record) or (otp_record.type != otp_type):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid OTP or OTP already used/expired.",
-            )
-
-        if otp_record.is_expired():
-            # Marquer comme utilisé/expiré si ce n'est pas déjà fait
-            await self.otp_repos.mark_as_used(str(otp_record.id))
-            otp_record.is_used = True
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="OTP has expired."
-            )
-
-        if otp_record.is_used:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="OTP has already been used.",
-            )
-
-        # Marquer l'OTP comme utilisé après vérification réussie
-        await self.otp_repos.mark_as_used(str(otp_record.id))
-        otp_record.is_used = True
+        if not otp_record:
+            raise await otp_rejection(self.otp_repos, otp_verify, otp_type)
 
         # Mettre à jour l'utilisateur pour le marquer comme vérifié
         success = await self.user_repos.update(
             user.id, {"is_verified": True, "is_active": True}
         )
+        self.user_cache.invalidate(user.id)
         if success:
             user.is_active = True
             user.is_verified = True
-        else:
-            if otp_type == OTPTypeEnum.VERIFY_USER:
-                raise HTTPException(status_code=409, detail="User already verified")
+        elif otp_type == OTPTypeEnum.VERIFY_USER and not otp_record.campaign_id:
+            # Un code d'envoi groupé reste valable pour un utilisateur déjà vérifié
+            raise HTTPException(status_code=409, detail="User already verified")
 
         return OTPVerifyResponseSchema(
             detail="OTP verified successfully.",
@@ -216,3 +236,138 @@ class OTPService:
             ),
             user=UserReadSchema.model_validate(user) if user else None,
         )
+
+    @staticmethod
+    def _campaign_response(campaign: OTPCampaignModel) -> OTPCampaignResponseSchema:
+        return OTPCampaignResponseSchema(
+            campaign_id=str(campaign.id),
+            progress=(
+                round(campaign.processed / campaign.total * 100, 2)
+                if campaign.total
+                else 100.0
+            ),
+            **campaign.model_dump(exclude={"id", "query", "created_by"}),
+        )
+
+    async def create_campaign(
+        self, campaign_request: OTPCampaignRequestSchema, created_by: str | None = None
+    ) -> OTPCampaignResponseSchema:
+        """Enregistre un envoi groupé d'OTP (exécuté ensuite par `run_campaign`).
+
+        Args:
+            campaign_request (OTPCampaignRequestSchema): _description_
+            created_by (str | None, optional): _description_. Defaults to None.
+
+        Returns:
+            OTPCampaignResponseSchema: _description_
+        """
+        query = campaign_request.to_user_query()
+        if not query:
+            # Un filtre vide ciblerait tous les comptes
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Campaign filter must not be empty.",
+            )
+        campaign = await self.campaign_repos.create_and_get(
+            OTPCampaignModel(
+                type=campaign_request.type,
+                query=query,
+                total=await self.user_repos.count(query),
+                created_by=created_by,
+            )
+        )
+        return self._campaign_response(campaign)
+
+    async def get_campaign(self, campaign_id: str) -> OTPCampaignResponseSchema:
+        campaign = await self.campaign_repos.find_by_id(campaign_id)
+        if not campaign:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found."
+            )
+        return self._campaign_response(campaign)
+
+    async def run_campaign(self, campaign_id: str) -> None:
+        """Émet un OTP pour chaque utilisateur ciblé, par lots de `otp_campaign_chunk_size`:
+        un `insert_many` des OTP, le rendu des e-mails avec le template compilé une fois,
+        puis une seule insertion dans la file d'envoi. L'avancement est enregistré après
+        chaque lot.
+
+        Args:
+            campaign_id (str): _description_
+        """
+        campaign = await self.campaign_repos.find_by_id(campaign_id)
+        if not campaign or campaign.status != OTPCampaignStatusEnum.PENDING:
+            return
+        await self.campaign_repos.update(
+            campaign_id,
+            {
+                "status": OTPCampaignStatusEnum.RUNNING.value,
+                "started_at": datetime.datetime.now(datetime.timezone.utc),
+            },
+        )
+        template = EmailTemplateRegistry().get(OTP_EMAIL_TEMPLATE)
+        processed = 0
+        after_id = None
+        try:
+            while True:
+                users = await self.user_repos.find_batch(
+                    campaign.query, after_id=after_id, limit=self.campaign_chunk_size
+                )
+                if not users:
+                    break
+                expires_at = self._expires_at()
+                active_codes = await self.otp_repos.find_active_codes(
+                    [user.email for user in users]
+                )
+                otps = [
+                    OTPModel(
+                        email=user.email,
+                        code=(
+                            code
+                            if code not in active_codes.get(user.email, ())
+                            else self._generate_otp_code(active_codes[user.email])
+                        ),
+                        expires_at=expires_at,
+                        type=campaign.type,
+                        campaign_id=str(campaign.id),
+                    )
+                    for user, code in zip(
+                        users, generate_numeric_codes(len(users), self.otp_length)
+                    )
+                ]
+                await self.otp_repos.create_many(otps)
+                await self.email_service.enqueue_emails(
+                    [
+                        MailMessageModel(
+                            recipient_email=otp.email,
+                            subject=OTP_EMAIL_SUBJECT,
+                            body=template.render(
+                                self._otp_email_context(user.first_name, otp)
+                            ),
+                            is_html=True,
+                        )
+                        for user, otp in zip(users, otps)
+                    ]
+                )
+                processed += len(users)
+                after_id = users[-1].id
+                await self.campaign_repos.update(campaign_id, {"processed": processed})
+        except Exception as e:
+            await self.campaign_repos.update(
+                campaign_id,
+                {
+                    "status": OTPCampaignStatusEnum.FAILED.value,
+                    "error": str(e),
+                    "finished_at": datetime.datetime.now(datetime.timezone.utc),
+                },
+            )
+            return
+        await self.campaign_repos.update(
+            campaign_id,
+            {
+                "status": OTPCampaignStatusEnum.COMPLETED.value,
+                # Des utilisateurs ont pu être ajoutés ou modifiés depuis le comptage
+                "total": processed,
+                "finished_at": datetime.datetime.now(datetime.timezone.utc),
+            },
+        )
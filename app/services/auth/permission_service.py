@@ -1,5 +1,7 @@
 from typing import List
 from fastapi import HTTPException
+from app.core.cache import AuthorizationCache
+from app.core.role_graph import RoleGraphIndex
 from app.db.repositories.permission_repository import PermissionRepository
 from app.db.repositories.role_repository import RoleRepository
 from app.schemas.role_schema import (
@@ -12,33 +14,43 @@ from app.schemas.user_schema import UserReadSchema
 
 class PermissionService:
     def __init__(
-        self, role_repos: RoleRepository, permission_repos: PermissionRepository
+        self,
+        role_repos: RoleRepository,
+        permission_repos: PermissionRepository,
+        authorization_cache: AuthorizationCache | None = None,
+        role_index: RoleGraphIndex | None = None,
     ):
         self.role_repos = role_repos
         self.permission_repos = permission_repos
+        self.authorization_cache = authorization_cache or AuthorizationCache()
+        self.role_index = role_index or RoleGraphIndex()
 
     async def get_all_permissions(self, user: UserReadSchema) -> set[str]:
         # 1. Permissions directes
         perms = set(user.permissions)
 
-        # 2. Permissions des rôles + hérités
-        seen = set()
-        to_visit = list(user.roles)
+        # 2. Permissions des rôles + hérités (résolution mise en cache par ensemble de rôles)
+        role_perms = self.authorization_cache.get_role_permissions(user.roles)
+        if role_perms is None:
+            role_perms = await self._resolve_roles_permissions(user.roles)
+            self.authorization_cache.set_role_permissions(user.roles, role_perms)
 
-        while to_visit:
-            role_name = to_visit.pop()
-            if role_name in seen:
-                continue
-            seen.add(role_name)
-
-            role = await self.role_repos.find_by_name(role_name)
-            if not role:
-                continue
+        perms.update(role_perms)
+        return perms
 
-            perms.update(role.permissions)
-            to_visit.extend(role.inherited_roles)
+    async def _resolve_roles_permissions(self, roles: List[str]) -> set[str]:
+        role_index = await self.role_index.ensure_loaded(self.role_repos)
+        return role_index.permissions_closure(roles)
 
-        return perms
+    async def permission_exists(self, permission_code: str) -> bool:
+        exists = self.authorization_cache.get_permission_exists(permission_code)
+        if exists is None:
+            db_permission = await self.permission_repos.find_by_code(
+                code=permission_code
+            )
+            exists = db_permission is not None
+            self.authorization_cache.set_permission_exists(permission_code, exists)
+        return exists
 
     async def has_permission(self, user: UserReadSchema, permission_code: str) -> bool:
         all_permissions = await self.get_all_permissions(user)
@@ -47,8 +59,7 @@ class PermissionService:
     async def ensure_permission(
         self, user: UserReadSchema, permission_code: str
     ) -> bool:
-        db_permission = await self.permission_repos.find_by_code(code=permission_code)
-        if not db_permission:
+        if not await self.permission_exists(permission_code):
             raise HTTPException(status_code=500, detail="Unkown permission")
         if not await self.has_permission(user, permission_code):
             raise HTTPException(status_code=403, detail="Permission denied")
@@ -112,6 +123,7 @@ class PermissionService:
                     status_code=400, detail="Permission already created"
                 )
             inserted_id = await self.permission_repos.create(permission=permission)
+            self.authorization_cache.invalidate()
             created = await self.permission_repos.find_by_id(id=inserted_id)
             return PermissionReadSchema.model_validate(created)
         except HTTPException as e:
@@ -141,6 +153,7 @@ class PermissionService:
             success = await self.permission_repos.update(
                 id=permission_id, update_data=update_data
             )
+            self.authorization_cache.invalidate()
             if not success:
                 raise HTTPException(status_code=500, detail="Update failed")
 
@@ -160,6 +173,7 @@ class PermissionService:
             if not permission:
                 raise HTTPException(status_code=404, detail="Permission not found")
             success = await self.permission_repos.delete_one(id=permission_id)
+            self.authorization_cache.invalidate()
             if not success:
                 raise HTTPException(status_code=500, detail="Delete failed")
         except HTTPException as e:
@@ -173,6 +187,7 @@ class PermissionService:
     async def delete_all_permissions(self) -> None:
         try:
             success = await self.permission_repos.delete_all()
+            self.authorization_cache.invalidate()
             if not success:
                 raise HTTPException(status_code=500, detail="Delete failed")
         except HTTPException as e:
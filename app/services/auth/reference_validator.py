@@ -0,0 +1,72 @@
+import asyncio
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.role_graph import RoleGraphIndex
+from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.role_repository import RoleRepository
+
+
+def _unique(values: Optional[Iterable[str]]) -> List[str]:
+    return list(dict.fromkeys(values or ()))
+
+
+class ReferenceValidator:
+    """Vérifie que les rôles et permissions référencés par une requête existent.
+
+    Seuls les noms/codes demandés sont vérifiés, par une requête `$in` projetée sur
+    le seul champ utile: le coût dépend de la taille de la requête et non du nombre de
+    rôles ou de permissions en base. Pour les rôles, l'index en mémoire
+    (`RoleGraphIndex`) répond s'il est chargé; les noms qu'il ne connaît pas (rôle
+    créé par un autre worker depuis le dernier rechargement) sont confirmés en base.
+    """
+
+    def __init__(
+        self,
+        role_repos: RoleRepository,
+        permission_repos: PermissionRepository,
+        role_index: RoleGraphIndex | None = None,
+    ):
+        self.role_repos = role_repos
+        self.permission_repos = permission_repos
+        self.role_index = role_index or RoleGraphIndex()
+
+    async def missing_roles(self, names: Optional[Iterable[str]]) -> List[str]:
+        """Noms de rôles inexistants, dans l'ordre de la requête."""
+        names = _unique(names)
+        if self.role_index.is_loaded:
+            names = [name for name in names if not self.role_index.has_role(name)]
+        if not names:
+            return []
+        existing = await self.role_repos.find_existing_names(names)
+        return [name for name in names if name not in existing]
+
+    async def missing_permissions(self, codes: Optional[Iterable[str]]) -> List[str]:
+        """Codes de permissions inexistants, dans l'ordre de la requête."""
+        codes = _unique(codes)
+        if not codes:
+            return []
+        existing = await self.permission_repos.find_existing_codes(codes)
+        return [code for code in codes if code not in existing]
+
+    async def ensure_references_exist(
+        self,
+        roles: Optional[Iterable[str]] = None,
+        permissions: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Vérifie rôles et permissions en parallèle; le premier rôle manquant est
+        signalé avant la première permission manquante."""
+        missing_roles, missing_permissions = await asyncio.gather(
+            self.missing_roles(roles), self.missing_permissions(permissions)
+        )
+        if missing_roles:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Role '{missing_roles[0]}' not found. Please create it first.",
+            )
+        if missing_permissions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Permission '{missing_permissions[0]}' not found. Please create it first.",
+            )
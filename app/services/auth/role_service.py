@@ -1,5 +1,7 @@
-from typing import List, Set
+from typing import List
 from fastapi import HTTPException
+from app.core.cache import AuthorizationCache
+from app.core.role_graph import RoleGraphIndex
 from app.db.repositories.permission_repository import PermissionRepository
 from app.db.repositories.role_repository import RoleRepository
 from app.schemas.role_schema import (
@@ -8,45 +10,40 @@ from app.schemas.role_schema import (
     RoleUpdateSchema,
 )
 from app.schemas.user_schema import UserReadSchema
+from app.services.auth.reference_validator import ReferenceValidator
 
 
 class RoleService:
     def __init__(
-        self, role_repos: RoleRepository, permission_repos: PermissionRepository
+        self,
+        role_repos: RoleRepository,
+        permission_repos: PermissionRepository,
+        authorization_cache: AuthorizationCache | None = None,
+        role_index: RoleGraphIndex | None = None,
     ):
         self.role_repos = role_repos
         self.permission_repos = permission_repos
+        self.authorization_cache = authorization_cache or AuthorizationCache()
+        self.role_index = role_index or RoleGraphIndex()
+        self.reference_validator = ReferenceValidator(
+            role_repos, permission_repos, role_index=self.role_index
+        )
 
     async def get_all_roles(self, user: UserReadSchema) -> set[str]:
-        # 1. Roles directes
-        roles = set(user.roles)
-
-        # 2. Roles hérités
-        seen = set()
-        to_visit = list(user.roles)
-
-        while to_visit:
-            role_name = to_visit.pop()
-            if role_name in seen:
-                continue
-            seen.add(role_name)
-
-            role = await self.role_repos.find_by_name(role_name)
-            if not role:
-                continue
-
-            roles.update(role.inherited_roles)
-            to_visit.extend(role.inherited_roles)
-
-        return roles
+        # Roles directs + hérités, résolus depuis l'index des rôles
+        role_index = await self.role_index.ensure_loaded(self.role_repos)
+        return role_index.roles_closure(user.roles)
 
     async def has_role(self, user: UserReadSchema, role_name: str) -> bool:
         all_roles = await self.get_all_roles(user)
         return role_name in all_roles
 
     async def ensure_role(self, user: UserReadSchema, role_name: str) -> bool:
-        db_role = await self.role_repos.find_by_name(name=role_name)
-        if not db_role:
+        role_index = await self.role_index.ensure_loaded(self.role_repos)
+        if not role_index.has_role(role_name):
+            # Rôle créé par un autre worker depuis le dernier rechargement
+            role_index = await self.role_index.reload(self.role_repos)
+        if not role_index.has_role(role_name):
             raise HTTPException(status_code=500, detail="Unkown role")
         if not await self.has_role(user, role_name):
             raise HTTPException(status_code=403, detail="Unauthorized")
@@ -115,16 +112,14 @@ class RoleService:
 
             # 2. Validate inherited roles if provided
             if role.inherited_roles:
-                existing_role_names = {
-                    r.name for r in await self.role_repos.list_roles()
-                }
+                # Écriture: validation sur l'état courant de la base, l'index de ce
+                # worker peut ignorer les rôles créés ou modifiés par les autres
+                await self.role_index.reload(self.role_repos)
+                await self.reference_validator.ensure_references_exist(
+                    roles=role.inherited_roles
+                )
 
                 for inherited_role_name in role.inherited_roles:
-                    if inherited_role_name not in existing_role_names:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Role '{inherited_role_name}' not found. Please create it first.",
-                        )
                     # Circular dependency check
                     if await self._check_circular_inheritance(
                         start_role_name=inherited_role_name,
@@ -135,19 +130,13 @@ class RoleService:
                             detail=f"Circular inheritance detected: '{role.name}' cannot inherit '{inherited_role_name}' as it would create a loop.",
                         )
 
-            if role.permissions:
-                db_permission_codes = {
-                    p.code for p in await self.permission_repos.list_permissions()
-                }
-                for permission_code in role.permissions:
-                    if permission_code not in db_permission_codes:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Permission '{permission_code}' not found. Please create it first.",
-                        )
+            await self.reference_validator.ensure_references_exist(
+                permissions=role.permissions
+            )
 
             # 3. Create the role in the repository
             inserted_id = await self.role_repos.create(role=role)
+            self.authorization_cache.invalidate()
 
             # 4. Fetch the newly created role by its ID
             created_role_model = await self.role_repos.find_by_id(id=inserted_id)
@@ -156,6 +145,7 @@ class RoleService:
                 raise HTTPException(
                     status_code=500, detail="Created role not found after insertion."
                 )
+            self.role_index.upsert_role(created_role_model)
 
             # 5. Validate and return the created role using the RoleReadSchema
             return RoleReadSchema.model_validate(created_role_model)
@@ -185,16 +175,14 @@ class RoleService:
                     )
 
             if role_update.inherited_roles:
-                existing_role_names = {
-                    r.name for r in await self.role_repos.list_roles()
-                }
+                # Écriture: validation sur l'état courant de la base, l'index de ce
+                # worker peut ignorer les rôles créés ou modifiés par les autres
+                await self.role_index.reload(self.role_repos)
+                await self.reference_validator.ensure_references_exist(
+                    roles=role_update.inherited_roles
+                )
 
                 for inherited_role_name in role_update.inherited_roles:
-                    if inherited_role_name not in existing_role_names:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Role '{inherited_role_name}' not found. Please create it first.",
-                        )
                     # Circular dependency check
                     if await self._check_circular_inheritance(
                         start_role_name=inherited_role_name,
@@ -205,22 +193,17 @@ class RoleService:
                             detail=f"Circular inheritance detected: '{role.name}' cannot inherit '{inherited_role_name}' as it would create a loop.",
                         )
 
-            if role_update.permissions:
-                db_permission_codes = {
-                    p.code for p in await self.permission_repos.list_permissions()
-                }
-                for permission_code in role_update.permissions:
-                    if permission_code not in db_permission_codes:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Permission '{permission_code}' not found. Please create it first.",
-                        )
+            await self.reference_validator.ensure_references_exist(
+                permissions=role_update.permissions
+            )
 
             success = await self.role_repos.update(id=role_id, update_data=update_data)
+            self.authorization_cache.invalidate()
             if not success:
                 raise HTTPException(status_code=500, detail="Update failed")
 
             updated = await self.role_repos.find_by_id(id=role_id)
+            self.role_index.upsert_role(updated, previous_name=role.name)
             return RoleReadSchema.model_validate(updated)
         except HTTPException as e:
             raise e
@@ -235,9 +218,11 @@ class RoleService:
             role = await self.role_repos.find_by_id(id=role_id)
             if not role:
                 raise HTTPException(status_code=404, detail="Role not found")
-            success = await self.role_repos.delete_one(id=role_id)
-            if not success:
+            deleted = await self.role_repos.delete_one(id=role_id)
+            if not deleted:
                 raise HTTPException(status_code=500, detail="Delete failed")
+            self.authorization_cache.invalidate()
+            self.role_index.remove_role(role.name)
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -249,6 +234,8 @@ class RoleService:
     async def delete_all_roles(self) -> None:
         try:
             success = await self.role_repos.delete_all()
+            self.authorization_cache.invalidate()
+            self.role_index.rebuild([])
             if not success:
                 raise HTTPException(status_code=500, detail="Delete failed")
         except HTTPException as e:
@@ -287,7 +274,6 @@ class RoleService:
                 codes=permissions_to_add
             )
             existing_permission_codes = {p.code for p in existing_permissions}
-            # print(f"print {existing_permission_codes}")
 
             for perm_code in permissions_to_add:
                 if perm_code not in existing_permission_codes:
@@ -304,6 +290,7 @@ class RoleService:
             updated = await self.role_repos.update(
                 id=str(role.id), update_data=update_data
             )
+            self.authorization_cache.invalidate()
 
             if not updated:
                 raise HTTPException(
@@ -316,6 +303,7 @@ class RoleService:
                 raise HTTPException(
                     status_code=500, detail="Updated role not found after update."
                 )
+            self.role_index.upsert_role(updated_role_model)
 
             return RoleReadSchema.model_validate(updated_role_model)
 
@@ -368,6 +356,7 @@ class RoleService:
             # Circular dependency check
             # We need to traverse the graph starting from the inherited_role
             # to see if it eventually inherits the main_role.
+            await self.role_index.reload(self.role_repos)
             if await self._check_circular_inheritance(
                 start_role_name=inherited_role_name_to_add,
                 target_role_name=main_role.name,
@@ -388,6 +377,7 @@ class RoleService:
             updated = await self.role_repos.update(
                 id=str(main_role.id), update_data=update_data
             )
+            self.authorization_cache.invalidate()
 
             if not updated:
                 raise HTTPException(
@@ -400,6 +390,7 @@ class RoleService:
                 raise HTTPException(
                     status_code=500, detail="Updated role not found after update."
                 )
+            self.role_index.upsert_role(updated_role_model)
 
             return RoleReadSchema.model_validate(updated_role_model)
 
@@ -442,6 +433,7 @@ class RoleService:
             updated = await self.role_repos.update(
                 id=str(role.id), update_data=update_data
             )
+            self.authorization_cache.invalidate()
 
             if not updated:
                 raise HTTPException(
@@ -453,6 +445,7 @@ class RoleService:
                 raise HTTPException(
                     status_code=500, detail="Updated role not found after removal."
                 )
+            self.role_index.upsert_role(updated_role_model)
 
             return RoleReadSchema.model_validate(updated_role_model)
 
@@ -498,6 +491,7 @@ class RoleService:
             updated = await self.role_repos.update(
                 id=str(main_role.id), update_data=update_data
             )
+            self.authorization_cache.invalidate()
 
             if not updated:
                 raise HTTPException(
@@ -509,6 +503,7 @@ class RoleService:
                 raise HTTPException(
                     status_code=500, detail="Updated role not found after removal."
                 )
+            self.role_index.upsert_role(updated_role_model)
 
             return RoleReadSchema.model_validate(updated_role_model)
 
@@ -525,53 +520,8 @@ class RoleService:
     ) -> bool:
         """
         Helper function to check for circular inheritance.
-        Performs a BFS-like traversal to see if target_role_name is reachable from start_role_name.
-        """
-        visited: Set[str] = set()
-        queue: List[str] = [start_role_name]
-
-        while queue:
-            current_role_name = queue.pop(0)  # Use pop(0) for BFS
-            if current_role_name == target_role_name:
-                return True  # Circular dependency detected
-
-            if current_role_name in visited:
-                continue
-            visited.add(current_role_name)
-
-            current_role = await self.role_repos.find_by_name(name=current_role_name)
-            if current_role and current_role.inherited_roles:
-                for inherited_from_current in current_role.inherited_roles:
-                    if inherited_from_current not in visited:
-                        queue.append(inherited_from_current)
-        return False  # No circular dependency
-
-    """async def _check_circular_inheritance(
-        self, start_role_name: str, target_role_name: str
-    ) -> bool:
-        """
-
-
-"""      Helper function to check for circular inheritance.
-        Performs a DFS-like traversal to see if target_role_name is reachable from start_role_name.
+        Looks up the precomputed role closure to see if target_role_name is reachable from start_role_name.
+        Write paths reload the index from the database first (see RoleGraphIndex.reload).
         """
-"""    visited: Set[str] = set()
-        queue: List[str] = [start_role_name]
-
-        while queue:
-            current_role_name = queue.pop(
-                0
-            )  # Use pop(0) for BFS, or pop() for DFS (less memory for recursion)
-            if current_role_name == target_role_name:
-                return True  # Circular dependency detected
-
-            if current_role_name in visited:
-                continue
-            visited.add(current_role_name)
-
-            current_role = await self.role_repos.find_by_name(name=current_role_name)
-            if current_role and current_role.inherited_roles:
-                for inherited_from_current in current_role.inherited_roles:
-                    if inherited_from_current not in visited:
-                        queue.append(inherited_from_current)
-        return False  # No circular dependency"""
+        role_index = await self.role_index.ensure_loaded(self.role_repos)
+        return role_index.is_reachable(start_role_name, target_role_name)
@@ -1,23 +1,65 @@
-from typing import Optional, List
+import csv
+import io
+from typing import AsyncIterator, Optional, List
+from app.core.cache import UserSnapshotCache
+from app.core.pagination import (
+    decode_cursor,
+    encode_cursor,
+    keyset_position,
+    parse_sort,
+)
 from app.core.security import SecurityUtils
 from app.db.repositories.permission_repository import PermissionRepository
 from app.db.repositories.role_repository import RoleRepository
-from app.db.repositories.user_repository import UserRepository
+from app.db.repositories.user_repository import USER_SORT_KEYS, UserRepository
 from app.models.user import UserModel
-from app.schemas.user_schema import UserCreateSchema, UserUpdateSchema, UserReadSchema
+from app.schemas.user_schema import (
+    UserCreateSchema,
+    UserPageSchema,
+    UserUpdateSchema,
+    UserReadSchema,
+)
+from app.services.auth.reference_validator import ReferenceValidator
 from fastapi import HTTPException
 
 
+# Formats de GET /users/export et leur type MIME
+USER_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Colonnes exportées (champs de UserReadSchema) et projection associée: le mot de
+# passe n'est jamais lu
+_EXPORT_FIELDS = ["id"] + [f for f in UserReadSchema.model_fields if f != "id"]
+_EXPORT_PROJECTION = {f: 1 for f in _EXPORT_FIELDS if f != "id"}
+_EXPORT_CHUNK_ROWS = 500
+
+
+def _csv_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return "|".join(str(item) for item in value)
+    return str(value)
+
+
+def _csv_line(values) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(list(values))
+    return buffer.getvalue()
+
+
 class UserService:
     def __init__(
         self,
         user_repo: UserRepository,
         role_repos: RoleRepository,
         permission_repos: PermissionRepository,
+        user_cache: UserSnapshotCache | None = None,
     ):
         self.user_repo = user_repo
         self.role_repos = role_repos
         self.permission_repos = permission_repos
+        self.user_cache = user_cache or UserSnapshotCache()
+        self.reference_validator = ReferenceValidator(role_repos, permission_repos)
 
     async def get_user(self, user_id: str) -> Optional[UserReadSchema]:
         user = await self.user_repo.find_by_id(user_id)
@@ -32,41 +74,95 @@ class UserService:
         return None
 
     async def list_users(
-        self, skip: int = 0, limit: int = 100, all: bool = False
-    ) -> List[UserReadSchema]:
-        users = await self.user_repo.list_users(skip=skip, limit=limit, all=all)
-        return [UserReadSchema.model_validate(u) for u in users]
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        all: bool = False,
+        cursor: Optional[str] = None,
+        sort: str = "_id",
+    ) -> UserPageSchema:
+        self._check_sort(sort)
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor, sort)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        # Un utilisateur de plus que demandé: indique s'il reste une page suivante
+        users = await self.user_repo.list_users(
+            skip=skip, limit=limit + 1, all=all, sort=sort, after=after
+        )
+        next_cursor = None
+        if not all and len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(sort, keyset_position(sort, users[-1]))
+        return UserPageSchema(
+            items=[UserReadSchema.model_validate(u) for u in users],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _check_sort(sort: str) -> None:
+        if parse_sort(sort)[0] not in USER_SORT_KEYS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid sort key. Allowed: {', '.join(USER_SORT_KEYS)}",
+            )
+
+    def validate_export(self, format: str, sort: str = "_id") -> str:
+        """Type MIME du format d'export; 400 si le format ou le tri est inconnu (à
+        vérifier avant de commencer à streamer la réponse)."""
+        self._check_sort(sort)
+        if format not in USER_EXPORT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid export format. Allowed: {', '.join(USER_EXPORT_MEDIA_TYPES)}",
+            )
+        return USER_EXPORT_MEDIA_TYPES[format]
+
+    async def export_users(
+        self, format: str = "ndjson", sort: str = "_id"
+    ) -> AsyncIterator[str]:
+        """Exporte tous les utilisateurs en NDJSON (un objet par ligne) ou en CSV.
+
+        Les documents sont lus au fil du curseur MongoDB (sans le mot de passe) et
+        sérialisés par morceaux de `_EXPORT_CHUNK_ROWS` lignes: la mémoire utilisée ne
+        dépend pas du nombre d'utilisateurs.
+        """
+        self.validate_export(format, sort)
+        chunk: List[str] = []
+        if format == "csv":
+            chunk.append(_csv_line(_EXPORT_FIELDS))
+        async for doc in self.user_repo.iter_users(
+            projection=_EXPORT_PROJECTION, sort=sort, batch_size=_EXPORT_CHUNK_ROWS
+        ):
+            doc["_id"] = str(doc["_id"])
+            user = UserReadSchema.model_validate(doc)
+            if format == "csv":
+                row = user.model_dump(mode="json", by_alias=True)
+                chunk.append(_csv_line(_csv_value(row[f]) for f in _EXPORT_FIELDS))
+            else:
+                chunk.append(user.model_dump_json(by_alias=True) + "\n")
+            if len(chunk) >= _EXPORT_CHUNK_ROWS:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
 
     async def create_user(self, user_create: UserCreateSchema) -> UserReadSchema:
-        existing = await self.user_repo.find_by_email(user_create.email)
-        if existing:
+        if await self.user_repo.find_id_by_email(user_create.email):
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        if user_create.roles:
-            db_role_names = {r.name for r in await self.role_repos.list_roles()}
-            for role_name in user_create.roles:
-                if role_name not in db_role_names:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Role '{role_name}' not found. Please create it first.",
-                    )
-        if user_create.permissions:
-            db_permission_codes = {
-                p.code for p in await self.permission_repos.list_permissions()
-            }
-            for permission_code in user_create.permissions:
-                if permission_code not in db_permission_codes:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Permission '{permission_code}' not found. Please create it first.",
-                    )
+        await self.reference_validator.ensure_references_exist(
+            roles=user_create.roles, permissions=user_create.permissions
+        )
 
-        hashed_pw = SecurityUtils.hash_password(user_create.password)
+        hashed_pw = await SecurityUtils.hash_password_async(user_create.password)
         user_model = UserModel(
             **user_create.model_dump(exclude=["password"]), password=hashed_pw
         )
-        user_id = await self.user_repo.create(user_model)
-        created = await self.user_repo.find_by_id(user_id)
+        created = await self.user_repo.create_and_get(user_model)
         return UserReadSchema.model_validate(created)
 
     async def update_user(
@@ -78,39 +174,23 @@ class UserService:
 
         update_data = user_update.model_dump(exclude_unset=True)
         if "email" in update_data:
-            existing = await self.user_repo.find_by_email(update_data["email"])
-            if existing and str(existing.id) != user_id:
+            existing_id = await self.user_repo.find_id_by_email(update_data["email"])
+            if existing_id and existing_id != user_id:
                 raise HTTPException(status_code=400, detail="Email already registered")
 
-        if user_update.roles:
-            db_role_names = {r.name for r in await self.role_repos.list_roles()}
-            for role_name in user_update.roles:
-                if role_name not in db_role_names:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Role '{role_name}' not found. Please create it first.",
-                    )
-        if user_update.permissions:
-            db_permission_codes = {
-                p.code for p in await self.permission_repos.list_permissions()
-            }
-            for permission_code in user_update.permissions:
-                if permission_code not in db_permission_codes:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Permission '{permission_code}' not found. Please create it first.",
-                    )
+        await self.reference_validator.ensure_references_exist(
+            roles=user_update.roles, permissions=user_update.permissions
+        )
 
         if "password" in update_data:
-            update_data["password"] = SecurityUtils.hash_password(
+            update_data["password"] = await SecurityUtils.hash_password_async(
                 update_data.pop("password")
             )
 
-        success = await self.user_repo.update(user_id, update_data)
-        if not success:
+        updated = await self.user_repo.update_and_get(user_id, update_data)
+        if not updated:
             raise HTTPException(status_code=500, detail="Update failed")
-
-        updated = await self.user_repo.find_by_id(user_id)
+        self.user_cache.invalidate(user_id)
         return UserReadSchema.model_validate(updated)
 
     async def verify_user(self, user_id: str) -> UserReadSchema:
@@ -123,6 +203,7 @@ class UserService:
         success = await self.user_repo.update(user_id, update_data)
         if not success:
             raise HTTPException(status_code=500, detail="User verification failed")
+        self.user_cache.invalidate(user_id)
 
         updated = await self.user_repo.find_by_id(user_id)
         return UserReadSchema.model_validate(updated)
@@ -134,6 +215,7 @@ class UserService:
         success = await self.user_repo.delete(user_id)
         if not success:
             raise HTTPException(status_code=500, detail="Delete failed")
+        self.user_cache.invalidate(user_id)
         return success
 
     async def assign_permissions_to_user(
@@ -177,21 +259,15 @@ class UserService:
             current_permissions.update(permissions_to_add)
 
             update_data = {"permissions": list(current_permissions)}
-            updated = await self.user_repo.update(
+            updated_user_model = await self.user_repo.update_and_get(
                 user_id=str(user.id), update_data=update_data
             )
 
-            if not updated:
-                raise HTTPException(
-                    status_code=500, detail="Failed to update user permissions."
-                )
-
-            # Fetch and return the updated role
-            updated_user_model = await self.user_repo.find_by_id(user_id=str(user.id))
             if not updated_user_model:
                 raise HTTPException(
-                    status_code=500, detail="Updated user not found after update."
+                    status_code=500, detail="Failed to update user permissions."
                 )
+            self.user_cache.invalidate(user.id)
 
             return UserReadSchema.model_validate(updated_user_model)
 
@@ -244,21 +320,15 @@ class UserService:
             current_roles.update(roles_to_add)
 
             update_data = {"roles": list(current_roles)}
-            updated = await self.user_repo.update(
+            updated_user_model = await self.user_repo.update_and_get(
                 user_id=str(user.id), update_data=update_data
             )
 
-            if not updated:
-                raise HTTPException(
-                    status_code=500, detail="Failed to update user roles."
-                )
-
-            # Fetch and return the updated role
-            updated_user_model = await self.user_repo.find_by_id(user_id=str(user.id))
             if not updated_user_model:
                 raise HTTPException(
-                    status_code=500, detail="Updated user not found after update."
+                    status_code=500, detail="Failed to update user roles."
                 )
+            self.user_cache.invalidate(user.id)
 
             return UserReadSchema.model_validate(updated_user_model)
 
@@ -297,20 +367,15 @@ class UserService:
             current_permissions = current_permissions.difference(permissions_to_remove)
 
             update_data = {"permissions": list(current_permissions)}
-            updated = await self.user_repo.update(
-                user_id=user.id, update_data=update_data
+            updated_user_model = await self.user_repo.update_and_get(
+                user_id=str(user.id), update_data=update_data
             )
 
-            if not updated:
-                raise HTTPException(
-                    status_code=500, detail="Failed to remove user permissions."
-                )
-
-            updated_user_model = await self.user_repo.find_by_id(user_id=str(user.id))
             if not updated_user_model:
                 raise HTTPException(
-                    status_code=500, detail="Updated user not found after removal."
+                    status_code=500, detail="Failed to remove user permissions."
                 )
+            self.user_cache.invalidate(user.id)
 
             return UserReadSchema.model_validate(updated_user_model)
 
@@ -349,20 +414,15 @@ class UserService:
             current_roles = current_roles.difference(roles_to_remove)
 
             update_data = {"roles": list(current_roles)}
-            updated = await self.user_repo.update(
-                user_id=user.id, update_data=update_data
+            updated_user_model = await self.user_repo.update_and_get(
+                user_id=str(user.id), update_data=update_data
             )
 
-            if not updated:
-                raise HTTPException(
-                    status_code=500, detail="Failed to remove user roles."
-                )
-
-            updated_user_model = await self.user_repo.find_by_id(user_id=str(user.id))
             if not updated_user_model:
                 raise HTTPException(
-                    status_code=500, detail="Updated user not found after removal."
+                    status_code=500, detail="Failed to remove user roles."
                 )
+            self.user_cache.invalidate(user.id)
 
             return UserReadSchema.model_validate(updated_user_model)
 
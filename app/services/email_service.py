@@ -1,15 +1,27 @@
 import smtplib
 from email.mime.text import MIMEText
 from email.header import Header
+from typing import List, Optional
 from fastapi import HTTPException, status
 from app.core.config import Settings
-import ssl
+from app.core.smtp_pool import SMTPConnectionPool
+from app.db.repositories.mail_queue_repository import MailQueueRepository
+from app.models.mail import MailMessageModel
+from app.providers.providers import get_smtp_pool
 import asyncio
 
 
 class EmailService:
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        smtp_pool: SMTPConnectionPool | None = None,
+        mail_queue_repos: MailQueueRepository | None = None,
+    ):
         self.settings = settings
+        # Connexions SMTP réutilisées d'un envoi à l'autre
+        self.smtp_pool = smtp_pool or get_smtp_pool()
+        self.mail_queue_repos = mail_queue_repos
         self.smtp_host = settings.smtp_host
         self.smtp_port = settings.smtp_port
         self.smtp_username = settings.smtp_username
@@ -33,16 +45,11 @@ class EmailService:
             e: _description_
             HTTPException: _description_
         """
-        msg = MIMEText(body, "html" if is_html else "plain", "utf-8")
-        msg["Subject"] = Header(subject, "utf-8")
-        msg["From"] = self.smtp_sender_email
-        msg["To"] = recipient_email
-
         try:
             await asyncio.to_thread(
                 self._perform_send_email,
                 recipient_email,
-                msg.as_string(),
+                self._build_message(recipient_email, subject, body, is_html),
             )
             print(
                 f"Email sent successfully to {recipient_email} for subject: {subject}"
@@ -55,9 +62,76 @@ class EmailService:
                 detail=f"An unexpected error occurred while sending email: {e}",
             )
 
+    async def enqueue_email(
+        self, recipient_email: str, subject: str, body: str, is_html: bool = False
+    ) -> Optional[str]:
+        """Place l'e-mail dans la file d'envoi (`mail_queue`) et rend la main immédiatement,
+        l'envoi est fait par `MailQueueWorker`. Sans file configurée (ou file désactivée),
+        l'e-mail est envoyé directement.
+
+        Returns:
+            Optional[str]: l'identifiant du message en file, None s'il a été envoyé directement
+        """
+        if self.mail_queue_repos is None or not self.settings.mail_queue_enabled:
+            await self.send_email(recipient_email, subject, body, is_html=is_html)
+            return None
+        return await self.mail_queue_repos.enqueue(
+            MailMessageModel(
+                recipient_email=recipient_email,
+                subject=subject,
+                body=body,
+                is_html=is_html,
+            )
+        )
+
+    async def enqueue_emails(self, messages: List[MailMessageModel]) -> List[str]:
+        """Place un lot d'e-mails dans la file d'envoi en une seule insertion. Sans file
+        configurée (ou file désactivée), le lot est envoyé directement.
+
+        Returns:
+            List[str]: les identifiants des messages en file (vide en envoi direct)
+        """
+        if self.mail_queue_repos is None or not self.settings.mail_queue_enabled:
+            await self.send_batch(messages)
+            return []
+        return await self.mail_queue_repos.enqueue_many(messages)
+
+    async def send_batch(
+        self, messages: List[MailMessageModel]
+    ) -> List[Optional[Exception]]:
+        """Envoie un lot de messages de la file sur une même connexion SMTP.
+        Retourne l'erreur de chaque message (None s'il a été envoyé).
+        """
+        return await asyncio.to_thread(
+            self.smtp_pool.send_many,
+            self.smtp_sender_email,
+            [
+                (
+                    message.recipient_email,
+                    self._build_message(
+                        message.recipient_email,
+                        message.subject,
+                        message.body,
+                        message.is_html,
+                    ),
+                )
+                for message in messages
+            ],
+        )
+
+    def _build_message(
+        self, recipient_email: str, subject: str, body: str, is_html: bool
+    ) -> str:
+        msg = MIMEText(body, "html" if is_html else "plain", "utf-8")
+        msg["Subject"] = Header(subject, "utf-8")
+        msg["From"] = self.smtp_sender_email
+        msg["To"] = recipient_email
+        return msg.as_string()
+
     def _perform_send_email(self, recipient_email: str, msg_string: str):
         """Méthode synchrone interne qui contient la logique d'envoi d'e-mail bloquante.
-        Cette méthode sera exécutée dans un thread séparé par asyncio.to_thread.
+        Cette méthode sera exécutée dans un thread séparé par asyncio.to_thread et
+        réutilise une connexion du pool SMTP.
 
         Args:
             recipient_email (str): _description_
@@ -68,27 +142,8 @@ class EmailService:
             HTTPException: _description_
             HTTPException: _description_
         """
-        server = None
         try:
-            if self.smtp_use_ssl:
-                context = ssl.create_default_context()
-                # Tests sans vérification du certificat(juste en mode dev/test)
-                context.check_hostname = False
-                context.verify_mode = ssl.CERT_NONE
-                server = smtplib.SMTP_SSL(
-                    self.smtp_host, self.smtp_port, context=context
-                )
-            else:
-                server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-                if self.smtp_use_tls:
-                    context = ssl.create_default_context()
-                    # Tests sans vérification du certificat(juste en mode dev/test)
-                    context.check_hostname = False
-                    context.verify_mode = ssl.CERT_NONE
-                    server.starttls(context=context)
-
-            server.login(self.smtp_username, self.smtp_password)
-            server.sendmail(self.smtp_sender_email, recipient_email, msg_string)
+            self.smtp_pool.send(self.smtp_sender_email, recipient_email, msg_string)
         except smtplib.SMTPAuthenticationError as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -104,6 +159,3 @@ class EmailService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Email sending failed: {e}",
             )
-        finally:
-            if server:
-                server.quit()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, TypeVar, Generic
+from typing import AsyncIterator, Dict, Any, List, Optional, TypeVar, Generic
 
 
 # Define a TypeVar for the database connection type
@@ -29,6 +29,7 @@ class BaseCollectionOperations(ABC, Generic[DBConnection]):
     async def find_one(
         self,
         query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,  # Fields to return
     ) -> Optional[Dict[str, Any]]:
         """Abstract method to find a single document/row."""
         pass
@@ -45,6 +46,26 @@ class BaseCollectionOperations(ABC, Generic[DBConnection]):
         """Abstract method to find multiple documents/rows. Should return a list of documents."""
         pass
 
+    @abstractmethod
+    def iter_many(
+        self,
+        query: Dict[str, Any] = None,
+        projection: Optional[Dict[str, Any]] = None,  # Fields to return
+        sort: Optional[Dict[str, Any]] = None,  # Sorting order
+        batch_size: Optional[int] = None,  # Documents fetched per round trip
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Abstract async generator over the matching documents/rows. Implementations must
+        fetch lazily (at most `batch_size` documents held at a time) instead of
+        materializing the whole result like find_many.
+        """
+        pass
+
+    @abstractmethod
+    async def count(self, query: Dict[str, Any] = None) -> int:
+        """Abstract method to count the documents/rows matching the query."""
+        pass
+
     @abstractmethod
     async def insert_one(
         self, document: Dict[str, Any]
@@ -66,6 +87,19 @@ class BaseCollectionOperations(ABC, Generic[DBConnection]):
         """Abstract method to update a single document/row, returning the number of modified documents."""
         pass
 
+    @abstractmethod
+    async def find_one_and_update(
+        self,
+        query: Dict[str, Any],
+        update_data: Dict[str, Any],
+        return_updated: bool = True,
+        upsert: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Abstract method to atomically update a single document/row and return it
+        (after the update by default, before it if `return_updated` is False).
+        With `upsert`, the document is created when no document matches the query."""
+        pass
+
     @abstractmethod
     async def update_many(
         self, query: Dict[str, Any], update_data: Dict[str, Any]
@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from app.utils.db_utils.db_utils import BaseCollectionOperations
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
 
 
 class MongoCollectionOperations(BaseCollectionOperations[AsyncIOMotorDatabase]):
@@ -26,9 +27,10 @@ class MongoCollectionOperations(BaseCollectionOperations[AsyncIOMotorDatabase]):
     async def find_one(
         self,
         query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Finds a single document in the MongoDB collection."""
-        return await self._collection.find_one(query)
+        """Finds a single document in the MongoDB collection, with optional projection."""
+        return await self._collection.find_one(query, projection)
 
     async def find_many(
         self,
@@ -56,6 +58,32 @@ class MongoCollectionOperations(BaseCollectionOperations[AsyncIOMotorDatabase]):
 
         return await cursor.to_list(length=None)
 
+    async def iter_many(
+        self,
+        query: Dict[str, Any] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterates over the matching documents of the MongoDB collection one at a time.
+        Unlike find_many, the documents are fetched lazily by the Motor cursor (one
+        server batch at a time), so memory stays constant whatever the result size
+        and the first document is available after the first batch. `batch_size`
+        bounds the number of documents per round trip (driver default otherwise).
+        """
+        cursor = self._collection.find(query or {}, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        async for document in cursor:
+            yield document
+
+    async def count(self, query: Dict[str, Any] = None) -> int:
+        """Counts the documents matching the query in the MongoDB collection."""
+        return await self._collection.count_documents(query or {})
+
     async def insert_one(self, document: Dict[str, Any]) -> str:
         """Inserts a single document into the MongoDB collection, returning its ID as a string."""
         result = await self._collection.insert_one(document)
@@ -76,6 +104,27 @@ class MongoCollectionOperations(BaseCollectionOperations[AsyncIOMotorDatabase]):
         result = await self._collection.update_one(query, update_data)
         return result.modified_count
 
+    async def find_one_and_update(
+        self,
+        query: Dict[str, Any],
+        update_data: Dict[str, Any],
+        return_updated: bool = True,
+        upsert: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Updates a single document in the MongoDB collection and returns it in the same round trip.
+        Note: update_data here should be the full MongoDB update document (e.g., {"$set": {"field": "value"}}).
+        With `upsert`, the document is created when no document matches the query.
+        """
+        return await self._collection.find_one_and_update(
+            query,
+            update_data,
+            return_document=(
+                ReturnDocument.AFTER if return_updated else ReturnDocument.BEFORE
+            ),
+            upsert=upsert,
+        )
+
     async def update_many(
         self, query: Dict[str, Any], update_data: Dict[str, Any]
     ) -> int:
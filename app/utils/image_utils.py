@@ -1,21 +1,32 @@
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
 
 
-def generate_countdown_image(
-    time_remaining_seconds: int, width: int = 200, height: int = 60
-) -> bytes:
-    """
-    Génère une image PNG affichant un compte à rebours.
+@lru_cache(maxsize=None)
+def _load_font(size: int = 30):
+    """Charge la police du compte à rebours une seule fois par taille."""
+    # Tente de charger une police de caractères. Utilise la police par défaut si non trouvée.
+    try:
+        # Chemin vers une police TrueType (vous devrez peut-être ajuster ce chemin)
+        # Pour les systèmes Windows, vous pouvez essayer "arial.ttf" ou "consola.ttf"
+        # Pour Linux/macOS, "DejaVuSans-Bold.ttf" ou "Arial.ttf" si installé
+        return ImageFont.truetype(
+            "arial.ttf", size
+        )  # Essayez une police système courante
+    except IOError:
+        # Fallback vers la police par défaut si la police spécifiée n'est pas trouvée
+        print(
+            "Avertissement: Police 'arial.ttf' non trouvée, utilisation de la police par défaut."
+        )
+        return ImageFont.load_default()
 
-    Args:
-        time_remaining_seconds (int): Le temps restant en secondes.
-        width (int): Largeur de l'image.
-        height (int): Hauteur de l'image.
 
-    Returns:
-        bytes: Les données binaires de l'image PNG.
-    """
+# Une image par seconde restante: au plus `otp_expiry_minutes * 60 + 1` images par
+# taille, la borne ne sert qu'à protéger la mémoire si la durée de vie change.
+@lru_cache(maxsize=4096)
+def _countdown_frame(time_remaining_seconds: int, width: int, height: int):
+    """Image (en palette) du compte à rebours, partagée par les formats PNG et GIF."""
     # Crée une image blanche
     img = Image.new("RGB", (width, height), color=(255, 255, 255))
     d = ImageDraw.Draw(img)
@@ -30,20 +41,7 @@ def generate_countdown_image(
         countdown_text = f"{minutes:02}:{seconds:02}"
         text_color = (0, 0, 0)  # Noir par défaut
 
-    # Tente de charger une police de caractères. Utilise la police par défaut si non trouvée.
-    try:
-        # Chemin vers une police TrueType (vous devrez peut-être ajuster ce chemin)
-        # Pour les systèmes Windows, vous pouvez essayer "arial.ttf" ou "consola.ttf"
-        # Pour Linux/macOS, "DejaVuSans-Bold.ttf" ou "Arial.ttf" si installé
-        font = ImageFont.truetype(
-            "arial.ttf", 30
-        )  # Essayez une police système courante
-    except IOError:
-        # Fallback vers la police par défaut si la police spécifiée n'est pas trouvée
-        font = ImageFont.load_default()
-        print(
-            "Avertissement: Police 'arial.ttf' non trouvée, utilisation de la police par défaut."
-        )
+    font = _load_font()
 
     # Calcule la taille du texte
     bbox = d.textbbox((0, 0), countdown_text, font=font)
@@ -57,8 +55,89 @@ def generate_countdown_image(
     # Dessine le texte
     d.text((x, y), countdown_text, fill=text_color, font=font)
 
+    # Conversion en palette faite une seule fois (obligatoire pour le GIF)
+    return img.convert("P", palette=Image.Palette.ADAPTIVE)
+
+
+@lru_cache(maxsize=4096)
+def _render_countdown_image(time_remaining_seconds: int, width: int, height: int):
     # Sauvegarde l'image en mémoire sous forme de bytes (PNG)
     byte_io = BytesIO()
-    img.save(byte_io, "PNG")
-    byte_io.seek(0)
+    _countdown_frame(time_remaining_seconds, width, height).save(byte_io, "PNG")
     return byte_io.getvalue()
+
+
+# Durée restante arrondie (par défaut) à ce pas pour le GIF: quelques dizaines de GIF
+# différents couvrent toute la durée de vie d'un OTP et sont servis depuis le cache
+GIF_QUANTUM_SECONDS = 10
+
+
+# Une entrée par pas de `GIF_QUANTUM_SECONDS` (31 pour des OTP de 5 minutes)
+@lru_cache(maxsize=256)
+def _render_countdown_gif(time_remaining_seconds: int, width: int, height: int):
+    frames = [
+        _countdown_frame(seconds, width, height)
+        for seconds in range(time_remaining_seconds, -1, -1)
+    ]
+    byte_io = BytesIO()
+    # Une image par seconde, lue une seule fois (pas de boucle): l'animation s'arrête
+    # sur "00:00"
+    frames[0].save(
+        byte_io,
+        "GIF",
+        save_all=True,
+        append_images=frames[1:],
+        duration=1000,
+    )
+    return byte_io.getvalue()
+
+
+def generate_countdown_image(
+    time_remaining_seconds: int, width: int = 200, height: int = 60
+) -> bytes:
+    """
+    Retourne l'image PNG affichant un compte à rebours.
+
+    Chaque image n'est dessinée et encodée qu'une seule fois puis servie depuis le
+    cache (toutes les valeurs expirées partagent l'image "00:00").
+
+    Args:
+        time_remaining_seconds (int): Le temps restant en secondes.
+        width (int): Largeur de l'image.
+        height (int): Hauteur de l'image.
+
+    Returns:
+        bytes: Les données binaires de l'image PNG.
+    """
+    return _render_countdown_image(max(0, int(time_remaining_seconds)), width, height)
+
+
+def generate_countdown_gif(
+    time_remaining_seconds: int, width: int = 200, height: int = 60
+) -> bytes:
+    """
+    Retourne un GIF animé qui décompte de `time_remaining_seconds` jusqu'à "00:00".
+
+    Une seule requête couvre toute la durée de vie restante de l'OTP (au lieu d'une
+    image PNG rechargée par le client mail). La durée est arrondie au multiple
+    inférieur de `GIF_QUANTUM_SECONDS` (le décompte n'affiche jamais plus que le temps
+    réellement restant) pour que le GIF encodé soit réutilisé d'une requête à l'autre.
+    Les images sont prises dans le même cache que `generate_countdown_image`.
+
+    Args:
+        time_remaining_seconds (int): Le temps restant en secondes.
+        width (int): Largeur de l'image.
+        height (int): Hauteur de l'image.
+
+    Returns:
+        bytes: Les données binaires du GIF.
+    """
+    seconds = max(0, int(time_remaining_seconds))
+    return _render_countdown_gif(seconds - seconds % GIF_QUANTUM_SECONDS, width, height)
+
+
+def preload_countdown_images(max_seconds: int, width: int = 200, height: int = 60):
+    """Génère à l'avance toutes les images de `max_seconds` à 0."""
+    for time_remaining_seconds in range(max_seconds + 1):
+        _countdown_frame(time_remaining_seconds, width, height)
+        _render_countdown_image(time_remaining_seconds, width, height)
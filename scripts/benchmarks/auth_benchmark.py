@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List
+
+from dotenv import load_dotenv
+from httpx import ASGITransport, AsyncClient
+
+from app.core.rate_limiter import RateLimiter
+from app.core.security import SecurityUtils
+from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.role_repository import RoleRepository
+from app.db.repositories.user_repository import UserRepository
+from app.main import app
+from app.models.role import PermissionModel
+from app.models.user import UserModel
+from app.providers.providers import get_db, get_settings
+from app.schemas.role_schema import RoleCreateSchema
+from app.services.auth.role_service import RoleService
+from scripts.seeds.roles.base_permissions_data import BASE_PERMISSIONS_SEED
+from scripts.seeds.roles.base_roles_data import BASE_ROLES_SEED
+
+
+SCENARIOS = ("login", "register", "me", "list_users")
+BENCHMARK_PASSWORD = "benchmark-password"
+# Seules les bases portant ce suffixe sont vidées sans --force
+BENCHMARK_DATABASE_SUFFIX = "_benchmark"
+
+
+class CountingCollection:
+    """Enveloppe une collection et compte chaque appel de méthode (find, insert_one...)."""
+
+    def __init__(self, collection, counter: Counter):
+        self._collection = collection
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if callable(attribute) and not name.startswith("_"):
+
+            def counted(*args, **kwargs):
+                self._counter[name] += 1
+                return attribute(*args, **kwargs)
+
+            return counted
+        return attribute
+
+
+class CountingDB:
+    """Enveloppe la base (FakeDB ou Motor) pour compter les appels à la base."""
+
+    def __init__(self, db):
+        self._db = db
+        self.calls: Counter = Counter()
+
+    def get_collection(self, name: str) -> CountingCollection:
+        return CountingCollection(self._db.get_collection(name), self.calls)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+
+async def create_database(backend: str, database_name: str | None, force: bool = False):
+    """Retourne (base, fonction de fermeture) pour le backend choisi.
+
+    Avec le backend mongo la base est vidée: un nom qui ne se termine pas par
+    `BENCHMARK_DATABASE_SUFFIX` est refusé, sauf avec `force`.
+    """
+    if backend == "fake":
+        from tests.common.fake_db import FakeDB
+
+        return FakeDB(), lambda: None
+
+    from app.db.mongo_client import MongoClient
+
+    load_dotenv()
+    settings = get_settings()
+    database_name = (
+        database_name or f"{settings.database_name}{BENCHMARK_DATABASE_SUFFIX}"
+    )
+    if not database_name.endswith(BENCHMARK_DATABASE_SUFFIX) and not force:
+        raise ValueError(
+            f"Refusing to drop the collections of '{database_name}': use a name "
+            f"ending with '{BENCHMARK_DATABASE_SUFFIX}' or pass --force"
+        )
+    client = MongoClient(settings.database_uri, database_name)
+    db = client.get_db()
+    # Base dédiée au benchmark: on repart de collections vides
+    for name in await db.list_collection_names():
+        await db.drop_collection(name)
+    return db, client.close
+
+
+async def seed(db, users: int) -> List[str]:
+    """Crée les permissions, les rôles de base et `users` utilisateurs "admin"."""
+    permission_repos = PermissionRepository(db)
+    role_repos = RoleRepository(db)
+    for permission_data in BASE_PERMISSIONS_SEED:
+        await permission_repos.create(PermissionModel(**permission_data))
+    role_service = RoleService(role_repos=role_repos, permission_repos=permission_repos)
+    for role_data in BASE_ROLES_SEED:
+        await role_service.create_role(RoleCreateSchema(**role_data))
+
+    user_repos = UserRepository(db)
+    hashed_password = SecurityUtils.hash_password(BENCHMARK_PASSWORD)
+    emails = []
+    for i in range(users):
+        email = f"bench{i}@example.com"
+        await user_repos.create(
+            UserModel(
+                email=email,
+                first_name="Bench",
+                last_name=f"User{i}",
+                password=hashed_password,
+                roles=["admin"],
+            )
+        )
+        emails.append(email)
+    return emails
+
+
+def percentile(sorted_values: List[float], rank: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(rank / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def run_scenario(
+    name: str,
+    request: Callable[[int], Awaitable[int]],
+    db: CountingDB,
+    total_requests: int,
+    concurrency: int,
+) -> Dict:
+    latencies: List[float] = []
+    errors: Counter = Counter()
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < total_requests:
+            index = next_index
+            next_index += 1
+            started_at = time.perf_counter()
+            status_code = await request(index)
+            latencies.append(time.perf_counter() - started_at)
+            if status_code >= 400:
+                errors[status_code] += 1
+
+    calls_before = db.total_calls()
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    db_calls = db.total_calls() - calls_before
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "requests": total_requests,
+        "concurrency": concurrency,
+        "errors": dict(errors),
+        "rps": round(total_requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "db_calls_per_request": round(db_calls / total_requests, 2),
+    }
+
+
+async def run_benchmark(
+    backend: str = "fake",
+    scenarios: List[str] = SCENARIOS,
+    total_requests: int = 200,
+    concurrency: int = 20,
+    users: int = 20,
+    database_name: str | None = None,
+    force: bool = False,
+) -> List[Dict]:
+    raw_db, close = await create_database(backend, database_name, force)
+    # Toutes les requêtes viennent de la même IP: on mesure le service, pas le limiteur
+    RateLimiter().enabled = False
+    db = CountingDB(raw_db)
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        emails = await seed(raw_db, users)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.post(
+                "/login", json={"email": emails[0], "password": BENCHMARK_PASSWORD}
+            )
+            response.raise_for_status()
+            headers = {
+                "Authorization": f"Bearer {response.json()['access_token']['token']}"
+            }
+            run_id = uuid.uuid4().hex[:8]
+
+            async def login(i: int) -> int:
+                payload = {"email": emails[i % users], "password": BENCHMARK_PASSWORD}
+                return (await client.post("/login", json=payload)).status_code
+
+            async def register(i: int) -> int:
+                payload = {
+                    "email": f"register-{run_id}-{i}@example.com",
+                    "first_name": "Bench",
+                    "last_name": "Register",
+                    "password": BENCHMARK_PASSWORD,
+                }
+                return (await client.post("/register", json=payload)).status_code
+
+            async def me(i: int) -> int:
+                return (await client.get("/me", headers=headers)).status_code
+
+            async def list_users(i: int) -> int:
+                response = await client.get("/users/?limit=20", headers=headers)
+                return response.status_code
+
+            requests = {
+                "login": login,
+                "register": register,
+                "me": me,
+                "list_users": list_users,
+            }
+            return [
+                await run_scenario(
+                    name, requests[name], db, total_requests, concurrency
+                )
+                for name in scenarios
+            ]
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        close()
+
+
+def print_report(results: List[Dict]) -> None:
+    columns = (
+        "scenario",
+        "requests",
+        "rps",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "db_calls_per_request",
+        "errors",
+    )
+    rows = [[str(result[column]) for column in columns] for result in results]
+    widths = [
+        max(len(column), *(len(row[i]) for row in rows))
+        for i, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark des endpoints d'authentification (/login, /register, /me, GET /users/)."
+    )
+    parser.add_argument("--backend", choices=("fake", "mongo"), default="fake")
+    parser.add_argument(
+        "--database-name",
+        help="Base utilisée avec --backend mongo (vidée au démarrage), par défaut <DATABASE_NAME>_benchmark",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Autorise une base dont le nom ne se termine pas par _benchmark",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS)
+    )
+    parser.add_argument("--json", help="Écrit aussi les résultats dans ce fichier")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    # python -m scripts.benchmarks.auth_benchmark --backend fake --concurrency 20
+    args = parse_args()
+    results = asyncio.run(
+        run_benchmark(
+            backend=args.backend,
+            scenarios=args.scenarios,
+            total_requests=args.requests,
+            concurrency=args.concurrency,
+            users=args.users,
+            database_name=args.database_name,
+            force=args.force,
+        )
+    )
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
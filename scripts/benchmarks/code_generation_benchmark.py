@@ -0,0 +1,103 @@
+import argparse
+import json
+import random
+import string
+import timeit
+from typing import Callable, Dict, List
+
+from app.core.random_codes import (
+    generate_numeric_code,
+    generate_numeric_codes,
+    generate_password,
+)
+
+
+def legacy_otp_code(length: int) -> str:
+    """Ancienne génération des codes OTP (un `random.randint` par chiffre)."""
+    return "".join([str(random.randint(0, 9)) for _ in range(length)])
+
+
+def legacy_password(length: int) -> str:
+    """Ancienne génération des mots de passe (`random.choice`)."""
+    characters = string.ascii_letters + string.digits + string.punctuation
+    return "".join(random.choice(characters) for _ in range(length))
+
+
+def measure(name: str, func: Callable[[], object], codes: int, repeat: int) -> Dict:
+    """Meilleur temps sur `repeat` essais pour produire `codes` valeurs."""
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    return {
+        "implementation": name,
+        "codes": codes,
+        "total_ms": round(best * 1000, 3),
+        "us_per_code": round(best / codes * 1_000_000, 3),
+        "codes_per_second": round(codes / best) if best else 0,
+    }
+
+
+def run_benchmark(count: int = 10000, length: int = 6, repeat: int = 5) -> List[Dict]:
+    return [
+        measure(
+            "otp legacy random.randint per digit",
+            lambda: [legacy_otp_code(length) for _ in range(count)],
+            count,
+            repeat,
+        ),
+        measure(
+            "otp secrets.randbelow per code",
+            lambda: [generate_numeric_code(length) for _ in range(count)],
+            count,
+            repeat,
+        ),
+        measure(
+            "otp secrets batch (generate_numeric_codes)",
+            lambda: generate_numeric_codes(count, length),
+            count,
+            repeat,
+        ),
+        measure(
+            "password legacy random.choice",
+            lambda: [legacy_password(12) for _ in range(count)],
+            count,
+            repeat,
+        ),
+        measure(
+            "password secrets batch (generate_password)",
+            lambda: [generate_password(12) for _ in range(count)],
+            count,
+            repeat,
+        ),
+    ]
+
+
+def print_report(results: List[Dict]) -> None:
+    columns = ("implementation", "codes", "total_ms", "us_per_code", "codes_per_second")
+    rows = [[str(result[column]) for column in columns] for result in results]
+    widths = [
+        max(len(column), *(len(row[i]) for row in rows))
+        for i, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark de la génération des codes OTP et des mots de passe."
+    )
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--length", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Écrit aussi les résultats dans ce fichier")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    # python -m scripts.benchmarks.code_generation_benchmark --count 10000
+    args = parse_args()
+    results = run_benchmark(count=args.count, length=args.length, repeat=args.repeat)
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
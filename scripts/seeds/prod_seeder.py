@@ -16,6 +16,20 @@ async def run_necessary_seeds():
         "\n--- Démarrage de toutes les opérations d'initialisation de la base de données en production ---"
     )
 
+    # Exécution de seed_indexes
+    print(
+        "********Création des index : python -m scripts.seeds.seed_indexes...********"
+    )
+    process_indexes = subprocess.run(
+        [sys.executable, "-m", "scripts.seeds.seed_indexes"],
+        capture_output=True,
+        text=True,
+    )
+    print(process_indexes.stdout)
+    if process_indexes.stderr:
+        print(f"Erreur lors de la création des index:\n{process_indexes.stderr}")
+        sys.exit(1)
+
     # Exécution de seed_permissions
     print(
         "********Création des permissions de base : python -m scripts.seeds.roles.seed_permissions...********"
@@ -0,0 +1,39 @@
+import asyncio
+
+from dotenv import load_dotenv
+from app.core.config import Settings
+from app.db.mongo_client import MongoClient
+from app.db.mongo_indexes import ensure_indexes, verify_indexes
+
+
+async def seed_indexes():
+    """
+    Creates the indexes declared in app/db/mongo_indexes.py (idempotent)
+    and prints missing, unexpected and unused indexes.
+    """
+    load_dotenv()
+    settings = Settings()
+    client = MongoClient(settings.database_uri, settings.database_name)
+    db = client.get_db()
+
+    print("Ensuring indexes...")
+    report = await ensure_indexes(db)
+    for collection_name, index_names in report.items():
+        if collection_name != "errors":
+            print(f"{collection_name}: {', '.join(index_names)}")
+
+    verification = await verify_indexes(db)
+    for kind, collections in verification.items():
+        for collection_name, index_names in collections.items():
+            print(f"{kind} indexes on {collection_name}: {', '.join(index_names)}")
+
+    print("Finished ensuring indexes.")
+    client.close()
+    # Les erreurs sont écrites sur stderr pour être détectées par les seeders parents
+    if report["errors"]:
+        raise RuntimeError("\n".join(report["errors"]))
+
+
+if __name__ == "__main__":
+    # python -m scripts.seeds.seed_indexes
+    asyncio.run(seed_indexes())
@@ -19,6 +19,20 @@ async def run_all_seeds(clean_db: bool = True):
     # Déterminer l'argument --clean_db pour les sous-processus
     clean_db_arg = "--clean_db=true" if clean_db else "--clean_db=false"
 
+    # Exécution de seed_indexes
+    print(
+        "********Création des index : python -m scripts.seeds.seed_indexes...********"
+    )
+    process_indexes = subprocess.run(
+        [sys.executable, "-m", "scripts.seeds.seed_indexes"],
+        capture_output=True,
+        text=True,
+    )
+    print(process_indexes.stdout)
+    if process_indexes.stderr:
+        print(f"Erreur lors de la création des index:\n{process_indexes.stderr}")
+        sys.exit(1)
+
     # Exécution de seed_permissions
     print(
         "********Création des permissions de base  : python -m scripts.seeds.roles.seed_permissions...********"
@@ -63,8 +63,7 @@ async def seed_users(num_fake_users: int = 0, clean_db: bool = True):
     else:
         print(f"Seeding {num_fake_users} fake users.")
 
-        all_role_models = await role_repo.list_roles()
-        all_available_role_names = [r.name for r in all_role_models]
+        all_available_role_names = [r.name async for r in role_repo.iter_roles()]
 
         roles_for_fake_users = [
             role_name
@@ -1,3 +1,4 @@
+import datetime
 from collections import defaultdict
 from bson import ObjectId
 import copy
@@ -19,6 +20,7 @@ class MockCursor:
         self._sort_criteria = None
         self._skip_value = None
         self._limit_value = None
+        self._batch_size = None
 
     def sort(self, sort_criteria: Dict[str, Any]):
         """Simulates the .sort() method of a Motor cursor."""
@@ -35,6 +37,11 @@ class MockCursor:
         self._limit_value = limit_value
         return self
 
+    def batch_size(self, batch_size: int):
+        """Simulates the .batch_size() method of a Motor cursor (no effect in memory)."""
+        self._batch_size = batch_size
+        return self
+
     async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Simulates the .to_list() method of a Motor cursor.
@@ -64,7 +71,16 @@ class MockCursor:
 
         return final_results
 
-    def _apply_projection(self, doc: dict, projection: Optional[dict]) -> dict:
+    def __aiter__(self):
+        """Simulates `async for doc in cursor` (sort, skip, limit and projection applied)."""
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self.to_list():
+            yield doc
+
+    @staticmethod
+    def _apply_projection(doc: dict, projection: Optional[dict]) -> dict:
         """Helper to apply projection to a single document."""
         if projection is None:
             return doc
@@ -107,6 +123,7 @@ class MockCursor:
 class FakeCollection:
     def __init__(self):
         self.storage = {}
+        self.indexes = {}
 
     def _normalize_id(self, id_value: Any) -> Optional[str]:
         """Convert ObjectId to string for consistent storage keys."""
@@ -119,31 +136,71 @@ class FakeCollection:
         if not filter:
             return True
         for key, value in filter.items():
-            if key == "_id":
+            if key == "$or":
+                # Handle $or operator: {"$or": [{...}, {...}]}
+                if not any(self._matches_filter(doc, clause) for clause in value):
+                    return False
+            elif key == "_id" and isinstance(value, dict):
+                # Handle operators on _id: {"_id": {"$gt": ObjectId(...)}}, {"$in": [...]}
+                doc_id = self._normalize_id(doc.get("_id"))
+                for operator, operand in value.items():
+                    if operator == "$in":
+                        if doc_id not in {self._normalize_id(v) for v in operand}:
+                            return False
+                    elif not self._OPERATORS[operator](
+                        ObjectId(doc_id), ObjectId(self._normalize_id(operand))
+                    ):
+                        return False
+            elif key == "_id":
                 if self._normalize_id(doc.get("_id")) != self._normalize_id(value):
                     return False
             elif isinstance(value, dict) and "$in" in value:
                 # Handle $in operator: {"field": {"$in": ["val1", "val2"]}}
+                # (an array field matches when one of its elements is in the list)
                 field_value = doc.get(key)
                 in_list = value["$in"]
-                if field_value not in in_list:
+                if isinstance(field_value, list):
+                    if not any(item in in_list for item in field_value):
+                        return False
+                elif field_value not in in_list:
                     return False
+            elif isinstance(value, dict) and any(k in self._OPERATORS for k in value):
+                # Handle comparison operators: {"field": {"$gt": 1, "$lte": 5}}
+                field_value = doc.get(key)
+                for operator, operand in value.items():
+                    if field_value is None or not self._OPERATORS[operator](
+                        self._comparable(field_value), self._comparable(operand)
+                    ):
+                        return False
             elif doc.get(key) != value:
                 return False
         return True
 
+    @staticmethod
+    def _comparable(value: Any) -> Any:
+        """Naive datetimes are UTC for MongoDB: make them comparable to aware ones."""
+        if isinstance(value, datetime.datetime) and value.tzinfo is None:
+            return value.replace(tzinfo=datetime.timezone.utc)
+        return value
+
+    _OPERATORS = {
+        "$gt": lambda a, b: a > b,
+        "$gte": lambda a, b: a >= b,
+        "$lt": lambda a, b: a < b,
+        "$lte": lambda a, b: a <= b,
+    }
+
     async def find_one(
         self,
         query: dict,
-        # Removed projection and sort parameters to match the new signature
+        projection: Optional[dict] = None,
     ) -> Optional[dict]:
         """
-        Finds a single document matching the query.
-        Projection and sort are no longer handled at this level for find_one.
+        Finds a single document matching the query, with optional projection.
         """
         for doc_id, doc in self.storage.items():
             if self._matches_filter(doc, query):
-                return copy.deepcopy(doc)
+                return MockCursor._apply_projection(copy.deepcopy(doc), projection)
         return None
 
     def find(
@@ -162,6 +219,12 @@ class FakeCollection:
 
         return MockCursor(filtered_results, projection)
 
+    async def count_documents(self, query: dict) -> int:
+        """Counts the documents matching the query."""
+        return sum(
+            1 for doc in self.storage.values() if self._matches_filter(doc, query)
+        )
+
     async def insert_one(self, doc: dict):
         """Inserts a single document."""
         _id = doc.get("_id", ObjectId())
@@ -203,15 +266,20 @@ class FakeCollection:
 
         return MockInsertManyResult(inserted_ids)
 
+    @staticmethod
+    def _changes(doc: dict, values: dict) -> bool:
+        return any(key not in doc or doc[key] != value for key, value in values.items())
+
     async def update_one(self, filter: dict, update: dict):
         """Updates a single document."""
         modified_count = 0
         for doc_id, doc in self.storage.items():
             if self._matches_filter(doc, filter):
                 if "$set" in update:
+                    # Comme MongoDB: un document déjà dans cet état n'est pas compté
+                    modified_count = int(self._changes(doc, update["$set"]))
                     doc.update(update["$set"])
-                    modified_count = 1
-                    break
+                break
 
         class MockUpdateResult:
             def __init__(self, modified_count):
@@ -219,14 +287,47 @@ class FakeCollection:
 
         return MockUpdateResult(modified_count)
 
+    async def find_one_and_update(
+        self,
+        filter: dict,
+        update: dict,
+        return_document: bool = False,
+        upsert: bool = False,
+    ) -> Optional[dict]:
+        """Updates a single document and returns it (after the update if return_document is True).
+        Supports $set and $inc, and $setOnInsert when upserting."""
+        for doc_id, doc in self.storage.items():
+            if self._matches_filter(doc, filter):
+                before = copy.deepcopy(doc)
+                if "$set" in update:
+                    doc.update(update["$set"])
+                for key, amount in update.get("$inc", {}).items():
+                    doc[key] = doc.get(key, 0) + amount
+                return copy.deepcopy(doc) if return_document else before
+        if not upsert:
+            return None
+        # Upsert: the new document starts from the equality fields of the filter
+        doc = {
+            key: value
+            for key, value in filter.items()
+            if not key.startswith("$") and not isinstance(value, dict)
+        }
+        doc.setdefault("_id", ObjectId())
+        doc.update(update.get("$setOnInsert", {}))
+        doc.update(update.get("$set", {}))
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        self.storage[str(doc["_id"])] = doc
+        return copy.deepcopy(doc) if return_document else None
+
     async def update_many(self, filter: dict, update: dict):
         """Updates multiple documents."""
         modified_count = 0
         for doc_id, doc in self.storage.items():
             if self._matches_filter(doc, filter):
                 if "$set" in update:
+                    modified_count += int(self._changes(doc, update["$set"]))
                     doc.update(update["$set"])
-                    modified_count += 1
 
         class MockUpdateResult:
             def __init__(self, modified_count):
@@ -271,6 +372,34 @@ class FakeCollection:
 
         return MockDeleteResult(deleted_count)
 
+    async def create_indexes(self, indexes: list) -> List[str]:
+        """Records the IndexModel documents (idempotent, like MongoDB)."""
+        names = []
+        for index in indexes:
+            document = dict(index.document)
+            self.indexes[document["name"]] = document
+            names.append(document["name"])
+        return names
+
+    async def index_information(self) -> Dict[str, dict]:
+        information = {"_id_": {"key": [("_id", 1)]}}
+        for name, document in self.indexes.items():
+            information[name] = {
+                "key": list(document["key"].items()),
+                **{k: v for k, v in document.items() if k not in ("key", "name")},
+            }
+        return information
+
+    def aggregate(self, pipeline: List[dict]) -> MockCursor:
+        """Only supports [{"$indexStats": {}}], reporting every index as never used."""
+        if pipeline != [{"$indexStats": {}}]:
+            raise NotImplementedError(
+                "FakeCollection.aggregate only supports $indexStats"
+            )
+        return MockCursor(
+            [{"name": name, "accesses": {"ops": 0}} for name in ["_id_", *self.indexes]]
+        )
+
 
 # --- FakeDB Class ---
 class FakeDB:
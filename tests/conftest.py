@@ -3,7 +3,12 @@ import pytest
 import pytest_asyncio
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pytest_mock import mocker
+from app.core.cache import AuthorizationCache, UserSnapshotCache
+from app.core.otp_store import ActiveOTPStore
+from app.core.rate_limiter import RateLimiter
+from app.core.role_graph import RoleGraphIndex
 from app.core.security import SecurityUtils
+from app.core.token_revocation import TokenRevocationList
 from app.db.repositories.otp_repository import OTPRepository
 from app.db.repositories.permission_repository import PermissionRepository
 from app.db.repositories.role_repository import RoleRepository
@@ -45,6 +50,13 @@ def shared_fake_db():
 def clean_db(shared_fake_db):
     """Nettoie la DB avant chaque test"""
     shared_fake_db.collections.clear()
+    # Les caches en mémoire survivent entre les tests, on les vide aussi
+    AuthorizationCache().invalidate()
+    RoleGraphIndex().reset()
+    TokenRevocationList().reset()
+    UserSnapshotCache().clear()
+    ActiveOTPStore().clear()
+    RateLimiter().reset()
     yield
     # Pas besoin de nettoyer après, le prochain test le fera
 
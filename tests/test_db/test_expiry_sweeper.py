@@ -0,0 +1,36 @@
+import datetime
+
+import pytest
+
+from app.core.expiry_sweeper import ExpirySweeper
+from app.db.mongo_collections import DBCollections
+from tests.common.fake_db import FakeDB
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_only_expired_documents():
+    db = FakeDB()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for name in (
+        DBCollections.TOKENS,
+        DBCollections.OTPS,
+        DBCollections.REVOKED_TOKENS,
+    ):
+        await db.get_collection(name).insert_many(
+            [
+                {"expires_at": now - datetime.timedelta(minutes=1)},
+                {"expires_at": now + datetime.timedelta(minutes=10)},
+            ]
+        )
+
+    sweeper = ExpirySweeper(db, interval_seconds=60)
+    deleted = await sweeper.sweep()
+
+    assert deleted == {"tokens": 1, "otps": 1, "revoked_tokens": 1}
+    for name in (
+        DBCollections.TOKENS,
+        DBCollections.OTPS,
+        DBCollections.REVOKED_TOKENS,
+    ):
+        assert len(db.get_collection(name).storage) == 1
+    assert sweeper.stats()["runs"] == 1
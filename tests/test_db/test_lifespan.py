@@ -0,0 +1,38 @@
+import pytest
+
+from app import main
+from app.db.mongo_collections import DBCollections
+from tests.common.fake_db import FakeDB
+
+
+class FakeMongoClient:
+    def __init__(self):
+        self.db = FakeDB()
+        self.warmed_connections = 0
+        self.closed = False
+
+    def get_db(self):
+        return self.db
+
+    async def warm_up(self, connections: int = 1):
+        self.warmed_connections = connections
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shares_and_closes_the_mongo_client(monkeypatch):
+    client = FakeMongoClient()
+    monkeypatch.setattr(main, "get_mongo_client", lambda: client)
+    # cache_clear est appelé à l'arrêt
+    main.get_mongo_client.cache_clear = lambda: None
+
+    async with main.lifespan(main.app):
+        assert client.warmed_connections == main.get_settings().mongo_min_pool_size
+        assert main.app.state.expiry_sweeper.stats()["running"]
+        users = await client.db.get_collection(DBCollections.USERS).index_information()
+        assert "email_unique" in users
+
+    assert client.closed
+    assert not main.app.state.expiry_sweeper.stats()["running"]
@@ -0,0 +1,36 @@
+import pytest
+
+from app.db.mongo_collections import DBCollections
+from app.db.mongo_indexes import MONGO_INDEXES, ensure_indexes, verify_indexes
+from tests.common.fake_db import FakeDB
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_is_idempotent():
+    db = FakeDB()
+    first = await ensure_indexes(db)
+    second = await ensure_indexes(db)
+    assert first == second
+    assert first["errors"] == []
+    assert "email_unique" in first[DBCollections.USERS]
+
+    users_indexes = await db.get_collection(DBCollections.USERS).index_information()
+    assert users_indexes["email_unique"]["unique"] is True
+
+
+@pytest.mark.asyncio
+async def test_verify_indexes_reports_missing_and_unexpected():
+    db = FakeDB()
+    report = await verify_indexes(db)
+    assert set(report["missing"]) == set(MONGO_INDEXES)
+
+    await ensure_indexes(db)
+    roles = db.get_collection(DBCollections.ROLES)
+    roles.indexes["legacy_description"] = {
+        "name": "legacy_description",
+        "key": {"description": 1},
+    }
+    report = await verify_indexes(db)
+    assert report["missing"] == {}
+    assert report["unexpected"] == {DBCollections.ROLES: ["legacy_description"]}
+    assert "name_unique" in report["unused"][DBCollections.ROLES]
@@ -0,0 +1,68 @@
+import pytest
+
+from app.db.mongo_collections import DBCollections
+from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.role_repository import RoleRepository
+from app.db.repositories.user_repository import UserRepository
+from app.models.role import PermissionModel, RoleModel
+from app.models.user import UserModel
+from app.utils.db_utils.mongo_utils import MongoCollectionOperations
+from tests.common.fake_db import FakeDB
+
+
+@pytest.mark.asyncio
+async def test_iter_many_yields_projected_sorted_documents():
+    db = FakeDB()
+    ops = MongoCollectionOperations(db, DBCollections.ROLES)
+    await ops.insert_many(
+        [{"name": name, "rank": rank} for rank, name in enumerate("cab")]
+    )
+
+    iterator = ops.iter_many(
+        {"rank": {"$gte": 1}}, projection={"name": 1}, sort={"name": 1}, batch_size=1
+    )
+    docs = [doc async for doc in iterator]
+
+    assert [doc["name"] for doc in docs] == ["a", "b"]
+    assert all(set(doc) == {"_id", "name"} for doc in docs)
+
+
+@pytest.mark.asyncio
+async def test_iter_roles_matches_list_roles():
+    repos = RoleRepository(FakeDB())
+    for name in ("admin", "user"):
+        await repos.create(RoleModel(name=name))
+
+    streamed = [role.name async for role in repos.iter_roles(batch_size=1)]
+
+    assert sorted(streamed) == sorted(role.name for role in await repos.list_roles())
+
+
+@pytest.mark.asyncio
+async def test_projected_reads_return_only_requested_fields():
+    db = FakeDB()
+    roles = RoleRepository(db)
+    permissions = PermissionRepository(db)
+    users = UserRepository(db)
+    for name in ("admin", "user"):
+        await roles.create(RoleModel(name=name, permissions=["user:read"]))
+    await permissions.create(
+        PermissionModel(code="user:read", description="Read users")
+    )
+    user_id = await users.create(
+        UserModel(
+            email="jane@example.com",
+            password="hashed",
+            first_name="Jane",
+            last_name="Doe",
+        )
+    )
+
+    assert await roles.find_existing_names(["admin", "ghost"]) == {"admin"}
+    assert await permissions.find_existing_codes(["user:read", "x"]) == {"user:read"}
+    assert await users.find_id_by_email("jane@example.com") == user_id
+    assert await users.find_id_by_email("unknown@example.com") is None
+    doc = await MongoCollectionOperations(db, DBCollections.USERS).find_one(
+        {"email": "jane@example.com"}, projection={"password": 0}
+    )
+    assert "password" not in doc and doc["first_name"] == "Jane"
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+from app.core.email_templates import CompiledTemplate, EmailTemplateRegistry
+
+
+def test_compiled_template_renders_in_one_pass():
+    template = CompiledTemplate(
+        "<p>Bonjour {{ name }}, code {{ code }} ({{ name }}) {{ unknown }}</p>"
+    )
+
+    assert template.variables == ["name", "code", "name", "unknown"]
+    assert (
+        template.render({"name": "Alice", "code": 123456})
+        == "<p>Bonjour Alice, code 123456 (Alice) {{ unknown }}</p>"
+    )
+
+
+def test_registry_compiles_templates_once_and_reloads_when_enabled(tmp_path):
+    registry = EmailTemplateRegistry()
+    directory, auto_reload = registry.directory, registry.auto_reload
+    template_path = tmp_path / "welcome.html"
+    template_path.write_text("Hello {{ name }}", encoding="utf-8")
+    registry.directory = str(tmp_path)
+    registry.clear()
+    try:
+        assert registry.preload() == ["welcome.html"]
+        compiled = registry.get("welcome.html")
+
+        template_path.write_text("Bye {{ name }}", encoding="utf-8")
+        os.utime(template_path, (0, compiled.mtime + 10))
+        # Sans rechargement, le template compilé reste en cache
+        registry.auto_reload = False
+        assert registry.render("welcome.html", {"name": "Bob"}) == "Hello Bob"
+
+        registry.auto_reload = True
+        assert registry.render("welcome.html", {"name": "Bob"}) == "Bye Bob"
+
+        with pytest.raises(FileNotFoundError):
+            registry.render("missing.html", {})
+    finally:
+        registry.directory, registry.auto_reload = directory, auto_reload
+        registry.clear()
+
+
+def test_otp_template_is_available():
+    html = EmailTemplateRegistry().render(
+        "otp_verification.html", {"otp_code": "424242", "user_first_name": "Alice"}
+    )
+
+    assert "424242" in html and "{{ otp_code }}" not in html
@@ -0,0 +1,122 @@
+import datetime
+import smtplib
+
+import pytest
+
+from app.core.mail_queue import MailQueueWorker
+from app.db.repositories.mail_queue_repository import MailQueueRepository
+from app.models.mail import MailStatusEnum
+from app.providers.providers import get_settings
+from app.services.email_service import EmailService
+
+
+class FlakyEmailService(EmailService):
+    """EmailService dont l'envoi SMTP échoue pour les destinataires listés."""
+
+    def __init__(self, settings, mail_queue_repos, failing_recipients=()):
+        super().__init__(settings=settings, mail_queue_repos=mail_queue_repos)
+        self.failing_recipients = set(failing_recipients)
+        self.batches = []
+
+    async def send_batch(self, messages):
+        self.batches.append([message.recipient_email for message in messages])
+        return [
+            (
+                smtplib.SMTPRecipientsRefused({message.recipient_email: (550, b"")})
+                if message.recipient_email in self.failing_recipients
+                else None
+            )
+            for message in messages
+        ]
+
+
+@pytest.mark.asyncio
+async def test_enqueued_emails_are_sent_in_one_batch(shared_fake_db):
+    settings = get_settings()
+    repos = MailQueueRepository(shared_fake_db)
+    email_service = FlakyEmailService(settings, repos)
+    for i in range(3):
+        await email_service.enqueue_email(f"user{i}@example.com", "Subject", "Body")
+
+    worker = MailQueueWorker(shared_fake_db, email_service, settings)
+    assert await worker.process_batch() == 3
+
+    assert email_service.batches == [
+        ["user0@example.com", "user1@example.com", "user2@example.com"]
+    ]
+    assert (await repos.count_by_status())[MailStatusEnum.SENT.value] == 3
+    stats = await worker.stats()
+    assert stats["sent"] == 3
+    assert stats["depth"][MailStatusEnum.PENDING.value] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_email_is_retried_with_backoff(shared_fake_db):
+    settings = get_settings()
+    repos = MailQueueRepository(shared_fake_db)
+    email_service = FlakyEmailService(
+        settings, repos, failing_recipients=["bounce@example.com"]
+    )
+    message_id = await email_service.enqueue_email(
+        "bounce@example.com", "Subject", "Body"
+    )
+    worker = MailQueueWorker(shared_fake_db, email_service, settings)
+
+    assert await worker.process_batch() == 1
+    message = await repos.find_by_id(message_id)
+    assert message.status == MailStatusEnum.PENDING
+    assert message.attempts == 1
+    assert message.last_error
+    # Replanifié dans le futur: pas repris immédiatement
+    assert await worker.process_batch() == 0
+    assert worker.retried == 1
+
+
+@pytest.mark.asyncio
+async def test_claim_batch_reserves_disjoint_batches_in_one_update(
+    shared_fake_db, mocker
+):
+    repos = MailQueueRepository(shared_fake_db)
+    email_service = FlakyEmailService(get_settings(), repos)
+    for i in range(5):
+        await email_service.enqueue_email(f"user{i}@example.com", "Subject", "Body")
+    update_many = mocker.spy(repos._db_ops, "update_many")
+    find_one_and_update = mocker.spy(repos._db_ops, "find_one_and_update")
+
+    first = await repos.claim_batch(limit=3, lease_seconds=60)
+    second = await repos.claim_batch(limit=3, lease_seconds=60)
+
+    assert (len(first), len(second)) == (3, 2)
+    assert not {m.id for m in first} & {m.id for m in second}
+    assert all(m.status == MailStatusEnum.SENDING for m in first + second)
+    assert update_many.call_count == 2
+    assert find_one_and_update.call_count == 0
+    assert await repos.claim_batch(limit=3, lease_seconds=60) == []
+
+
+@pytest.mark.asyncio
+async def test_sent_and_failed_emails_expire(shared_fake_db, monkeypatch):
+    settings = get_settings()
+    repos = MailQueueRepository(shared_fake_db)
+    email_service = FlakyEmailService(
+        settings, repos, failing_recipients=["bounce@example.com"]
+    )
+    sent_id = await email_service.enqueue_email("ok@example.com", "Subject", "Body")
+    failed_id = await email_service.enqueue_email(
+        "bounce@example.com", "Subject", "Body"
+    )
+    worker = MailQueueWorker(shared_fake_db, email_service, settings)
+    monkeypatch.setattr(worker, "max_attempts", 1)
+
+    assert await worker.process_batch() == 2
+
+    retention = datetime.timedelta(seconds=settings.mail_queue_retention_seconds)
+    for message_id, status in (
+        (sent_id, MailStatusEnum.SENT),
+        (failed_id, MailStatusEnum.FAILED),
+    ):
+        message = await repos.find_by_id(message_id)
+        assert message.status == status
+        assert message.lease_token is None
+        remaining = message.expires_at - datetime.datetime.now(datetime.timezone.utc)
+        assert retention - datetime.timedelta(minutes=1) < remaining <= retention
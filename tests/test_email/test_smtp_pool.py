@@ -0,0 +1,100 @@
+import smtplib
+
+import pytest
+
+from app.core.smtp_pool import SMTPConnectionPool
+
+
+class FakeSMTP:
+    instances = []
+    starttls_fails = False
+
+    def __init__(self, host, port):
+        self.sent = []
+        self.logins = 0
+        self.quit_called = False
+        self.disconnect_next = False
+        self.starttls_fails = FakeSMTP.starttls_fails
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self, context=None):
+        if self.starttls_fails:
+            raise smtplib.SMTPNotSupportedError("STARTTLS extension not supported")
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def sendmail(self, sender, recipient, message):
+        if self.disconnect_next:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(recipient)
+
+    def noop(self):
+        return (250, b"OK")
+
+    def quit(self):
+        self.quit_called = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    FakeSMTP.starttls_fails = False
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    return FakeSMTP
+
+
+def make_pool(**kwargs) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        host="smtp.example.com",
+        port=587,
+        username="user",
+        password="password",
+        use_tls=True,
+        **kwargs,
+    )
+
+
+def test_connection_is_reused_between_messages(fake_smtp):
+    pool = make_pool()
+    for i in range(3):
+        pool.send("noreply@example.com", f"user{i}@example.com", "message")
+
+    assert len(fake_smtp.instances) == 1
+    assert fake_smtp.instances[0].logins == 1
+    assert pool.stats()["connections_reused"] == 2
+
+
+def test_connection_is_renewed_after_max_messages(fake_smtp):
+    pool = make_pool(max_messages_per_connection=2)
+    for i in range(3):
+        pool.send("noreply@example.com", f"user{i}@example.com", "message")
+
+    assert len(fake_smtp.instances) == 2
+    assert fake_smtp.instances[0].quit_called
+
+
+def test_send_reconnects_after_server_disconnect(fake_smtp):
+    pool = make_pool()
+    pool.send("noreply@example.com", "first@example.com", "message")
+    fake_smtp.instances[0].disconnect_next = True
+
+    pool.send("noreply@example.com", "second@example.com", "message")
+
+    assert len(fake_smtp.instances) == 2
+    assert fake_smtp.instances[1].sent == ["second@example.com"]
+    assert pool.stats()["reconnects"] == 1
+
+
+def test_socket_is_closed_when_starttls_fails(fake_smtp):
+    fake_smtp.starttls_fails = True
+    pool = make_pool()
+
+    with pytest.raises(smtplib.SMTPNotSupportedError):
+        pool.send("noreply@example.com", "user@example.com", "message")
+
+    assert fake_smtp.instances[0].closed
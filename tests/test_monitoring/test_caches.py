@@ -0,0 +1,59 @@
+from app.core.cache import TTLCache, UserSnapshotCache
+from app.models.user import UserModel
+
+
+def _user() -> UserModel:
+    return UserModel(
+        email="jdoe@example.com",
+        password="hashed",
+        first_name="John",
+        last_name="Doe",
+        roles=["user"],
+    )
+
+
+def test_user_cache_read_schema_does_not_count_hits():
+    cache = UserSnapshotCache()
+    user = _user()
+    cache.set(user)
+
+    cached_user = cache.get(user.id)
+    schema = cache.read_schema(cached_user)
+    cache.read_schema(cached_user)
+
+    assert schema.email == user.email
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+
+
+def test_user_cache_returns_copies():
+    cache = UserSnapshotCache()
+    user = _user()
+    cache.set(user)
+
+    # Ni l'objet enregistré ni l'objet rendu ne partagent l'entrée du cache
+    user.roles.append("admin")
+    cached_user = cache.get(user.id)
+    cached_user.roles.append("superadmin")
+    cache.read_schema(cached_user).roles.append("superadmin")
+
+    assert cache.get(user.id).roles == ["user"]
+    assert cache.read_schema(cache.get(user.id)).roles == ["user"]
+    # Un utilisateur modifié est revalidé au lieu de reprendre le schéma en cache
+    assert cache.read_schema(cached_user).roles == ["user", "superadmin"]
+
+
+def test_ttl_cache_contains_has_no_side_effects():
+    now = [0.0]
+    cache = TTLCache(ttl_seconds=10, max_entries=2, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert "a" in cache and "missing" not in cache
+    assert (cache.hits, cache.misses) == (0, 0)
+    # "a" n'a pas été remonté dans l'ordre LRU: c'est lui qui est évincé
+    cache.set("c", 3)
+    assert "a" not in cache and "b" in cache
+
+    now[0] = 10
+    assert "b" not in cache
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.core.security import PasswordHashingPool, SecurityUtils
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_event_loop():
+    pool = PasswordHashingPool()
+    pool.reset_stats()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker_task = asyncio.create_task(ticker())
+    hashes = await asyncio.gather(
+        *(SecurityUtils.hash_password_async(f"password{i}") for i in range(4))
+    )
+    ticker_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await ticker_task
+
+    assert ticks > 1
+    assert await SecurityUtils.verify_password_async("password0", hashes[0])
+    assert not await SecurityUtils.verify_password_async("wrong", hashes[0])
+    stats = pool.stats()
+    assert stats["completed"] == 6
+    assert stats["in_flight"] == 0
+
+
+def test_unknown_password_hash_executor_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings(PASSWORD_HASH_EXECUTOR="processes")
+
+
+@pytest.mark.asyncio
+async def test_get_metrics(bypass_role_async_client: AsyncClient):
+    response = await bypass_role_async_client.get("/metrics/")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"password_hashing", "authorization_cache", "user_cache"} <= data.keys()
+    assert data["password_hashing"]["max_workers"] >= 1
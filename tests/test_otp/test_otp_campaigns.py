@@ -0,0 +1,150 @@
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from app.db.repositories.otp_campaign_repository import OTPCampaignRepository
+from app.db.repositories.otp_repository import OTPRepository
+from app.db.repositories.user_repository import UserRepository
+from app.models.user import UserModel
+from app.providers.providers import get_settings
+from app.schemas.otp_schema import (
+    OTPCampaignRequestSchema,
+    OTPRequestSchema,
+    OTPVerifySchema,
+)
+from app.services.auth.otp_service import OTPService
+
+
+async def _create_users(db, count: int, is_verified: bool = False):
+    user_repos = UserRepository(db)
+    for i in range(count):
+        await user_repos.create(
+            UserModel(
+                email=f"user{i}-{is_verified}@example.com",
+                first_name=f"User{i}",
+                last_name="Campaign",
+                password="hashed",
+                is_verified=is_verified,
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_run_campaign_issues_otps_in_chunks(shared_fake_db, mock_email_service):
+    """
+    Teste l'envoi groupé: un insert_many d'OTP et une mise en file par lot.
+    """
+    await _create_users(shared_fake_db, 5)
+    await _create_users(shared_fake_db, 2, is_verified=True)
+    otp_service = OTPService(
+        otp_repos=OTPRepository(shared_fake_db),
+        user_repos=UserRepository(shared_fake_db),
+        email_service=mock_email_service,
+        settings=get_settings(),
+        campaign_repos=OTPCampaignRepository(shared_fake_db),
+    )
+    otp_service.campaign_chunk_size = 2
+
+    campaign = await otp_service.create_campaign(
+        OTPCampaignRequestSchema(is_verified=False)
+    )
+    assert (campaign.status, campaign.total, campaign.processed) == ("pending", 5, 0)
+
+    await otp_service.run_campaign(campaign.campaign_id)
+
+    campaign = await otp_service.get_campaign(campaign.campaign_id)
+    assert (campaign.status, campaign.processed, campaign.progress) == (
+        "completed",
+        5,
+        100.0,
+    )
+    batches = [
+        call.args[0] for call in mock_email_service.enqueue_emails.call_args_list
+    ]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    recipients = {message.recipient_email for batch in batches for message in batch}
+    assert recipients == {f"user{i}-False@example.com" for i in range(5)}
+    codes = {otp.email: otp.code for otp in await otp_service.otp_repos.list_otps()}
+    assert len(codes) == 5
+    assert all(
+        codes[message.recipient_email] in message.body
+        for batch in batches
+        for message in batch
+    )
+
+
+@pytest.mark.asyncio
+async def test_campaign_endpoints(
+    bypass_role_async_client: AsyncClient, shared_fake_db
+):
+    await _create_users(shared_fake_db, 3)
+
+    response = await bypass_role_async_client.post(
+        "/otp/campaigns", json={"is_verified": False}
+    )
+    assert response.status_code == 202
+    campaign_id = response.json()["campaign_id"]
+
+    # La campagne s'exécute en tâche de fond après la réponse
+    response = await bypass_role_async_client.get(f"/otp/campaigns/{campaign_id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["processed"] == 3
+    assert await shared_fake_db.get_collection("mail_queue").count_documents({}) == 3
+
+
+@pytest.mark.asyncio
+async def test_verified_user_redeems_campaign_code(shared_fake_db, mock_email_service):
+    """
+    Teste qu'un utilisateur déjà vérifié ciblé par la campagne peut utiliser son code.
+    """
+    await _create_users(shared_fake_db, 1, is_verified=True)
+    otp_service = OTPService(
+        otp_repos=OTPRepository(shared_fake_db),
+        user_repos=UserRepository(shared_fake_db),
+        email_service=mock_email_service,
+        settings=get_settings(),
+        campaign_repos=OTPCampaignRepository(shared_fake_db),
+    )
+    email = "user0-True@example.com"
+
+    campaign = await otp_service.create_campaign(
+        OTPCampaignRequestSchema(is_verified=True)
+    )
+    await otp_service.run_campaign(campaign.campaign_id)
+    # La campagne ne touche pas au statut des utilisateurs
+    assert (await otp_service.user_repos.find_by_email(email)).is_verified is True
+
+    (otp,) = await otp_service.otp_repos.list_otps()
+    assert otp.campaign_id == campaign.campaign_id
+    response = await otp_service.verify_otp(OTPVerifySchema(email=email, code=otp.code))
+
+    assert response.user.is_verified is True
+    assert (await otp_service.user_repos.find_by_email(email)).is_verified is True
+
+
+@pytest.mark.asyncio
+async def test_campaign_with_empty_filter_is_rejected(
+    bypass_role_async_client: AsyncClient, shared_fake_db
+):
+    await _create_users(shared_fake_db, 1, is_verified=True)
+
+    response = await bypass_role_async_client.post("/otp/campaigns", json={})
+
+    assert response.status_code == 400
+    assert await shared_fake_db.get_collection("otp_campaigns").count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_individual_code_for_verified_user_is_rejected(
+    otp_service: OTPService, shared_fake_db
+):
+    await _create_users(shared_fake_db, 1, is_verified=True)
+    email = "user0-True@example.com"
+    await otp_service.request_otp(OTPRequestSchema(email=email))
+
+    (otp,) = await otp_service.otp_repos.list_otps()
+    with pytest.raises(HTTPException) as exc_info:
+        await otp_service.verify_otp(OTPVerifySchema(email=email, code=otp.code))
+
+    assert exc_info.value.status_code == 409
@@ -1,6 +1,15 @@
+import datetime
+from datetime import timedelta
+from io import BytesIO
+
 import pytest
 from httpx import AsyncClient
 from fastapi import status
+from PIL import Image
+
+from app.db.repositories.otp_repository import OTPRepository
+from app.models.otp import OTPModel
+from app.utils.image_utils import _render_countdown_gif, _render_countdown_image
 
 
 @pytest.mark.asyncio
@@ -171,3 +180,90 @@ async def test_verify_otp_expired(
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.json()["detail"].startswith("OTP has expired")
 """
+
+
+@pytest.mark.asyncio
+async def test_countdown_image_frames_are_cached(async_client: AsyncClient):
+    """
+    Teste que les images du compte à rebours ne sont générées qu'une seule fois.
+    """
+    _render_countdown_image.cache_clear()
+    url = "/otp/countdown-image/65b3c4d5e6f7a8b9c0d1e2f3"
+
+    first = await async_client.get(url)
+    second = await async_client.get(url)
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert first.headers["content-type"] == "image/png"
+    assert first.content == second.content
+    cache_info = _render_countdown_image.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_countdown_gif_covers_remaining_lifetime(
+    async_client: AsyncClient, shared_fake_db
+):
+    """
+    Teste le GIF animé: une image par seconde restante (arrondie à 10 s) jusqu'à
+    "00:00", réutilisé par les requêtes suivantes.
+    """
+    otp_id = await OTPRepository(shared_fake_db).create(
+        OTPModel(
+            email="test@example.com",
+            code="123456",
+            expires_at=datetime.datetime.utcnow()
+            + timedelta(seconds=15, milliseconds=500),
+        )
+    )
+
+    response = await async_client.get(f"/otp/countdown-image/{otp_id}?format=gif")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "image/gif"
+    assert "no-store" in response.headers["cache-control"]
+    # 15 s restantes, arrondies à 10 s: de "00:10" à "00:00"
+    assert Image.open(BytesIO(response.content)).n_frames == 11
+    cache_info = _render_countdown_gif.cache_info()
+    response = await async_client.get(f"/otp/countdown-image/{otp_id}?format=gif")
+    assert _render_countdown_gif.cache_info().hits == cache_info.hits + 1
+
+    # OTP inconnu: image "00:00" figée, qui peut être mise en cache
+    response = await async_client.get(
+        "/otp/countdown-image/65b3c4d5e6f7a8b9c0d1e2f3?format=gif"
+    )
+    assert response.headers["cache-control"] == "public, max-age=86400"
+    assert Image.open(BytesIO(response.content)).n_frames == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("image_format", ["png", "gif"])
+async def test_countdown_image_for_requested_otp(
+    async_client: AsyncClient, override_otp_service_dependency, image_format
+):
+    """
+    Teste l'image du lien de l'e-mail juste après `request_otp` (OTP lu depuis le
+    store en mémoire, avec une date d'expiration qui porte un fuseau).
+    """
+    await async_client.post(
+        "/users/",
+        json={
+            "first_name": "Alice",
+            "last_name": "Borderland",
+            "email": "alice@example.com",
+            "password": "secret123",
+            "phone_number": "90000000",
+        },
+    )
+    response = await async_client.post(
+        "/otp/request", json={"email": "alice@example.com"}
+    )
+    otp_id = response.json()["otp_id"]
+
+    response = await async_client.get(
+        f"/otp/countdown-image/{otp_id}", params={"format": image_format}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == f"image/{image_format}"
+    assert "no-store" in response.headers["cache-control"]
@@ -1,7 +1,14 @@
+import asyncio
+import datetime
+
 import pytest
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
+from app.core.config import Settings
+from app.core.otp_store import ActiveOTPStore
 from app.db.repositories.permission_repository import PermissionRepository
+from app.models.otp import OTPModel
 from app.db.repositories.role_repository import RoleRepository
 from app.schemas.user_schema import UserCreateSchema
 from app.services.auth.otp_service import OTPService
@@ -185,3 +192,103 @@ async def test_verify_otp_with_inexistant_user(
 
     assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
     assert exc_info.value.detail.startswith("User with this email not found")
+
+
+@pytest.mark.asyncio
+async def test_active_otp_served_from_store_until_used(
+    otp_service: OTPService, user_service: UserService
+):
+    """
+    Teste que l'OTP émis est lu depuis le store en mémoire, puis retiré une fois utilisé.
+    """
+    user_data = UserCreateSchema(
+        first_name="John",
+        last_name="Doe",
+        email="test@gmail.com",
+        password="secret",
+        phone_number="90000000",
+    )
+    await user_service.create_user(user_data)
+    response = await otp_service.request_otp(OTPRequestSchema(email="test@gmail.com"))
+
+    store = ActiveOTPStore()
+    otp = await otp_service.otp_repos.find_by_id(response.otp_id)
+    assert otp.email == "test@gmail.com"
+    assert store.stats()["hits"] == 1
+
+    verify_schema = OTPVerifySchema(email="test@gmail.com", code=otp.code)
+    verified = await otp_service.verify_otp(verify_schema)
+    assert verified.otp.is_used is True
+    assert store.get_by_id(response.otp_id) is None
+
+    # Le store ne contient plus l'OTP: la base indique qu'il a été utilisé
+    with pytest.raises(HTTPException) as exc_info:
+        await otp_service.verify_otp(verify_schema)
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert await otp_service.otp_repos.mark_as_used(response.otp_id) == 0
+
+
+def test_unknown_otp_store_backend_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings(OTP_STORE_BACKEND="memroy")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_verifications_consume_otp_once(
+    otp_service: OTPService, user_service: UserService
+):
+    """
+    Teste que deux vérifications concurrentes du même code ne réussissent pas toutes les deux.
+    """
+    user_data = UserCreateSchema(
+        first_name="John",
+        last_name="Doe",
+        email="test@gmail.com",
+        password="secret",
+        phone_number="90000000",
+    )
+    await user_service.create_user(user_data)
+    response = await otp_service.request_otp(OTPRequestSchema(email="test@gmail.com"))
+    otp = await otp_service.otp_repos.find_by_id(response.otp_id)
+    verify_schema = OTPVerifySchema(email="test@gmail.com", code=otp.code)
+
+    results = await asyncio.gather(
+        otp_service.verify_otp(verify_schema),
+        otp_service.verify_otp(verify_schema),
+        return_exceptions=True,
+    )
+
+    errors = [result for result in results if isinstance(result, HTTPException)]
+    assert len(errors) == 1
+    assert errors[0].status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_verify_otp_expired_is_not_consumed(
+    otp_service: OTPService, user_service: UserService, otp_repo
+):
+    """
+    Teste qu'un OTP expiré n'est pas consommé et que l'erreur le précise.
+    """
+    user_data = UserCreateSchema(
+        first_name="John",
+        last_name="Doe",
+        email="test@gmail.com",
+        password="secret",
+        phone_number="90000000",
+    )
+    await user_service.create_user(user_data)
+    await otp_repo.create(
+        OTPModel(
+            email="test@gmail.com",
+            code="654321",
+            expires_at=datetime.datetime.utcnow() - datetime.timedelta(minutes=1),
+        )
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        await otp_service.verify_otp(
+            OTPVerifySchema(email="test@gmail.com", code="654321")
+        )
+
+    assert exc_info.value.detail == "OTP has expired."
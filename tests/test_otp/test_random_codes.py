@@ -0,0 +1,83 @@
+from collections import Counter
+
+import pytest
+
+from app.core.random_codes import (
+    PASSWORD_CHARACTERS,
+    generate_numeric_code,
+    generate_numeric_codes,
+    generate_password,
+)
+from app.core.security import SecurityUtils
+from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.role_repository import RoleRepository
+from app.db.repositories.user_repository import UserRepository
+from app.schemas.otp_schema import OTPRequestSchema
+from app.schemas.user_schema import UserCreateSchema
+from app.services.auth.otp_service import OTPService
+from app.services.auth.user_service import UserService
+
+
+@pytest.fixture
+def user_service(shared_fake_db):
+    return UserService(
+        user_repo=UserRepository(shared_fake_db),
+        role_repos=RoleRepository(shared_fake_db),
+        permission_repos=PermissionRepository(shared_fake_db),
+    )
+
+
+def test_generate_numeric_code_is_zero_padded_and_skips_excluded_codes():
+    # Seul "1" reste disponible sur un chiffre
+    excluded = {str(digit) for digit in range(10) if digit != 1}
+
+    assert generate_numeric_code(1, exclude=excluded) == "1"
+    for _ in range(200):
+        code = generate_numeric_code(6)
+        assert len(code) == 6 and code.isdigit()
+
+
+@pytest.mark.parametrize("length", [1, 6, 19, 24])
+def test_generate_numeric_codes_returns_count_codes_of_length(length):
+    codes = generate_numeric_codes(500, length)
+
+    assert len(codes) == 500
+    assert all(len(code) == length and code.isdigit() for code in codes)
+
+
+def test_generate_numeric_codes_covers_every_digit():
+    counts = Counter(generate_numeric_codes(10000, 1))
+
+    assert set(counts) == {str(digit) for digit in range(10)}
+    # ~1000 tirages attendus par chiffre
+    assert all(600 < count < 1400 for count in counts.values())
+
+
+def test_generate_password_uses_password_characters():
+    password = generate_password(32)
+
+    assert len(password) == 32
+    assert set(password) <= set(PASSWORD_CHARACTERS)
+    assert len(SecurityUtils.generate_random_password(16)) == 16
+
+
+@pytest.mark.asyncio
+async def test_request_otp_never_reuses_an_active_code(
+    otp_service: OTPService, user_service: UserService, monkeypatch
+):
+    await user_service.create_user(
+        UserCreateSchema(
+            first_name="John",
+            last_name="Doe",
+            email="test@gmail.com",
+            password="secret",
+            phone_number="90000000",
+        )
+    )
+    monkeypatch.setattr(otp_service, "otp_length", 1)
+
+    for _ in range(10):
+        await otp_service.request_otp(OTPRequestSchema(email="test@gmail.com"))
+
+    active_codes = await otp_service.otp_repos.find_active_codes(["test@gmail.com"])
+    assert active_codes["test@gmail.com"] == {str(digit) for digit in range(10)}
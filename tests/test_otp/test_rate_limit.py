@@ -0,0 +1,103 @@
+import pytest
+from fastapi import HTTPException, status
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.core import rate_limiter as rate_limiter_module
+from app.core.config import Settings
+from app.core.rate_limiter import RateLimiter, parse_rate
+from app.db.repositories.rate_limit_repository import RateLimitRepository
+
+
+def test_parse_rate():
+    assert parse_rate("5/300") == (5, 300.0)
+    assert parse_rate("0") is None
+    assert parse_rate("") is None
+
+
+@pytest.mark.parametrize("value", ["abc", "5/0", "-1/60", "5/abc"])
+def test_invalid_rate_is_rejected_by_settings(value):
+    with pytest.raises(ValueError):
+        parse_rate(value)
+    with pytest.raises(ValidationError):
+        Settings(RATE_LIMIT_LOGIN_IP=value)
+
+
+def test_unknown_rate_limit_backend_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings(RATE_LIMIT_BACKEND="mongodb")
+
+
+@pytest.mark.asyncio
+async def test_ip_rejection_does_not_consume_email_token(monkeypatch):
+    limiter = RateLimiter()
+    monkeypatch.setitem(limiter.limits, ("login", "ip"), (1, 60))
+    monkeypatch.setitem(limiter.limits, ("login", "email"), (2, 60))
+
+    await limiter.check("login", email="a@example.com", ip="1.1.1.1")
+    with pytest.raises(HTTPException):
+        await limiter.check("login", email="a@example.com", ip="1.1.1.1")
+
+    # Le refus par IP n'a pas entamé la limite de l'e-mail
+    await limiter.check("login", email="a@example.com", ip="2.2.2.2")
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_keys(monkeypatch):
+    limiter = RateLimiter()
+    monkeypatch.setattr(rate_limiter_module, "_MAX_TRACKED_KEYS", 3)
+    monkeypatch.setitem(limiter.limits, ("login", "email"), (1, 60))
+
+    for email in ("a@example.com", "b@example.com", "c@example.com"):
+        await limiter.check("login", email=email)
+    # "a" est le plus récemment utilisé: "b" est évincé à l'ajout de "d"
+    with pytest.raises(HTTPException):
+        await limiter.check("login", email="a@example.com")
+    await limiter.check("login", email="d@example.com")
+
+    assert limiter.stats()["tracked_keys"] == 3
+    await limiter.check("login", email="b@example.com")
+    with pytest.raises(HTTPException):
+        await limiter.check("login", email="a@example.com")
+
+
+@pytest.mark.asyncio
+async def test_otp_request_is_limited_per_email(
+    async_client: AsyncClient, override_otp_service_dependency
+):
+    """
+    Teste qu'au-delà de la limite par e-mail, /otp/request répond 429.
+    """
+    limit, _ = RateLimiter().limits[("otp_request", "email")]
+    payload = {"email": "unknown@example.com"}
+    for _ in range(limit):
+        response = await async_client.post("/otp/request", json=payload)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await async_client.post("/otp/request", json=payload)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) > 0
+    # Un autre e-mail n'est pas concerné par la limite
+    response = await async_client.post(
+        "/otp/request", json={"email": "other@example.com"}
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert RateLimiter().stats()["limited"] == {"otp_request": 1}
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_counts_in_mongo(shared_fake_db, monkeypatch):
+    limiter = RateLimiter()
+    monkeypatch.setattr(limiter, "backend", "mongo")
+    monkeypatch.setitem(limiter.limits, ("login", "email"), (2, 60))
+    repos = RateLimitRepository(shared_fake_db)
+
+    for _ in range(2):
+        await limiter.check("login", email="a@example.com", rate_limit_repos=repos)
+    with pytest.raises(HTTPException) as exc_info:
+        await limiter.check("login", email="a@example.com", rate_limit_repos=repos)
+
+    assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert limiter.stats()["tracked_keys"] == 0
+    assert await shared_fake_db.get_collection("rate_limits").count_documents({}) == 1
@@ -130,3 +130,64 @@ async def test_get_all__ensure_has_permissions(permission_service, role_service)
     assert len(perms) == 2
     assert "users:read" in perms
     assert "users:delete" in perms
+
+
+@pytest.mark.asyncio
+async def test_get_all_permissions_is_cached(permission_service, role_service, mocker):
+    await permission_service.create_permission(
+        PermissionCreateSchema(
+            code="users:read", description="Permission to read users"
+        )
+    )
+    await role_service.create_role(
+        RoleCreateSchema(name="user", permissions=["users:read"])
+    )
+    user = UserReadSchema(
+        id="test_user_id",
+        first_name="Test",
+        last_name="User",
+        email="test@gmail.com",
+        roles=["user"],
+    )
+    iter_roles = mocker.spy(permission_service.role_repos, "iter_roles")
+    find_by_code = mocker.spy(permission_service.permission_repos, "find_by_code")
+
+    assert await permission_service.ensure_permission(user, "users:read") is True
+    assert await permission_service.ensure_permission(user, "users:read") is True
+
+    # La seconde vérification est servie par le cache
+    assert iter_roles.call_count == 1
+    assert find_by_code.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_permission_cache_invalidated_on_role_update(
+    permission_service, role_service
+):
+    await permission_service.create_permission(
+        PermissionCreateSchema(
+            code="users:read", description="Permission to read users"
+        )
+    )
+    await permission_service.create_permission(
+        PermissionCreateSchema(code="users:update", description="Update users")
+    )
+    role = await role_service.create_role(
+        RoleCreateSchema(name="user", permissions=["users:read"])
+    )
+    user = UserReadSchema(
+        id="test_user_id",
+        first_name="Test",
+        last_name="User",
+        email="test@gmail.com",
+        roles=["user"],
+    )
+    assert not await permission_service.has_permission(user, "users:update")
+
+    await role_service.add_permissions_to_role(
+        role_id=role.id, permissions_to_add=["users:update"]
+    )
+    assert await permission_service.has_permission(user, "users:update")
+
+    await role_service.delete_role(role_id=role.id)
+    assert not await permission_service.has_permission(user, "users:read")
@@ -0,0 +1,60 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.core.role_graph import RoleGraphIndex
+from app.db.repositories.permission_repository import PermissionRepository
+from app.db.repositories.role_repository import RoleRepository
+from app.models.role import PermissionModel, RoleModel
+from app.services.auth.reference_validator import ReferenceValidator
+
+
+@pytest_asyncio.fixture
+async def validator(shared_fake_db):
+    role_repos = RoleRepository(shared_fake_db)
+    permission_repos = PermissionRepository(shared_fake_db)
+    await role_repos.create(RoleModel(name="admin"))
+    await permission_repos.create(
+        PermissionModel(code="user:read", description="Read users")
+    )
+    RoleGraphIndex().reset()
+    yield ReferenceValidator(role_repos, permission_repos)
+    RoleGraphIndex().reset()
+
+
+@pytest.mark.asyncio
+async def test_only_requested_references_are_queried(validator, mocker):
+    find_names = mocker.spy(validator.role_repos, "find_existing_names")
+    iter_roles = mocker.spy(validator.role_repos, "iter_roles")
+
+    assert await validator.missing_roles(["admin", "ghost", "ghost"]) == ["ghost"]
+    assert await validator.missing_permissions(["user:read", "x"]) == ["x"]
+    assert await validator.missing_roles([]) == []
+    find_names.assert_called_once_with(["admin", "ghost"])
+    assert iter_roles.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_loaded_role_index_answers_without_query(validator, mocker):
+    await RoleGraphIndex().ensure_loaded(validator.role_repos)
+    find_names = mocker.spy(validator.role_repos, "find_existing_names")
+
+    await validator.ensure_references_exist(roles=["admin"])
+    assert find_names.call_count == 0
+
+    # Rôle inconnu de l'index (créé par un autre worker): confirmé en base
+    await validator.role_repos.create(RoleModel(name="editor"))
+    await validator.ensure_references_exist(roles=["admin", "editor"])
+    find_names.assert_called_once_with(["editor"])
+
+
+@pytest.mark.asyncio
+async def test_ensure_references_exist_reports_first_missing(validator):
+    with pytest.raises(HTTPException) as exc_info:
+        await validator.ensure_references_exist(
+            roles=["admin"], permissions=["user:read", "user:delete"]
+        )
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == (
+        "Permission 'user:delete' not found. Please create it first."
+    )
@@ -1,4 +1,7 @@
 import pytest
+from fastapi import HTTPException
+
+from app.models.role import RoleModel
 
 from app.schemas.role_schema import (
     PermissionCreateSchema,
@@ -89,6 +92,21 @@ async def test_delete_role(role_service, permission_service):
     assert result is None
 
 
+@pytest.mark.asyncio
+async def test_failed_delete_keeps_role_index(role_service, permission_service, mocker):
+    await create_user_permissions(permission_service)
+    role_data = RoleCreateSchema(name="user", permissions=["users:read"])
+    created = await role_service.create_role(role=role_data)
+    await role_service.role_index.reload(role_service.role_repos)
+    mocker.patch.object(role_service.role_repos, "delete_one", return_value=False)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await role_service.delete_role(role_id=created.id)
+
+    assert exc_info.value.status_code == 500
+    assert role_service.role_index.has_role("user")
+
+
 @pytest.mark.asyncio
 async def test_delete_all_roles(role_service, permission_service):
     await create_user_permissions(permission_service)
@@ -214,3 +232,85 @@ async def test_get_user_has_ensure_roles(role_service, permission_service):
     assert "admin" in user_roles
     assert is_role is True
     assert has_role is True
+
+
+@pytest.mark.asyncio
+async def test_role_index_follows_inheritance_chain(
+    role_service, permission_service, mocker
+):
+    await create_user_permissions(permission_service)
+    await role_service.create_role(
+        role=RoleCreateSchema(name="user", permissions=["users:read"])
+    )
+    manager = await role_service.create_role(
+        role=RoleCreateSchema(name="manager", inherited_roles=["user"])
+    )
+    await role_service.create_role(
+        role=RoleCreateSchema(
+            name="admin", permissions=["users:update"], inherited_roles=["manager"]
+        )
+    )
+    user = UserReadSchema(
+        id="test_user_id",
+        email="test@gmail.com",
+        first_name="Test",
+        last_name="User",
+        roles=["admin"],
+    )
+    find_by_name = mocker.spy(role_service.role_repos, "find_by_name")
+
+    assert await role_service.get_all_roles(user=user) == {"admin", "manager", "user"}
+    assert await role_service._check_circular_inheritance(
+        start_role_name="admin", target_role_name="user"
+    )
+    assert await permission_service.get_all_permissions(user) == {
+        "users:read",
+        "users:update",
+    }
+    # Les lectures passent par l'index, sans parcours du graphe en base
+    assert find_by_name.call_count == 0
+
+    # L'index est mis à jour quand un rôle intermédiaire change
+    await role_service.remove_inherited_role(
+        role_id=manager.id, inherited_role_to_remove_name="user"
+    )
+    assert await role_service.get_all_roles(user=user) == {"admin", "manager"}
+    assert await permission_service.get_all_permissions(user) == {"users:update"}
+    assert not await role_service._check_circular_inheritance(
+        start_role_name="admin", target_role_name="user"
+    )
+
+
+@pytest.mark.asyncio
+async def test_role_writes_see_roles_written_by_other_workers(role_service):
+    await role_service.create_role(role=RoleCreateSchema(name="user"))
+    reviewer = await role_service.create_role(role=RoleCreateSchema(name="reviewer"))
+    user = UserReadSchema(
+        id="test_user_id",
+        email="test@gmail.com",
+        first_name="Test",
+        last_name="User",
+        roles=["user"],
+    )
+    assert await role_service.get_all_roles(user=user) == {"user"}
+
+    # Écritures d'un autre worker: l'index de ce worker n'en sait rien
+    await role_service.role_repos.create(RoleModel(name="editor"))
+    await role_service.role_repos.update(
+        id=reviewer.id, update_data={"inherited_roles": ["editor"]}
+    )
+
+    manager = await role_service.create_role(
+        role=RoleCreateSchema(name="manager", inherited_roles=["editor"])
+    )
+    assert manager.inherited_roles == ["editor"]
+    assert await role_service.ensure_role(user=user, role_name="user")
+
+    # editor -> reviewer fermerait le cycle reviewer -> editor écrit ailleurs
+    with pytest.raises(HTTPException) as exc_info:
+        await role_service.update_role(
+            role_id=(await role_service.get_role_by_name("editor")).id,
+            role_update=RoleUpdateSchema(inherited_roles=["reviewer"]),
+        )
+    assert exc_info.value.status_code == 400
+    assert "Circular inheritance" in exc_info.value.detail
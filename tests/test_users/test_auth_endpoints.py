@@ -1,6 +1,25 @@
 from httpx import AsyncClient
 import pytest
 from fastapi import status
+from pydantic import ValidationError
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import Settings
+from app.core.token_revocation import TokenRevocationList
+from app.db.repositories.access_token_repository import AccessTokenRepository
+from app.db.repositories.user_repository import UserRepository
+from app.main import app
+from app.providers.providers import get_settings
+
+
+@pytest.fixture
+def stateless_settings():
+    settings = get_settings().model_copy(
+        update={"token_verification_mode": "stateless"}
+    )
+    app.dependency_overrides[get_settings] = lambda: settings
+    yield settings
+    app.dependency_overrides.pop(get_settings, None)
 
 
 @pytest.mark.asyncio
@@ -19,6 +38,31 @@ async def test_register_success(async_client: AsyncClient):
     assert data["user"]["email"] == "john@example.com"
 
 
+@pytest.mark.asyncio
+async def test_register_duplicate_email(async_client: AsyncClient, mocker):
+    payload = {
+        "first_name": "John",
+        "last_name": "Doe",
+        "email": "john@example.com",
+        "password": "password123",
+    }
+    assert (await async_client.post("/register", json=payload)).status_code == 201
+
+    response = await async_client.post("/register", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+
+    # Inscription concurrente: l'index unique rejette l'insertion
+    mocker.patch.object(UserRepository, "find_id_by_email", return_value=None)
+    mocker.patch.object(
+        UserRepository,
+        "create_and_get",
+        side_effect=DuplicateKeyError("E11000 duplicate key error"),
+    )
+    response = await async_client.post("/register", json=payload)
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_register_password_match(async_client: AsyncClient):
     payload = {
@@ -199,6 +243,17 @@ async def test_update_user(very_auth_async_client: AsyncClient):
     assert response.json()["first_name"] == "Bob"
 
 
+@pytest.mark.asyncio
+async def test_update_user_rejects_unknown_role(very_auth_async_client: AsyncClient):
+    response = await very_auth_async_client.put(
+        "/current/update", json={"roles": ["ghost"]}
+    )
+    assert response.status_code == 400
+    assert (
+        response.json()["detail"] == "Role 'ghost' not found. Please create it first."
+    )
+
+
 @pytest.mark.asyncio
 async def test_change_password(very_auth_async_client: AsyncClient):
     update_data = {"old_password": "testpasswordunencrypted", "new_password": "12345"}
@@ -258,3 +313,90 @@ async def test_change_password_with_wrong_old_password(
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json()["detail"].startswith("Wrong credentials")
+
+
+def test_unknown_token_verification_mode_is_rejected():
+    with pytest.raises(ValidationError):
+        Settings(TOKEN_VERIFICATION_MODE="statless")
+
+
+@pytest.mark.asyncio
+async def test_stateless_token_verification(
+    async_client: AsyncClient, stateless_settings, mocker
+):
+    payload = {
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "email": "alice@example.com",
+        "password": "alicepass",
+    }
+    response = await async_client.post("/register", json=payload)
+    token = response.json()["access_token"]["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    token_lookup = mocker.spy(AccessTokenRepository, "find_by_token_and_user_id")
+
+    response = await async_client.get("/me", headers=headers)
+    assert response.status_code == 200
+    assert token_lookup.call_count == 0
+
+    response = await async_client.delete("/logout", headers=headers)
+    assert response.status_code == 204
+
+    # Le jeton révoqué est rejeté sans consulter la collection tokens
+    response = await async_client.get("/me", headers=headers)
+    assert response.status_code == 401
+    assert token_lookup.call_count == 0
+
+    # Un autre worker (liste locale vide) retrouve la révocation depuis la base
+    TokenRevocationList().reset()
+    response = await async_client.get("/me", headers=headers)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_authenticated_user_is_cached(async_client: AsyncClient, mocker):
+    payload = {
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "email": "alice@example.com",
+        "password": "alicepass",
+    }
+    response = await async_client.post("/register", json=payload)
+    token = response.json()["access_token"]["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    user_lookup = mocker.spy(UserRepository, "find_by_id")
+
+    for _ in range(3):
+        response = await async_client.get("/me", headers=headers)
+        assert response.status_code == 200
+    assert user_lookup.call_count == 1
+
+    # Une modification de l'utilisateur invalide son entrée en cache
+    response = await async_client.put(
+        "/current/update", json={"first_name": "Bob"}, headers=headers
+    )
+    assert response.status_code == 200
+    response = await async_client.get("/me", headers=headers)
+    assert response.json()["first_name"] == "Bob"
+
+
+@pytest.mark.asyncio
+async def test_login_and_register_skip_read_back(async_client: AsyncClient, mocker):
+    token_read_back = mocker.spy(AccessTokenRepository, "find_by_id")
+    user_read_back = mocker.spy(UserRepository, "find_by_id")
+    payload = {
+        "first_name": "Alice",
+        "last_name": "Smith",
+        "email": "alice@example.com",
+        "password": "alicepass",
+    }
+    response = await async_client.post("/register", json=payload)
+    assert response.status_code == 201
+    assert response.json()["access_token"]["_id"]
+    response = await async_client.post(
+        "/login", json={"email": "alice@example.com", "password": "alicepass"}
+    )
+    assert response.status_code == 201
+    assert response.json()["user"]["email"] == "alice@example.com"
+    assert token_read_back.call_count == 0
+    assert user_read_back.call_count == 0
@@ -43,6 +43,38 @@ async def test_get_all_users(bypass_role_and_permission_async_client: AsyncClien
     assert json[0]["email"] == "bob@example.com"
 
 
+@pytest.mark.asyncio
+async def test_get_users_next_cursor_header(
+    bypass_role_and_permission_async_client: AsyncClient,
+):
+    client = bypass_role_and_permission_async_client
+    for index in range(3):
+        await client.post(
+            "/users/",
+            json={
+                "first_name": "Alice",
+                "last_name": "Builder",
+                "email": f"alice{index}@example.com",
+                "password": "secret123",
+                "phone_number": "90000000",
+            },
+        )
+
+    first = await client.get("/users/", params={"limit": 2, "sort": "email"})
+    assert [user["email"] for user in first.json()] == [
+        "alice0@example.com",
+        "alice1@example.com",
+    ]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = await client.get(
+        "/users/", params={"limit": 2, "sort": "email", "cursor": cursor}
+    )
+    assert second.status_code == 200
+    assert [user["email"] for user in second.json()] == ["alice2@example.com"]
+    assert "X-Next-Cursor" not in second.headers
+
+
 @pytest.mark.asyncio
 async def test_get_user(async_client: AsyncClient):
     payload = {
@@ -111,3 +143,28 @@ async def test_delete_user(async_client: AsyncClient):
     response = await async_client.delete(f"/users/{user_id}")
     assert response.status_code == 204
     # assert response.json()["detail"] == "User deleted successfully"
+
+
+@pytest.mark.asyncio
+async def test_export_users_endpoint(
+    bypass_role_and_permission_async_client: AsyncClient,
+):
+    client = bypass_role_and_permission_async_client
+    await client.post(
+        "/users/",
+        json={
+            "first_name": "Alice",
+            "last_name": "Builder",
+            "email": "alice@example.com",
+            "password": "secret123",
+            "phone_number": "90000000",
+        },
+    )
+
+    response = await client.get("/users/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "alice@example.com" in response.text
+
+    response = await client.get("/users/export", params={"format": "xml"})
+    assert response.status_code == 400
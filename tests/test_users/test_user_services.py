@@ -1,4 +1,7 @@
+import json
+
 import pytest
+from fastapi import HTTPException
 from app.db.repositories.permission_repository import PermissionRepository
 from app.db.repositories.role_repository import RoleRepository
 from app.schemas.user_schema import UserCreateSchema, UserReadSchema, UserUpdateSchema
@@ -42,7 +45,7 @@ async def test_list_user(service):
         phone_number="90000000",
     )
     await service.create_user(user_data)
-    fetched = await service.list_users()
+    fetched = (await service.list_users()).items
     assert isinstance(fetched, list)
     assert len(fetched) > 0
     assert isinstance(fetched[0], UserReadSchema)
@@ -89,3 +92,75 @@ async def test_delete_user(service):
     created = await service.create_user(user_data)
     result = await service.delete_user(created.id)
     assert result is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["_id", "-_id", "email", "-email"])
+async def test_list_users_by_cursor_walks_every_user_once(service, sort):
+    for index in range(7):
+        await service.create_user(
+            UserCreateSchema(
+                first_name="Jane",
+                last_name="Doe",
+                email=f"jane{index % 3}.{index}@example.com",
+                password="pass",
+                phone_number="90000000",
+            )
+        )
+
+    emails, cursor, pages = [], None, 0
+    while True:
+        page = await service.list_users(limit=3, cursor=cursor, sort=sort)
+        emails.extend(user.email for user in page.items)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(emails) == len(set(emails)) == 7
+    if "email" in sort:
+        assert emails == sorted(emails, reverse=sort.startswith("-"))
+
+
+@pytest.mark.asyncio
+async def test_list_users_rejects_invalid_cursor_and_sort(service):
+    with pytest.raises(HTTPException) as exc_info:
+        await service.list_users(cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.list_users(sort="password")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_users_streams_ndjson_and_csv_without_passwords(service):
+    for index in range(3):
+        await service.create_user(
+            UserCreateSchema(
+                first_name="Jane",
+                last_name="Doe",
+                email=f"jane{index}@example.com",
+                password="pass",
+                phone_number="90000000",
+                roles=[],
+            )
+        )
+
+    ndjson = "".join([chunk async for chunk in service.export_users(sort="email")])
+    rows = [json.loads(line) for line in ndjson.splitlines()]
+    assert [row["email"] for row in rows] == [
+        "jane0@example.com",
+        "jane1@example.com",
+        "jane2@example.com",
+    ]
+    assert all("password" not in row and row["id"] for row in rows)
+
+    csv_export = "".join(
+        [chunk async for chunk in service.export_users(format="csv", sort="-email")]
+    )
+    lines = csv_export.splitlines()
+    assert lines[0].startswith("id,email,")
+    assert "password" not in lines[0]
+    assert len(lines) == 4 and "jane2@example.com" in lines[1]